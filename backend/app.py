@@ -6,11 +6,13 @@ Flask backend API for Latvian Audio Transcription Frontend
 import os
 import logging
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, request, jsonify, send_file
+from flask import Blueprint, Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 
@@ -20,26 +22,53 @@ load_dotenv(dotenv_path=Path('../.env'))
 # Import our transcription services
 import sys
 sys.path.append('..')
-from transcribers import (
-    SpeechmaticsTranscriber,
-    GoogleTranscriber,
-    WhisperTranscriber,
-    AssemblyAITranscriber,
-    TranscriptionError
+from transcribers import TranscriptionError, create_transcriber, enabled_providers
+from config import (
+    MODELS,
+    TRANSCRIBE_WORKERS,
+    LOCAL_TRANSCRIBE_WORKERS,
+    JOB_WORKERS,
+    ORPHAN_RESCAN_SECONDS,
+    BATCH,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MAX_ENTRIES,
+    RESULT_CACHE_MAX_BYTES,
+    RESULT_CACHE_MAX_AGE_DAYS,
+    PREPROCESS_AUDIO,
+    UPLOAD_MAX_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_SESSION_TTL_HOURS,
+    EXPORT_TTL_HOURS,
+    FILE_INDEX_RESCAN_SECONDS,
+    FILE_SERVING
 )
+from transcribers import metrics
+from transcribers.audio import get_audio_duration, prepare_audio, remove_preprocessed
+from transcribers.limits import ProviderUnavailableError, get_limiter
+from events import stream_events
+from jobs import JobManager
+from batch import BatchManager, collect_audio_files, create_local_pool, transcribe_in_process
+from result_cache import ResultCache, file_digest, remember_digest
+from results_index import ResultsIndex
+from file_index import FileIndex
+from file_serving import AUDIO_MIMETYPES, TRANSCRIPT_EXTENSIONS, resolve_path, serve_file
+from reports import ExportManager, ResultsLog, iter_csv
+from evaluation import evaluate
+from uploads import UploadError, UploadManager
 
-app = Flask(__name__)
-CORS(app)
+# All routes; create_app() builds the Flask app around them
+api = Blueprint('api', __name__)
 
 # Configuration
 UPLOAD_FOLDER = Path('../audio_clips')
 RESULTS_FOLDER = Path('../transcriptions')
+JOBS_FOLDER = Path('../jobs')
+CACHE_FOLDER = Path('../cache')
+BATCHES_FOLDER = Path('../batches')
+EXPORTS_FOLDER = Path('../exports')
+REFERENCES_FOLDER = Path('../references')
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'flac', 'ogg'}
 
-# Ensure directories exist
-UPLOAD_FOLDER.mkdir(exist_ok=True)
-RESULTS_FOLDER.mkdir(exist_ok=True)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -47,6 +76,71 @@ logger = logging.getLogger(__name__)
 # Global transcriber instances
 transcribers = {}
 
+# Stores and job runners, created by init_services() so that importing this
+# module doesn't touch the disk
+result_cache = None      # transcript cache shared by all requests and jobs
+upload_manager = None    # resumable uploads and content hashes of stored uploads
+results_index = None     # index of per-(audio, model) results
+file_index = None        # metadata of uploaded audio files, for paginated listing
+results_log = None       # append-only log of every run; reports are exported from it
+export_manager = None
+job_manager = None
+batch_manager = None
+services_lock = threading.Lock()
+
+def init_services():
+    """Create the data folders, stores and job runners (once; later calls do nothing)."""
+    global result_cache, upload_manager, results_index, file_index, results_log, \
+        export_manager, job_manager, batch_manager
+    
+    with services_lock:
+        if job_manager is not None:
+            return
+        
+        for folder in (UPLOAD_FOLDER, RESULTS_FOLDER, JOBS_FOLDER, CACHE_FOLDER, BATCHES_FOLDER, EXPORTS_FOLDER):
+            folder.mkdir(parents=True, exist_ok=True)
+        
+        result_cache = ResultCache(
+            CACHE_FOLDER / 'results.db',
+            max_entries=RESULT_CACHE_MAX_ENTRIES,
+            max_bytes=RESULT_CACHE_MAX_BYTES,
+            max_age_days=RESULT_CACHE_MAX_AGE_DAYS
+        ) if RESULT_CACHE_ENABLED else None
+        
+        upload_manager = UploadManager(
+            UPLOAD_FOLDER,
+            max_bytes=UPLOAD_MAX_BYTES,
+            chunk_bytes=UPLOAD_CHUNK_BYTES,
+            session_ttl_hours=UPLOAD_SESSION_TTL_HOURS
+        )
+        
+        results_index = ResultsIndex(RESULTS_FOLDER / 'index.db')
+        file_index = FileIndex(RESULTS_FOLDER / 'index.db', UPLOAD_FOLDER, ALLOWED_EXTENSIONS)
+        
+        results_log = ResultsLog(RESULTS_FOLDER / 'results_log.jsonl')
+        export_manager = ExportManager(results_log, EXPORTS_FOLDER, ttl_hours=EXPORT_TTL_HOURS)
+        
+        job_manager = JobManager(JOBS_FOLDER, process_job, max_workers=JOB_WORKERS)
+        batch_manager = BatchManager(
+            BATCHES_FOLDER,
+            start_batch_item,
+            on_result=lambda file_path, result: results_log.append(file_path.name, [result]),
+            max_outstanding=BATCH['max_outstanding'],
+            max_batches=BATCH['workers'],
+            capacity=lambda model_id: get_limiter(model_id).max_in_flight if model_id in transcribers else 0
+        )
+
+# Result statuses after which a model does no more work
+FINISHED_STATUSES = ('success', 'error', 'cancelled')
+
+# Bounded executors: remote providers mostly wait on the network, so they
+# share a thread pool; local models get their own worker(s)
+remote_executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_WORKERS, thread_name_prefix='remote')
+local_executor = ThreadPoolExecutor(max_workers=LOCAL_TRANSCRIBE_WORKERS, thread_name_prefix='local')
+
+# Set by shutdown() to stop the background rescans
+stopping = threading.Event()
+
 def allowed_file(filename):
     """Check if file extension is allowed."""
     return '.' in filename and \
@@ -56,57 +150,55 @@ def initialize_transcribers():
     """Initialize available transcription services."""
     global transcribers
     
-    # Try to initialize each transcriber
-    try:
-        transcribers['speechmatics'] = SpeechmaticsTranscriber()
-        logger.info("✓ Speechmatics transcriber initialized")
-    except Exception as e:
-        logger.warning(f"✗ Speechmatics: {e}")
-    
-    try:
-        transcribers['google'] = GoogleTranscriber()
-        logger.info("✓ Google Speech-to-Text transcriber initialized")
-    except Exception as e:
-        logger.warning(f"✗ Google STT: {e}")
-    
-    try:
-        transcribers['whisper'] = WhisperTranscriber()
-        logger.info("✓ Whisper transcriber initialized")
-    except Exception as e:
-        logger.warning(f"✗ Whisper: {e}")
-    
-    try:
-        transcribers['assemblyai'] = AssemblyAITranscriber()
-        logger.info("✓ AssemblyAI transcriber initialized")
-    except Exception as e:
-        logger.warning(f"✗ AssemblyAI: {e}")
+    # Only enabled providers are imported; Whisper loads torch on first use
+    for model_id in enabled_providers():
+        name = MODELS[model_id]['name']
+        try:
+            transcribers[model_id] = create_transcriber(model_id)
+            if MODELS[model_id].get('local') and MODELS[model_id].get('preload'):
+                transcribers[model_id].preload(warm_up=MODELS[model_id].get('warm_up', False))
+            logger.info(f"✓ {name} transcriber initialized")
+        except Exception as e:
+            logger.warning(f"✗ {name}: {e}")
     
     return transcribers
 
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
+    providers = {model_id: get_limiter(model_id).stats() for model_id in transcribers}
+    degraded = any(stats['status'] != 'available' for stats in providers.values())
+    
     return jsonify({
-        'status': 'healthy',
-        'available_transcribers': list(transcribers.keys()),
+        'status': 'degraded' if degraded else 'healthy',
+        'available_transcribers': [
+            model_id for model_id, stats in providers.items() if stats['status'] != 'unavailable'
+        ],
+        'providers': providers,
         'timestamp': datetime.now().isoformat()
     })
 
-@app.route('/api/transcribers', methods=['GET'])
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Transcription metrics in the Prometheus text format."""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api.route('/api/transcribers', methods=['GET'])
 def get_transcribers():
     """Get available transcription services."""
-    return jsonify({
-        'transcribers': [
-            {
-                'id': key,
-                'name': transcriber.name,
-                'status': 'available'
-            }
-            for key, transcriber in transcribers.items()
-        ]
-    })
+    transcriber_list = []
+    for key, transcriber in transcribers.items():
+        limits = get_limiter(key).stats()
+        transcriber_list.append({
+            'id': key,
+            'name': transcriber.name,
+            'status': limits['status'],
+            'limits': limits
+        })
+    
+    return jsonify({'transcribers': transcriber_list})
 
-@app.route('/api/upload', methods=['POST'])
+@api.route('/api/upload', methods=['POST'])
 def upload_file():
     """Upload audio file."""
     if 'file' not in request.files:
@@ -116,23 +208,448 @@ def upload_file():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
     
-    if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{filename}"
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    try:
+        upload = upload_manager.store(upload_filename(file.filename), file.stream)
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    remember_digest(UPLOAD_FOLDER / upload['filename'], upload['sha256'])
+    file_index.add(UPLOAD_FOLDER / upload['filename'])
+    return jsonify({
+        'message': 'File uploaded successfully',
+        'filename': upload['filename'],
+        'file_path': str(UPLOAD_FOLDER / upload['filename']),
+        'deduplicated': upload['deduplicated']
+    })
+
+def upload_filename(original_name):
+    """Stored name of an upload: timestamp prefix plus the sanitized original name."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{timestamp}_{secure_filename(original_name)}"
+
+def upload_error_response(error):
+    return jsonify({'error': str(error), **error.details}), error.status
+
+@api.route('/api/uploads', methods=['POST'])
+def create_upload():
+    """Start a resumable upload.
+    
+    Body: ``{"filename", "size", "sha256"}`` (``sha256`` optional). If the
+    hash matches a stored file, that file is returned at once.
+    """
+    data = request.get_json()
+    
+    if not data or 'filename' not in data or 'size' not in data:
+        return jsonify({'error': 'filename and size are required'}), 400
+    
+    if not allowed_file(data['filename']):
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    try:
+        upload = upload_manager.create(upload_filename(data['filename']), int(data['size']), data.get('sha256'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'size must be an integer'}), 400
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    return jsonify(upload), 200 if upload['status'] == 'complete' else 201
+
+@api.route('/api/uploads/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """Get the offset to resume an upload from."""
+    upload = upload_manager.get(upload_id)
+    if upload is None:
+        return jsonify({'error': 'Upload not found'}), 404
+    
+    return jsonify(upload)
+
+@api.route('/api/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """Append a chunk; the body is raw bytes starting at ``?offset=``."""
+    try:
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'offset must be an integer'}), 400
+    
+    try:
+        upload = upload_manager.write_chunk(upload_id, offset, request.stream, request.content_length)
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    return jsonify(upload)
+
+@api.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Finish an upload and return the stored filename."""
+    try:
+        upload = upload_manager.complete(upload_id)
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    remember_digest(UPLOAD_FOLDER / upload['filename'], upload['sha256'])
+    file_index.add(UPLOAD_FOLDER / upload['filename'])
+    return jsonify(upload)
+
+@api.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    """Cancel an unfinished upload."""
+    if not upload_manager.abort(upload_id):
+        return jsonify({'error': 'Upload not found'}), 404
+    
+    return jsonify({'message': 'Upload cancelled'})
+
+class TranscriptionFuture(Future):
+    """Future of one model's result that can also stop the model's work."""
+    
+    def __init__(self):
+        super().__init__()
+        self._abort = None
+    
+    def abort(self):
+        """Cancel the provider job (or skip the model if it hasn't started).
+        
+        The future then resolves with a ``cancelled`` result. Returns False if
+        the model had already finished.
+        """
+        return self._abort() if self._abort else False
+
+def start_transcription(model_id, file_path, on_update=None, local_pool=None):
+    """Start transcribing a file with one model.
+    
+    Returns a Future that resolves to the model's result entry. Remote
+    transcribers only hold an executor thread while uploading; their jobs
+    are then tracked by the shared poller. ``on_update`` is called with the
+    result whenever it changes: ``uploading`` (remote) or ``processing``
+    (local), provider-reported progress, and finally ``success``, ``error``
+    or ``cancelled``.
+    
+    ``abort()`` on the returned future cancels the remote job through the
+    provider's cancel endpoint; local inference that already started runs
+    to completion.
+    
+    With ``local_pool`` (a process pool from ``batch.create_local_pool``),
+    local models run in its worker processes instead of ``local_executor``.
+    """
+    transcriber = transcribers[model_id]
+    limiter = get_limiter(model_id)
+    is_local = MODELS.get(model_id, {}).get('local', False)
+    in_pool = is_local and local_pool is not None
+    # In pool mode the local executor thread would only wait on the process
+    executor = local_executor if is_local and not in_pool else remote_executor
+    
+    result = {
+        'model_id': model_id,
+        'model_name': transcriber.name,
+        'status': 'queued',
+        'transcript': '',
+        'error': '',
+        'processing_time': 0,
+        'cached': False
+    }
+    outcome = TranscriptionFuture()
+    state = {}
+    # Progress arrives from poller threads while the executor thread may
+    # still be updating the status; updates are applied in order
+    lock = threading.Lock()
+    
+    def elapsed():
+        return (datetime.now() - state['start_time']).total_seconds()
+    
+    def notify():
+        if on_update:
+            on_update(result)
+    
+    def report(progress):
+        """Provider progress callback."""
+        with lock:
+            if result['status'] in FINISHED_STATUSES:
+                return
+            if result['status'] == 'uploading':
+                result['status'] = 'processing'
+            result.update(progress)
+            result['elapsed'] = elapsed()
+            notify()
+    
+    def complete(transcript, cached=False):
+        processing_time = elapsed()
         
-        file_path = UPLOAD_FOLDER / filename
-        file.save(file_path)
+        result.update({
+            'status': 'success',
+            'transcript': transcript,
+            'confidence': getattr(transcript, 'confidence', None),
+            'processing_time': processing_time,
+            'cached': cached
+        })
         
-        return jsonify({
-            'message': 'File uploaded successfully',
-            'filename': filename,
-            'file_path': str(file_path)
+        # Save individual transcript file
+        output_filename = f"{file_path.stem}_{model_id}.txt"
+        output_path = RESULTS_FOLDER / output_filename
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(transcript)
+        results_index.record(file_path.name, result, output_path)
+        
+        source = " (cached)" if cached else ""
+        logger.info(f"✓ {transcriber.name} completed in {processing_time:.2f}s{source}")
+    
+    def fail(error):
+        if isinstance(error, TranscriptionError):
+            result.update({
+                'status': 'error',
+                'error': str(error)
+            })
+            logger.error(f"✗ {transcriber.name} failed: {error}")
+        else:
+            result.update({
+                'status': 'error',
+                'error': f"Unexpected error: {str(error)}"
+            })
+            logger.error(f"✗ {transcriber.name} unexpected error: {error}")
+        if isinstance(error, ProviderUnavailableError):
+            # The provider turned the request away; the same request can succeed later
+            result['retryable'] = True
+        result['processing_time'] = elapsed()
+        results_index.record(file_path.name, result)
+    
+    def settle(transcript=None, error=None, cached=False, cancelled=False):
+        if state.pop('admitted', False):
+            limiter.release()
+        if state.pop('in_flight', False):
+            metrics.IN_FLIGHT.dec(provider=transcriber.provider)
+        
+        with lock:
+            # Progress fields only describe a running model
+            for key in ('progress', 'provider_status', 'partial_transcript', 'chunks_done', 'elapsed'):
+                result.pop(key, None)
+            if cancelled:
+                result.update({'status': 'cancelled', 'processing_time': elapsed()})
+                logger.info(f"{transcriber.name} cancelled")
+            elif error is None:
+                complete(transcript, cached)
+            else:
+                fail(error)
+            notify()
+        transcriber.record_transcription(result['status'], result['processing_time'],
+                                         audio_seconds=state.get('audio_seconds'), cached=cached)
+        outcome.set_result(result)
+    
+    def abort():
+        with lock:
+            if result['status'] in FINISHED_STATUSES or state.get('aborted'):
+                return False
+            state['aborted'] = True
+            pending = state.get('pending')
+        if pending is not None:
+            pending.cancel()
+        return True
+    
+    outcome._abort = abort
+    
+    def finish(pending):
+        if pending.cancelled():
+            settle(cancelled=True)
+            return
+        
+        try:
+            transcript = pending.result()
+        except Exception as e:
+            settle(error=e)
+            return
+        
+        if result_cache:
+            result_cache.put(state['cache_key'], state['audio_hash'], model_id, transcript)
+        settle(transcript)
+    
+    def begin():
+        state['start_time'] = datetime.now()
+        if state.get('aborted'):
+            settle(cancelled=True)
+            return
+        
+        logger.info(f"Transcribing {file_path.name} with {transcriber.name}")
+        with lock:
+            result['status'] = 'processing' if is_local else 'uploading'
+            notify()
+        metrics.IN_FLIGHT.inc(provider=transcriber.provider)
+        state['in_flight'] = True
+        
+        pending = Future()
+        try:
+            if result_cache:
+                state['audio_hash'] = file_digest(file_path)
+                state['cache_key'] = result_cache.make_key(
+                    state['audio_hash'], model_id,
+                    {**transcriber.get_config(), 'preprocessed': PREPROCESS_AUDIO}
+                )
+                transcript = result_cache.get(state['cache_key'])
+                metrics.CACHE_LOOKUPS.inc(provider=transcriber.provider,
+                                          result='miss' if transcript is None else 'hit')
+                if transcript is not None:
+                    settle(transcript, cached=True)
+                    return
+            
+            # Fails fast while the provider's circuit is open; waits for a
+            # free in-flight slot otherwise
+            with transcriber.stage('admission'):
+                limiter.admit()
+            state['admitted'] = True
+            
+            # Providers get the shared 16 kHz mono FLAC, decoded once per upload
+            with transcriber.stage('preprocess'):
+                audio_path = prepare_audio(file_path) if PREPROCESS_AUDIO else file_path
+            # For the real-time factor of the finished transcription
+            state['audio_seconds'] = get_audio_duration(audio_path)
+            
+            if in_pool:
+                # Each worker process holds its own model copy and chunks long files itself
+                pending = local_pool.submit(transcribe_in_process, model_id, str(audio_path))
+                with lock:
+                    state['pending'] = pending
+            elif transcriber.needs_chunking(audio_path):
+                # Long recording: split on silence and transcribe the pieces in parallel
+                report({})
+                pending.set_result(transcriber.transcribe_chunked(audio_path, on_progress=report))
+            elif hasattr(transcriber, 'transcribe_async'):
+                # Upload now, let the poller finish the job
+                pending = transcriber.transcribe_async(audio_path, on_progress=report)
+                with lock:
+                    state['pending'] = pending
+                    aborted = state.get('aborted')
+                if aborted:
+                    # Aborted while uploading: stop the job that was just created
+                    pending.cancel()
+                report({})
+            else:
+                pending.set_result(transcriber.transcribe(audio_path))
+        except Exception as e:
+            pending.set_exception(e)
+        
+        pending.add_done_callback(finish)
+    
+    executor.submit(begin)
+    return outcome
+
+def race_transcriptions(file_path, selected_models, min_confidence=None):
+    """Start all selected models and return as soon as one result is acceptable.
+    
+    The first successful transcript wins; with ``min_confidence`` it also has
+    to report at least that confidence. Models still running are aborted,
+    which cancels their remote jobs. If no result passes the threshold, the
+    most confident success is returned with ``accepted`` set to False.
+    
+    Returns ``(winner, results)`` where ``results`` has one entry per model,
+    in request order.
+    """
+    candidates = [model_id for model_id in selected_models if model_id in transcribers]
+    # Race only providers that are up; fall back to all if none are
+    healthy = [m for m in candidates if get_limiter(m).status != 'unavailable']
+    futures = {
+        start_transcription(model_id, file_path): model_id
+        for model_id in healthy or candidates
+    }
+    
+    winner = None
+    fallback = None
+    for future in as_completed(futures):
+        result = future.result()
+        if result['status'] != 'success':
+            continue
+        
+        confidence = result.get('confidence')
+        if min_confidence is None or (confidence is not None and confidence >= min_confidence):
+            winner = dict(result, accepted=True)
+            break
+        if fallback is None or (confidence or 0) > (fallback.get('confidence') or 0):
+            fallback = result
+    
+    for future in futures:
+        if not future.done():
+            future.abort()
+    
+    if winner is None and fallback is not None:
+        winner = dict(fallback, accepted=False)
+    
+    results = []
+    for model_id in candidates:
+        future = next((f for f, m in futures.items() if m == model_id), None)
+        if future is None:
+            results.append({'model_id': model_id, 'status': 'error',
+                            'error': f"{transcribers[model_id].name} is unavailable (circuit open)"})
+        elif future.done():
+            results.append(future.result())
+        else:
+            # Don't wait for the cancellation to be confirmed
+            results.append({'model_id': model_id, 'status': 'cancelled'})
+    
+    return winner, results
+
+def transcribe_with_model(model_id, file_path, on_update=None):
+    """Run a single transcriber on a file and return its result entry."""
+    return start_transcription(model_id, file_path, on_update).result()
+
+def run_transcriptions(file_path, selected_models, on_update=None):
+    """Transcribe a file with all selected models concurrently.
+    
+    Results are returned in the order the models were requested.
+    """
+    futures = [
+        start_transcription(model_id, file_path, on_update)
+        for model_id in selected_models
+        if model_id in transcribers
+    ]
+    
+    return [future.result() for future in futures]
+
+def process_job(filename, selected_models, on_update):
+    """Job runner: transcribe an uploaded file and write the summary report."""
+    file_path = UPLOAD_FOLDER / filename
+    if not file_path.exists():
+        raise FileNotFoundError(f"File not found: {filename}")
+    
+    for model_id in selected_models:
+        if model_id not in transcribers:
+            on_update({
+                'model_id': model_id,
+                'status': 'error',
+                'error': f"Transcriber not available: {model_id}"
+            })
+    
+    results = run_transcriptions(file_path, selected_models, on_update)
+    results_log.append(filename, results)
+    return results
+
+# Worker processes for local models in batch runs, started on first use
+local_pool = None
+local_pool_lock = threading.Lock()
+
+def get_local_pool():
+    global local_pool
+    with local_pool_lock:
+        if local_pool is None:
+            local_pool = create_local_pool(BATCH['local_processes'])
+            logger.info(f"Started {BATCH['local_processes']} local model worker processes")
+        return local_pool
+
+def start_batch_item(model_id, file_path):
+    """Batch runner: start one (file, model) work item."""
+    if model_id not in transcribers:
+        unavailable = Future()
+        unavailable.set_result({
+            'model_id': model_id,
+            'status': 'error',
+            'error': f"Transcriber not available: {model_id}"
         })
+        return unavailable
     
-    return jsonify({'error': 'Invalid file type'}), 400
+    # Short Whisper clips are batched across files in this process instead
+    transcriber = transcribers[model_id]
+    in_pool = MODELS.get(model_id, {}).get('local', False) and \
+        not (hasattr(transcriber, 'can_batch') and transcriber.can_batch(file_path))
+    return start_transcription(model_id, file_path, local_pool=get_local_pool() if in_pool else None)
 
-@app.route('/api/transcribe', methods=['POST'])
+@api.route('/api/transcribe', methods=['POST'])
 def transcribe_audio():
     """Transcribe audio file using selected models."""
     data = request.get_json()
@@ -147,63 +664,17 @@ def transcribe_audio():
     if not file_path.exists():
         return jsonify({'error': 'File not found'}), 404
     
-    results = []
+    if data.get('async'):
+        job = job_manager.submit(filename, selected_models)
+        return jsonify(job), 202
     
-    for model_id in selected_models:
-        if model_id not in transcribers:
-            continue
-        
-        transcriber = transcribers[model_id]
-        result = {
-            'model_id': model_id,
-            'model_name': transcriber.name,
-            'status': 'processing',
-            'transcript': '',
-            'error': '',
-            'processing_time': 0
-        }
-        
-        try:
-            start_time = datetime.now()
-            logger.info(f"Transcribing {filename} with {transcriber.name}")
-            
-            transcript = transcriber.transcribe(file_path)
-            
-            end_time = datetime.now()
-            processing_time = (end_time - start_time).total_seconds()
-            
-            result.update({
-                'status': 'success',
-                'transcript': transcript,
-                'processing_time': processing_time
-            })
-            
-            # Save individual transcript file
-            output_filename = f"{file_path.stem}_{model_id}.txt"
-            output_path = RESULTS_FOLDER / output_filename
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(transcript)
-            
-            logger.info(f"✓ {transcriber.name} completed in {processing_time:.2f}s")
-            
-        except TranscriptionError as e:
-            result.update({
-                'status': 'error',
-                'error': str(e)
-            })
-            logger.error(f"✗ {transcriber.name} failed: {e}")
-        
-        except Exception as e:
-            result.update({
-                'status': 'error',
-                'error': f"Unexpected error: {str(e)}"
-            })
-            logger.error(f"✗ {transcriber.name} unexpected error: {e}")
-        
-        results.append(result)
+    if data.get('mode') == 'race':
+        return race_response(filename, file_path, selected_models, data.get('min_confidence'))
+    
+    results = run_transcriptions(file_path, selected_models)
     
-    # Create summary report
-    create_summary_report(filename, results)
+    # Log results for summary exports
+    results_log.append(filename, results)
     
     return jsonify({
         'filename': filename,
@@ -215,58 +686,286 @@ def transcribe_audio():
         }
     })
 
-def create_summary_report(filename, results):
-    """Create summary report for the transcription results."""
+def race_response(filename, file_path, selected_models, min_confidence):
+    """Response for ``"mode": "race"``: the first acceptable transcript."""
+    if min_confidence is not None:
+        try:
+            min_confidence = float(min_confidence)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'min_confidence must be a number'}), 400
+    
+    winner, results = race_transcriptions(file_path, selected_models, min_confidence)
+    results_log.append(filename, [r for r in results if r['status'] in ('success', 'error')])
+    
+    response = {
+        'filename': filename,
+        'mode': 'race',
+        'winner': winner,
+        'results': results,
+        'summary': {
+            'total_models': len(results),
+            'successful': len([r for r in results if r['status'] == 'success']),
+            'failed': len([r for r in results if r['status'] == 'error']),
+            'cancelled': len([r for r in results if r['status'] == 'cancelled'])
+        }
+    }
+    if winner is None:
+        response['error'] = 'No model returned a transcript'
+        return jsonify(response), 502
+    return jsonify(response)
+
+@api.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a transcription job and return its ID immediately."""
+    data = request.get_json()
+    
+    if not data or 'filename' not in data:
+        return jsonify({'error': 'No filename provided'}), 400
+    
+    filename = data['filename']
+    selected_models = data.get('models', list(transcribers.keys()))
+    
+    if not (UPLOAD_FOLDER / filename).exists():
+        return jsonify({'error': 'File not found'}), 404
+    
+    job = job_manager.submit(filename, selected_models)
+    return jsonify(job), 202
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of a transcription job and its per-model results."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job)
+
+@api.route('/api/jobs/<job_id>/events', methods=['GET'])
+def stream_job_events(job_id):
+    """Server-Sent Events stream of a job's per-model progress.
+    
+    Events: ``queued``, ``uploading``, ``processing`` (repeated with
+    provider-reported progress), ``done`` and ``error`` for each model, then
+    ``end`` with the job summary. Reconnecting clients resume after the
+    ``Last-Event-ID`` header.
+    """
+    events = job_manager.events(job_id)
+    if events is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    
+    return Response(
+        stream_events(events, last_event_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Don't let nginx buffer the stream
+        }
+    )
+
+@api.route('/api/batches', methods=['POST'])
+def submit_batch():
+    """Transcribe every audio file of a directory (or a list of uploads) with the selected models.
+    
+    ``directory`` is relative to the upload folder (``""`` for the folder
+    itself); ``files`` lists upload filenames instead.
+    """
+    data = request.get_json()
+    
+    if not data or ('directory' not in data and 'files' not in data):
+        return jsonify({'error': 'No directory or files provided'}), 400
+    
+    upload_root = UPLOAD_FOLDER.resolve()
+    if 'files' in data:
+        files = [upload_root / secure_filename(name) for name in data['files']]
+        missing = [path.name for path in files if not path.exists()]
+        if missing:
+            return jsonify({'error': 'Files not found', 'files': missing}), 404
+    else:
+        directory = (upload_root / data['directory']).resolve()
+        if directory != upload_root and upload_root not in directory.parents:
+            return jsonify({'error': 'Directory must be inside the upload folder'}), 400
+        if not directory.is_dir():
+            return jsonify({'error': 'Directory not found'}), 404
+        files = collect_audio_files(directory, recursive=bool(data.get('recursive')))
+    
+    if not files:
+        return jsonify({'error': 'No audio files found'}), 400
+    
+    selected_models = data.get('models', list(transcribers.keys()))
+    batch = batch_manager.submit(files, selected_models)
+    return jsonify(batch), 202
+
+@api.route('/api/batches/<batch_id>', methods=['GET'])
+def get_batch(batch_id):
+    """Get the progress of a batch."""
+    batch = batch_manager.get(batch_id)
+    if batch is None:
+        return jsonify({'error': 'Batch not found'}), 404
+    
+    return jsonify(batch)
+
+@api.route('/api/batches/<batch_id>/results', methods=['GET'])
+def get_batch_results(batch_id):
+    """Stream a batch's finished results as JSON lines (default) or CSV."""
+    if batch_manager.get(batch_id) is None:
+        return jsonify({'error': 'Batch not found'}), 404
+    
+    rows = batch_manager.iter_results(batch_id)
+    if request.args.get('format') == 'csv':
+        return Response(
+            stream_with_context(iter_csv(rows)),
+            mimetype='text/csv; charset=utf-8',
+            headers={'Content-Disposition': f'attachment; filename=batch_{batch_id}.csv'}
+        )
+    
+    return Response(
+        stream_with_context(json.dumps(row, ensure_ascii=False) + '\n' for row in rows),
+        mimetype='application/x-ndjson'
+    )
+
+def export_filters():
+    """Date range and file filters shared by the export endpoints."""
+    files = request.args.get('files')
+    return {
+        'since': request.args.get('since'),
+        'until': request.args.get('until'),
+        'filenames': files.split(',') if files else None
+    }
+
+@api.route('/api/export', methods=['GET'])
+def export_results():
+    """Export logged results, streamed as CSV or built in the background as XLSX."""
+    export_format = request.args.get('format', 'csv')
+    filters = export_filters()
+    
+    if export_format == 'xlsx':
+        export = export_manager.start(**filters)
+        return jsonify(export), 202
+    
+    if export_format != 'csv':
+        return jsonify({'error': f"Unsupported format: {export_format}"}), 400
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    rows = results_log.iter_rows(**filters)
+    return Response(
+        stream_with_context(iter_csv(rows)),
+        mimetype='text/csv; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename=transcription_{timestamp}.csv'}
+    )
+
+@api.route('/api/exports/<export_id>', methods=['GET'])
+def get_export(export_id):
+    """Get the status of an XLSX export."""
+    export = export_manager.get(export_id)
+    if export is None:
+        return jsonify({'error': 'Export not found'}), 404
     
-    # Create DataFrame
-    df_data = []
-    for result in results:
-        df_data.append({
-            'timestamp': timestamp,
-            'filename': filename,
-            'model_id': result['model_id'],
-            'model_name': result['model_name'],
-            'status': result['status'],
-            'processing_time': result.get('processing_time', 0),
-            'transcript': result.get('transcript', ''),
-            'error': result.get('error', '')
-        })
+    return jsonify(export)
+
+@api.route('/api/exports/<export_id>/download', methods=['GET'])
+def download_export(export_id):
+    """Download a finished XLSX export."""
+    export = export_manager.get(export_id)
+    if export is None:
+        return jsonify({'error': 'Export not found'}), 404
+    if export['status'] != 'ready':
+        return jsonify(export), 409
     
-    df = pd.DataFrame(df_data)
+    return send_file(export_manager.path_for(export_id), as_attachment=True)
+
+@api.route('/api/references/<filename>', methods=['PUT'])
+def save_reference(filename):
+    """Store the reference transcript of an audio file, used by /api/evaluation."""
+    data = request.get_json()
+    if not data or not isinstance(data.get('text'), str):
+        return jsonify({'error': 'No reference text provided'}), 400
     
-    # Save to CSV
-    csv_filename = f"transcription_{timestamp}.csv"
-    csv_path = RESULTS_FOLDER / csv_filename
-    df.to_csv(csv_path, index=False, encoding='utf-8')
+    REFERENCES_FOLDER.mkdir(exist_ok=True)
+    stem = Path(secure_filename(filename)).stem
+    if not stem:
+        return jsonify({'error': 'Invalid filename'}), 400
+    
+    with open(REFERENCES_FOLDER / f"{stem}.txt", 'w', encoding='utf-8') as f:
+        f.write(data['text'])
+    
+    return jsonify({'message': 'Reference saved', 'audio_stem': stem})
+
+@api.route('/api/evaluation', methods=['GET'])
+def evaluate_models():
+    """WER and CER of each model's transcripts against the stored references.
+    
+    Query parameters: ``models`` and ``files`` (comma-separated) limit the
+    comparison, ``strip_diacritics=true`` ignores Latvian diacritics and
+    ``details=false`` leaves out the per-file scores.
+    """
+    models = request.args.get('models')
+    files = request.args.get('files')
+    model_ids = models.split(',') if models else list(MODELS.keys())
+    
+    report = evaluate(
+        REFERENCES_FOLDER,
+        RESULTS_FOLDER,
+        model_ids,
+        filenames=files.split(',') if files else None,
+        strip_diacritics=request.args.get('strip_diacritics', 'false').lower() == 'true'
+    )
+    if request.args.get('details', 'true').lower() == 'false':
+        report.pop('files')
+    
+    return jsonify(report)
+
+@api.route('/api/results', methods=['GET'])
+def query_results():
+    """List indexed results, filtered by model, status and date."""
+    try:
+        limit = min(int(request.args.get('limit', 100)), 1000)
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
     
-    # Save to Excel
-    excel_filename = f"transcription_{timestamp}.xlsx"
-    excel_path = RESULTS_FOLDER / excel_filename
-    with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Transcription Results', index=False)
+    results = results_index.query(
+        model_id=request.args.get('model'),
+        status=request.args.get('status'),
+        since=request.args.get('since'),
+        until=request.args.get('until'),
+        limit=limit,
+        offset=offset
+    )
     
-    logger.info(f"Summary report saved: {csv_path}")
+    return jsonify({
+        'results': results,
+        'limit': limit,
+        'offset': offset
+    })
 
-@app.route('/api/results/<filename>', methods=['GET'])
+@api.route('/api/results/<filename>', methods=['GET'])
 def get_results(filename):
     """Get transcription results for a specific file."""
-    # Look for result files
-    result_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_*.txt"))
+    rows = results_index.get(filename)
     
-    if not result_files:
+    if not rows:
         return jsonify({'error': 'No results found'}), 404
     
     results = []
-    for file_path in result_files:
-        model_id = file_path.stem.split('_')[-1]
-        with open(file_path, 'r', encoding='utf-8') as f:
-            transcript = f.read()
+    for row in rows:
+        transcript = ''
+        if row['transcript_path'] and Path(row['transcript_path']).exists():
+            with open(row['transcript_path'], 'r', encoding='utf-8') as f:
+                transcript = f.read()
         
         results.append({
-            'model_id': model_id,
+            'model_id': row['model_id'],
+            'status': row['status'],
             'transcript': transcript,
-            'file_path': str(file_path)
+            'error': row['error'] or '',
+            'processing_time': row['processing_time'] or 0,
+            'created_at': row['created_at'],
+            'file_path': row['transcript_path']
         })
     
     return jsonify({
@@ -274,35 +973,31 @@ def get_results(filename):
         'results': results
     })
 
-@app.route('/api/results/<filename>', methods=['DELETE'])
+def delete_indexed_results(filenames):
+    """Remove the indexed results of audio files and their transcript files."""
+    deleted_files = []
+    for row in results_index.delete(filenames):
+        if not row['transcript_path']:
+            continue
+        
+        file_path = Path(row['transcript_path'])
+        try:
+            file_path.unlink(missing_ok=True)
+            deleted_files.append(str(file_path.name))
+            logger.info(f"Deleted result file: {file_path}")
+        except Exception as e:
+            logger.error(f"Failed to delete {file_path}: {e}")
+    
+    return deleted_files
+
+@api.route('/api/results/<filename>', methods=['DELETE'])
 def delete_results(filename):
     """Delete all transcription results for a specific file."""
     try:
-        # Find all result files for this audio file
-        result_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_*.txt"))
-        
-        if not result_files:
+        if not results_index.get(filename):
             return jsonify({'error': 'No results found'}), 404
         
-        # Delete all result files
-        deleted_files = []
-        for file_path in result_files:
-            try:
-                file_path.unlink()  # Delete the file
-                deleted_files.append(str(file_path.name))
-                logger.info(f"Deleted result file: {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to delete {file_path}: {e}")
-        
-        # Also try to delete any Excel/CSV summary files
-        summary_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_summary.*"))
-        for file_path in summary_files:
-            try:
-                file_path.unlink()
-                deleted_files.append(str(file_path.name))
-                logger.info(f"Deleted summary file: {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to delete {file_path}: {e}")
+        deleted_files = delete_indexed_results([filename])
         
         return jsonify({
             'message': f'Deleted {len(deleted_files)} files',
@@ -313,7 +1008,7 @@ def delete_results(filename):
         logger.error(f"Error deleting results for {filename}: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/results/bulk', methods=['DELETE'])
+@api.route('/api/results/bulk', methods=['DELETE'])
 def bulk_delete_results():
     """Delete results for multiple files."""
     try:
@@ -323,68 +1018,36 @@ def bulk_delete_results():
         if not filenames:
             return jsonify({'error': 'No filenames provided'}), 400
         
-        all_deleted = []
-        errors = []
-        
-        for filename in filenames:
-            try:
-                result_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_*.txt"))
-                summary_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_summary.*"))
-                
-                deleted_for_file = []
-                for file_path in result_files + summary_files:
-                    try:
-                        file_path.unlink()
-                        deleted_for_file.append(str(file_path.name))
-                    except Exception as e:
-                        logger.error(f"Failed to delete {file_path}: {e}")
-                
-                if deleted_for_file:
-                    all_deleted.extend(deleted_for_file)
-                    logger.info(f"Deleted {len(deleted_for_file)} files for {filename}")
-                    
-            except Exception as e:
-                errors.append(f"{filename}: {str(e)}")
-                logger.error(f"Error deleting results for {filename}: {e}")
-        
-        response = {
+        all_deleted = delete_indexed_results(filenames)
+        logger.info(f"Deleted {len(all_deleted)} result files for {len(filenames)} audio files")
+        
+        return jsonify({
             'message': f'Deleted {len(all_deleted)} files',
             'deleted_files': all_deleted
-        }
-        
-        if errors:
-            response['errors'] = errors
-            
-        return jsonify(response)
+        })
         
     except Exception as e:
         logger.error(f"Error in bulk delete: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/files/<filename>', methods=['DELETE'])
+@api.route('/api/files/<filename>', methods=['DELETE'])
 def delete_audio_file(filename):
     """Delete an audio file and its transcription results."""
     try:
         # Delete from audio_clips folder
-        audio_path = AUDIO_FOLDER / filename
+        audio_path = UPLOAD_FOLDER / secure_filename(filename)
         deleted_files = []
         
         if audio_path.exists():
             audio_path.unlink()
             deleted_files.append(f"audio:{filename}")
             logger.info(f"Deleted audio file: {audio_path}")
+        remove_preprocessed(audio_path)
+        upload_manager.forget(audio_path.name)
+        file_index.remove(audio_path.name)
         
         # Delete transcription results
-        result_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_*.txt"))
-        summary_files = list(RESULTS_FOLDER.glob(f"{Path(filename).stem}_summary.*"))
-        
-        for file_path in result_files + summary_files:
-            try:
-                file_path.unlink()
-                deleted_files.append(str(file_path.name))
-                logger.info(f"Deleted result file: {file_path}")
-            except Exception as e:
-                logger.error(f"Failed to delete {file_path}: {e}")
+        deleted_files.extend(delete_indexed_results([filename]))
         
         return jsonify({
             'message': f'Deleted {len(deleted_files)} files',
@@ -395,31 +1058,85 @@ def delete_audio_file(filename):
         logger.error(f"Error deleting file {filename}: {e}")
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/download/<path:filename>', methods=['GET'])
+@api.route('/api/download/<filename>', methods=['GET'])
 def download_file(filename):
-    """Download a file from the results folder."""
-    file_path = RESULTS_FOLDER / filename
-    if file_path.exists():
-        return send_file(file_path, as_attachment=True)
-    else:
+    """Download a transcript from the results folder."""
+    file_path = resolve_path(RESULTS_FOLDER, filename, TRANSCRIPT_EXTENSIONS)
+    if file_path is None:
         return jsonify({'error': 'File not found'}), 404
+    
+    return serve_file(file_path, 'results', FILE_SERVING, as_attachment=True)
 
-@app.route('/api/files', methods=['GET'])
+@api.route('/api/audio/<filename>', methods=['GET'])
+def stream_audio(filename):
+    """Serve an uploaded recording for playback, with Range support for seeking."""
+    file_path = resolve_path(UPLOAD_FOLDER, filename, AUDIO_MIMETYPES)
+    if file_path is None:
+        return jsonify({'error': 'File not found'}), 404
+    
+    return serve_file(
+        file_path,
+        'audio',
+        FILE_SERVING,
+        mimetype=AUDIO_MIMETYPES.get(file_path.suffix.lower()),
+        max_age=FILE_SERVING['audio_max_age']
+    )
+
+@api.route('/api/files', methods=['GET'])
 def list_files():
-    """List uploaded audio files."""
-    files = []
-    for file_path in UPLOAD_FOLDER.glob('*'):
-        if file_path.is_file() and allowed_file(file_path.name):
-            files.append({
-                'filename': file_path.name,
-                'size': file_path.stat().st_size,
-                'upload_time': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-            })
+    """List uploaded audio files, one page at a time.
     
-    return jsonify({'files': files})
+    Query parameters: ``sort`` (upload_time, size, filename), ``order``
+    (asc, desc), ``limit``, ``cursor`` (``next_cursor`` of the previous
+    page), and the filters ``extension``, ``since``/``until`` (ISO dates),
+    ``min_size``/``max_size`` (bytes) and ``has_results`` (true/false).
+    """
+    args = request.args
+    has_results = args.get('has_results')
+    try:
+        page = file_index.list(
+            sort=args.get('sort', 'upload_time'),
+            order=args.get('order', 'desc'),
+            limit=args.get('limit', 50, type=int),
+            cursor=args.get('cursor'),
+            extension=args.get('extension'),
+            since=args.get('since'),
+            until=args.get('until'),
+            min_size=args.get('min_size', type=int),
+            max_size=args.get('max_size', type=int),
+            has_results=None if has_results is None else has_results.lower() == 'true'
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Unchanged pages are answered with 304 Not Modified
+    response = jsonify(page)
+    response.add_etag()
+    return response.make_conditional(request)
 
-if __name__ == '__main__':
-    # Initialize transcribers on startup
+def create_app():
+    """Application factory: a Flask app serving the API.
+    
+    Services (transcribers, indexes, job runners) are module-level and
+    shared by every app created here; call ``prepare_services()`` once per
+    server and ``start_worker()`` in every process that serves requests.
+    Creates the data folders and stores on first use.
+    """
+    init_services()
+    
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = UPLOAD_MAX_BYTES
+    app.config['USE_X_SENDFILE'] = FILE_SERVING['x_sendfile']
+    CORS(app)
+    app.register_blueprint(api)
+    return app
+
+def prepare_services():
+    """Startup work done once, before worker processes are forked (gunicorn preload)."""
+    init_services()
+    
+    # Initialize transcribers on startup; preloaded Whisper weights are then
+    # shared copy-on-write by forked workers
     initialize_transcribers()
     
     if not transcribers:
@@ -428,4 +1145,80 @@ if __name__ == '__main__':
     else:
         logger.info(f"Starting server with {len(transcribers)} transcription services")
     
+    # Index transcripts written before the results index existed
+    results_index.backfill(RESULTS_FOLDER, MODELS.keys())
+    
+    # Bring the file index up to date
+    file_index.sync()
+
+def start_worker(forked=False, background=True):
+    """Per-process startup of a process that serves requests.
+    
+    ``forked``: the process was forked after ``prepare_services()``, so it
+    opens its own database connections and provider clients instead of
+    sharing the parent's. ``background``: this process also follows the
+    upload folder and resumes interrupted jobs and batches; exactly one
+    process per server should.
+    """
+    if forked:
+        for store in (result_cache, upload_manager, results_index, file_index):
+            if store is not None:
+                store.reconnect()
+        # Remote clients hold connection pools (and gRPC channels) that must
+        # not be shared with the parent; local models stay shared
+        for model_id in list(transcribers):
+            if not MODELS[model_id].get('local'):
+                transcribers[model_id] = create_transcriber(model_id)
+    
+    if background:
+        file_index.start_watching(FILE_INDEX_RESCAN_SECONDS)
+        
+        # Pick up jobs that were interrupted by the last shutdown
+        job_manager.resume_pending()
+        batch_manager.resume_pending()
+        
+        if ORPHAN_RESCAN_SECONDS:
+            threading.Thread(target=resume_orphans, args=(ORPHAN_RESCAN_SECONDS,),
+                             name='orphan-rescan', daemon=True).start()
+
+def resume_orphans(interval):
+    """Keep taking over the jobs and batches of worker processes that exited."""
+    while not stopping.wait(interval):
+        try:
+            job_manager.resume_pending()
+            batch_manager.resume_pending()
+        except Exception as e:
+            logger.warning(f"Rescan for orphaned jobs failed: {e}")
+
+def shutdown(timeout=None):
+    """Graceful stop: let running jobs and batch items finish within ``timeout`` seconds.
+    
+    Queued jobs and unfinished batches stay on disk and are resumed at the
+    next start. Returns whether everything running finished in time.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    
+    def remaining():
+        return None if deadline is None else max(0, deadline - time.monotonic())
+    
+    stopping.set()
+    file_index.stop_watching()
+    drained = job_manager.drain(remaining())
+    drained = batch_manager.drain(remaining()) and drained
+    if local_pool is not None:
+        local_pool.shutdown(wait=False, cancel_futures=True)
+    metrics.flush()
+    
+    if drained:
+        logger.info("✓ Drained running jobs")
+    else:
+        logger.warning("✗ Shutdown timed out; unfinished jobs resume at the next start")
+    return drained
+
+if __name__ == '__main__':
+    # Development server; use gunicorn with gunicorn.conf.py in production
+    app = create_app()
+    prepare_services()
+    start_worker()
+    
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -0,0 +1,410 @@
+"""
+Batch transcription of whole directories or manifests.
+
+A batch is every (file, model) pair of a list of audio files and models.
+Work items are fed to ``start_transcription`` through a bounded window, so
+remote providers run concurrently up to their own limits while local models
+run in a process pool (one model copy per process). Each finished item is
+appended to the batch's JSONL result file; that file is both the checkpoint
+(an interrupted batch skips items already in it when resumed) and the
+consolidated result set.
+
+Items a provider turned away (circuit open, at capacity, rate limited) are
+not checkpointed: the batch finishes as ``incomplete`` and resuming it
+retries them.
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from jobs import claim, owned_elsewhere
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {'.wav', '.mp3', '.m4a', '.flac', '.ogg'}
+
+# Statuses of a batch that still has work left
+PENDING_STATUSES = {'queued', 'running'}
+
+# Finished with items deferred by an unavailable provider; resumable
+INCOMPLETE = 'incomplete'
+
+RESULT_FIELDS = (
+    'filename', 'file_path', 'model_id', 'model_name', 'status', 'transcript',
+    'confidence', 'error', 'processing_time', 'cached'
+)
+
+
+def collect_audio_files(directory: Path, recursive: bool = False) -> list:
+    """Audio files in a directory, sorted by name."""
+    pattern = '**/*' if recursive else '*'
+    return sorted(
+        path for path in Path(directory).glob(pattern)
+        if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS
+        and not any(part.startswith('.') for part in path.relative_to(directory).parts)
+    )
+
+
+def read_manifest(manifest_path: Path) -> list:
+    """
+    Audio paths listed in a manifest: a JSON list, or one path per line.
+
+    Relative paths are resolved against the manifest's folder.
+    """
+    manifest_path = Path(manifest_path)
+    text = manifest_path.read_text(encoding='utf-8')
+    if manifest_path.suffix.lower() == '.json':
+        entries = json.loads(text)
+    else:
+        entries = [line.strip() for line in text.splitlines()
+                   if line.strip() and not line.startswith('#')]
+    return [(manifest_path.parent / entry) if not Path(entry).is_absolute() else Path(entry)
+            for entry in entries]
+
+
+class BatchManager:
+    """Runs batches in the background and checkpoints their results."""
+
+    def __init__(self, batches_folder: Path, start, on_result=None,
+                 max_outstanding: int = 32, max_batches: int = 1, capacity=None):
+        """
+        Args:
+            batches_folder: Directory holding ``{id}.json`` (state) and
+                ``{id}.jsonl`` (results) per batch
+            start: ``start(model_id, file_path) -> Future`` of a result dict,
+                i.e. ``start_transcription`` with the batch's execution options
+            on_result: Called with ``(file_path, result)`` for every finished item
+            max_outstanding: Work items in flight at once per batch
+            max_batches: Batches processed at the same time
+            capacity: ``capacity(model_id)``, the most items of one model in
+                flight at once (0 = no limit beyond ``max_outstanding``),
+                i.e. the provider's in-flight cap. Items past it would only
+                wait for a slot inside the provider's limiter.
+        """
+        self.batches_folder = Path(batches_folder)
+        self.batches_folder.mkdir(exist_ok=True)
+        self.start = start
+        self.on_result = on_result
+        self.max_outstanding = max_outstanding
+        self.capacity = capacity or (lambda model_id: 0)
+        self.executor = ThreadPoolExecutor(max_workers=max_batches, thread_name_prefix='batch')
+        self._lock = threading.Lock()
+        self._futures = {}  # future -> batch_id, for batches queued or running here
+        self._stopping = threading.Event()
+
+    def create(self, files: list, models: list) -> dict:
+        """Record a new batch without starting it."""
+        batch = {
+            'batch_id': uuid.uuid4().hex,
+            'status': 'queued',
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'files': [str(path) for path in files],
+            'models': list(models),
+            'total': len(files) * len(models),
+            'completed': 0,
+            'successful': 0,
+            'failed': 0,
+            'deferred': 0
+        }
+        with self._lock:
+            self._save(batch)
+        logger.info(f"Created batch {batch['batch_id']}: {len(files)} files x {len(models)} models")
+        return batch
+
+    def submit(self, files: list, models: list) -> dict:
+        """Create a batch and run it in the background."""
+        batch = self.create(files, models)
+        self._queue(batch['batch_id'])
+        return batch
+
+    def get(self, batch_id: str):
+        """Return the state of a batch, or None if it does not exist."""
+        with self._lock:
+            return self._load(batch_id)
+
+    def iter_results(self, batch_id: str):
+        """Yield the finished work items of a batch."""
+        results_path = self._results_path(batch_id)
+        if not results_path.exists():
+            return
+        with open(results_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Partially written line from an interrupted run
+                    continue
+
+    def resume_pending(self) -> int:
+        """
+        Re-queue batches that were queued or running when their process stopped.
+
+        Batches owned by another live process are left to it, and batches
+        this process already runs are skipped, so this can be called again
+        to pick up the batches of a worker that exited.
+        """
+        resumed = 0
+        for batch_path in sorted(self.batches_folder.glob('*.json')):
+            batch = self.get(batch_path.stem)
+            if not batch or batch['status'] not in PENDING_STATUSES or owned_elsewhere(batch):
+                continue
+            with self._lock:
+                if batch['batch_id'] in self._futures.values():
+                    continue
+            self._queue(batch['batch_id'])
+            resumed += 1
+        if resumed:
+            logger.info(f"Resumed {resumed} unfinished batches")
+        return resumed
+
+    def run(self, batch_id: str) -> dict:
+        """Process every work item of a batch not yet in its checkpoint; blocks until done."""
+        batch = self.get(batch_id)
+        if batch is None:
+            raise KeyError(f"Batch not found: {batch_id}")
+
+        self._truncate_partial_line(batch_id)
+        done = set()
+        successful = 0
+        for row in self.iter_results(batch_id):
+            done.add((row['file_path'], row['model_id']))
+            successful += row['status'] == 'success'
+        items = [
+            (model_id, Path(file_path))
+            for file_path in batch['files']
+            for model_id in batch['models']
+            if (file_path, model_id) not in done
+        ]
+
+        with self._lock:
+            # Counts are rebuilt from the checkpoint: the state file may be
+            # ahead of it when the last run stopped mid-write
+            batch.update({
+                'completed': len(done),
+                'successful': successful,
+                'failed': len(done) - successful,
+                'deferred': 0
+            })
+            batch['status'] = 'running'
+            claim(batch)
+            batch['started_at'] = batch['started_at'] or datetime.now().isoformat()
+            self._save(batch)
+
+        if done:
+            logger.info(f"Batch {batch_id}: resuming, {len(done)} of {batch['total']} items already done")
+
+        try:
+            if not self._process(batch, items):
+                # Stopped by drain(); the batch stays running and resumes at the next start
+                logger.info(f"Batch {batch_id} stopped after {batch['completed']} of {batch['total']} items")
+                return batch
+            status = INCOMPLETE if batch['deferred'] else 'completed'
+        except Exception as e:
+            logger.error(f"Batch {batch_id} failed: {e}")
+            status = 'failed'
+            batch['error'] = str(e)
+
+        with self._lock:
+            batch['status'] = status
+            batch['finished_at'] = datetime.now().isoformat()
+            self._save(batch)
+
+        logger.info(f"Batch {batch_id} {status}: {batch['successful']} succeeded, {batch['failed']} failed"
+                    + (f", {batch['deferred']} deferred" if batch['deferred'] else ""))
+        return batch
+
+    def shutdown(self, wait: bool = True):
+        self.executor.shutdown(wait=wait)
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Stop starting work items and wait up to ``timeout`` seconds for the
+        ones in flight to be checkpointed.
+
+        Running batches keep their status, so ``resume_pending()`` continues
+        them at the next start. Returns whether every batch thread stopped.
+        """
+        self._stopping.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            running = list(self._futures)
+        _, not_done = wait(running, timeout=timeout)
+        return not not_done
+
+    def _queue(self, batch_id: str):
+        with self._lock:
+            batch = self._load(batch_id)
+            claim(batch)
+            self._save(batch)
+        future = self.executor.submit(self.run, batch_id)
+        with self._lock:
+            self._futures[future] = batch_id
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.pop(future, None)
+
+    def _process(self, batch: dict, items: list) -> bool:
+        """
+        Keep up to ``max_outstanding`` items in flight, at most ``capacity``
+        of each model, and checkpoint each result.
+
+        Returns False if ``drain()`` stopped it before every item was started.
+        """
+        # One queue per model, so a model at its cap doesn't hold up the others
+        queues = {}
+        for model_id, file_path in items:
+            queues.setdefault(model_id, deque()).append(file_path)
+        outstanding = {}
+        in_flight = dict.fromkeys(queues, 0)
+        limits = {model_id: self.capacity(model_id) for model_id in queues}
+
+        def next_item():
+            """The next file of the model with a free slot and the fewest items in flight."""
+            ready = [model_id for model_id, queue in queues.items()
+                     if queue and (not limits[model_id] or in_flight[model_id] < limits[model_id])]
+            if not ready:
+                return None
+            model_id = min(ready, key=in_flight.get)
+            return model_id, queues[model_id].popleft()
+
+        def fill():
+            while len(outstanding) < self.max_outstanding and not self._stopping.is_set():
+                item = next_item()
+                if item is None:
+                    return
+                model_id, file_path = item
+                if not file_path.exists():
+                    self._record(batch, file_path, {
+                        'model_id': model_id,
+                        'status': 'error',
+                        'error': f"File not found: {file_path}"
+                    })
+                    continue
+                outstanding[self.start(model_id, file_path)] = (model_id, file_path)
+                in_flight[model_id] += 1
+
+        fill()
+        while outstanding:
+            finished, _ = wait(outstanding, return_when=FIRST_COMPLETED)
+            for future in finished:
+                model_id, file_path = outstanding.pop(future)
+                in_flight[model_id] -= 1
+                self._record(batch, file_path, future.result())
+            fill()
+        return not any(queues.values())
+
+    def _record(self, batch: dict, file_path: Path, result: dict):
+        if result.get('retryable'):
+            # Not the file's fault: leave it out of the checkpoint so a resume retries it
+            logger.warning(f"Batch {batch['batch_id']}: deferred {file_path.name} "
+                           f"({result['model_id']}): {result.get('error')}")
+            with self._lock:
+                batch['deferred'] += 1
+                self._save(batch)
+            return
+
+        row = {field: result.get(field) for field in RESULT_FIELDS}
+        row.update({
+            'filename': file_path.name,
+            'file_path': str(file_path),
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        })
+
+        with self._lock:
+            with open(self._results_path(batch['batch_id']), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            batch['completed'] += 1
+            if result['status'] == 'success':
+                batch['successful'] += 1
+            else:
+                batch['failed'] += 1
+            self._save(batch)
+
+        if self.on_result:
+            self.on_result(file_path, result)
+
+    def _truncate_partial_line(self, batch_id: str):
+        """Drop a result line left half-written by a crash, so appends start on a new line."""
+        results_path = self._results_path(batch_id)
+        if not results_path.exists():
+            return
+        with open(results_path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def _batch_path(self, batch_id: str) -> Path:
+        return self.batches_folder / f"{batch_id}.json"
+
+    def _results_path(self, batch_id: str) -> Path:
+        return self.batches_folder / f"{batch_id}.jsonl"
+
+    def _load(self, batch_id: str):
+        """Load a batch from disk. Caller must hold the lock."""
+        if not batch_id.isalnum():
+            return None
+        batch_path = self._batch_path(batch_id)
+        if not batch_path.exists():
+            return None
+        with open(batch_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, batch: dict):
+        """Atomically write a batch's state. Caller must hold the lock."""
+        batch_path = self._batch_path(batch['batch_id'])
+        tmp_path = batch_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(batch, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, batch_path)
+
+
+# Local models in batch worker processes: each process loads its own copy
+# once and reuses it for every file it is given
+_process_transcribers = {}
+
+
+def init_local_worker(cpu_threads: int):
+    """Process pool initializer: split the CPU between the worker processes."""
+    from config import MODELS
+
+    for model_config in MODELS.values():
+        if model_config.get('local') and not model_config.get('cpu_threads'):
+            model_config['cpu_threads'] = cpu_threads
+
+
+def transcribe_in_process(model_id: str, audio_path: str):
+    """Run a local model on one file inside a worker process."""
+    from transcribers import create_transcriber
+
+    transcriber = _process_transcribers.get(model_id)
+    if transcriber is None:
+        transcriber = _process_transcribers[model_id] = create_transcriber(model_id)
+
+    audio_path = Path(audio_path)
+    if transcriber.needs_chunking(audio_path):
+        return transcriber.transcribe_chunked(audio_path)
+    return transcriber.transcribe(audio_path)
+
+
+def create_local_pool(processes: int) -> ProcessPoolExecutor:
+    """Process pool for local models. Uses spawn: the server process runs threads."""
+    import multiprocessing
+
+    cpu_threads = max(1, (os.cpu_count() or 1) // processes)
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_local_worker,
+        initargs=(cpu_threads,)
+    )
@@ -0,0 +1,101 @@
+"""
+Command-line batch transcription.
+
+Runs the same batch pipeline as ``POST /api/batches`` in the foreground:
+
+    cd backend
+    python batch_cli.py ../audio_clips --models whisper,speechmatics --output results.csv
+    python batch_cli.py --manifest clips.txt --models google
+    python batch_cli.py --resume <batch_id>
+
+Progress is checkpointed under ``batches/``; an interrupted run continues
+where it stopped with ``--resume``.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Transcribe a directory or manifest of audio files")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("directory", nargs="?", type=Path, help="Directory of audio files")
+    source.add_argument("--manifest", type=Path,
+                        help="JSON list or text file with one audio path per line")
+    source.add_argument("--resume", metavar="BATCH_ID", help="Continue an interrupted batch")
+    parser.add_argument("--models", help="Comma-separated model IDs (default: all available)")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--output", type=Path, help="Write the results to a .csv or .jsonl file")
+    return parser.parse_args(argv)
+
+
+def write_results(rows, output_path: Path):
+    from reports import iter_csv
+
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        if output_path.suffix.lower() == ".csv":
+            for chunk in iter_csv(rows):
+                f.write(chunk)
+        else:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # The app module sets up the executors, caches and result stores; it's
+    # imported here so local model worker processes don't import it too
+    import app
+    from batch import collect_audio_files, read_manifest
+
+    app.init_services()
+    app.initialize_transcribers()
+    if not app.transcribers:
+        print("No transcription services available", file=sys.stderr)
+        return 1
+
+    manager = app.batch_manager
+    if args.resume:
+        batch = manager.get(args.resume)
+        if batch is None:
+            print(f"Batch not found: {args.resume}", file=sys.stderr)
+            return 1
+    else:
+        files = read_manifest(args.manifest) if args.manifest else \
+            collect_audio_files(args.directory, recursive=args.recursive)
+        if not files:
+            print("No audio files found", file=sys.stderr)
+            return 1
+        models = args.models.split(",") if args.models else list(app.transcribers.keys())
+        batch = manager.create(files, models)
+        print(f"Batch {batch['batch_id']}: {len(files)} files x {len(models)} models")
+
+    try:
+        batch = manager.run(batch["batch_id"])
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; continue with --resume {batch['batch_id']}", file=sys.stderr)
+        return 130
+    finally:
+        if app.local_pool is not None:
+            app.local_pool.shutdown(cancel_futures=True)
+
+    print(f"{batch['status']}: {batch['successful']} succeeded, {batch['failed']} failed "
+          f"of {batch['total']}")
+    if batch.get("deferred"):
+        print(f"{batch['deferred']} items deferred by unavailable providers; "
+              f"retry them with --resume {batch['batch_id']}", file=sys.stderr)
+
+    if args.output:
+        write_results(manager.iter_results(batch["batch_id"]), args.output)
+        print(f"Results written to {args.output}")
+
+    return 0 if batch["status"] == "completed" else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Accuracy of model transcripts against reference transcripts.
+
+References are plain text files named after the audio file
+(``references/{stem}.txt``); hypotheses are the ``{stem}_{model_id}.txt``
+transcripts the app writes to ``transcriptions/``. Both are normalized
+the same way before scoring: Unicode NFC, lowercase, punctuation removed,
+whitespace collapsed. Latvian diacritics (ā, č, ē, ģ, ī, ķ, ļ, ņ, š, ū, ž)
+distinguish words, so they are kept unless ``strip_diacritics`` is set,
+which scores providers that drop them without penalty.
+
+Word and character error rates use a vectorized Levenshtein distance: each
+row of the dynamic programming table is computed with a few NumPy array
+operations, so only the shorter sequence is looped over in Python.
+"""
+
+import logging
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Characters treated as word separators rather than deleted
+SEPARATORS = {'-', '‐', '–', '—', '/', '_'}
+
+
+def normalize_text(text: str, strip_diacritics: bool = False) -> str:
+    """Lowercase, drop punctuation and symbols, and collapse whitespace."""
+    text = unicodedata.normalize('NFC', text).lower()
+    if strip_diacritics:
+        text = ''.join(
+            c for c in unicodedata.normalize('NFD', text)
+            if unicodedata.category(c) != 'Mn'
+        )
+
+    chars = []
+    for c in text:
+        if c in SEPARATORS or c.isspace():
+            chars.append(' ')
+        elif unicodedata.category(c)[0] not in 'PS':
+            chars.append(c)
+    return ' '.join(''.join(chars).split())
+
+
+def edit_distance(reference: np.ndarray, hypothesis: np.ndarray) -> int:
+    """
+    Levenshtein distance between two integer sequences.
+
+    Each DP row is built from the previous one without a Python loop over
+    its cells: substitutions and deletions are elementwise minimums, and
+    insertions (``row[j] = min(row[j], row[j - 1] + 1)``) become a running
+    minimum, ``row = minimum.accumulate(row - arange) + arange``.
+    """
+    # Loop over the shorter sequence; the distance is symmetric
+    if len(reference) < len(hypothesis):
+        reference, hypothesis = hypothesis, reference
+    if len(hypothesis) == 0:
+        return len(reference)
+
+    offsets = np.arange(len(reference) + 1)
+    row = offsets.copy()
+    candidates = np.empty_like(row)
+    for i, token in enumerate(hypothesis, start=1):
+        candidates[0] = i
+        np.minimum(row[1:] + 1, row[:-1] + (reference != token), out=candidates[1:])
+        row = np.minimum.accumulate(candidates - offsets) + offsets
+    return int(row[-1])
+
+
+def _word_ids(words: list, vocabulary: dict) -> np.ndarray:
+    return np.fromiter((vocabulary.setdefault(w, len(vocabulary)) for w in words),
+                       dtype=np.int64, count=len(words))
+
+
+def _char_ids(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def score(reference: str, hypothesis: str, strip_diacritics: bool = False) -> dict:
+    """Word and character errors of one hypothesis against its reference."""
+    reference = normalize_text(reference, strip_diacritics)
+    hypothesis = normalize_text(hypothesis, strip_diacritics)
+    ref_words, hyp_words = reference.split(), hypothesis.split()
+
+    vocabulary = {}
+    word_errors = edit_distance(_word_ids(ref_words, vocabulary), _word_ids(hyp_words, vocabulary))
+    char_errors = edit_distance(_char_ids(reference), _char_ids(hypothesis))
+
+    return {
+        'word_errors': word_errors,
+        'ref_words': len(ref_words),
+        'char_errors': char_errors,
+        'ref_chars': len(reference),
+        'wer': word_errors / len(ref_words) if ref_words else float(bool(hyp_words)),
+        'cer': char_errors / len(reference) if reference else float(bool(hypothesis))
+    }
+
+
+def load_references(references_folder: Path, filenames=None) -> dict:
+    """Reference texts by audio stem, optionally limited to some audio files."""
+    stems = {Path(name).stem for name in filenames} if filenames else None
+    references = {}
+    for path in sorted(Path(references_folder).glob('*.txt')):
+        if stems is None or path.stem in stems:
+            references[path.stem] = path.read_text(encoding='utf-8')
+    return references
+
+
+def evaluate(references_folder: Path, results_folder: Path, model_ids,
+             filenames=None, strip_diacritics: bool = False) -> dict:
+    """
+    Score every (file, model) transcript that has a reference.
+
+    Per-model aggregates give corpus WER/CER (total errors over total
+    reference length, so long files weigh more) and the mean of per-file
+    rates. Files without a transcript for a model are counted as missing.
+    """
+    references = load_references(references_folder, filenames)
+    rows = []
+    totals = {
+        model_id: {'files': 0, 'missing': 0, 'word_errors': 0, 'ref_words': 0,
+                   'char_errors': 0, 'ref_chars': 0, 'wer_sum': 0.0, 'cer_sum': 0.0}
+        for model_id in model_ids
+    }
+
+    for stem, reference in references.items():
+        for model_id in model_ids:
+            transcript_path = Path(results_folder) / f"{stem}_{model_id}.txt"
+            if not transcript_path.exists():
+                totals[model_id]['missing'] += 1
+                continue
+
+            result = score(reference, transcript_path.read_text(encoding='utf-8'), strip_diacritics)
+            rows.append({'audio_stem': stem, 'model_id': model_id, **result})
+
+            total = totals[model_id]
+            total['files'] += 1
+            for key in ('word_errors', 'ref_words', 'char_errors', 'ref_chars'):
+                total[key] += result[key]
+            total['wer_sum'] += result['wer']
+            total['cer_sum'] += result['cer']
+
+    models = {}
+    for model_id, total in totals.items():
+        files = total['files']
+        models[model_id] = {
+            'files': files,
+            'missing': total['missing'],
+            'wer': total['word_errors'] / total['ref_words'] if total['ref_words'] else None,
+            'cer': total['char_errors'] / total['ref_chars'] if total['ref_chars'] else None,
+            'mean_wer': total['wer_sum'] / files if files else None,
+            'mean_cer': total['cer_sum'] / files if files else None,
+            'word_errors': total['word_errors'],
+            'ref_words': total['ref_words'],
+            'char_errors': total['char_errors'],
+            'ref_chars': total['ref_chars']
+        }
+
+    logger.info(f"Evaluated {len(rows)} transcripts against {len(references)} references")
+    return {'references': len(references), 'models': models, 'files': rows}
@@ -0,0 +1,80 @@
+"""
+Per-job event logs for Server-Sent Events progress streams.
+
+Each running job keeps an in-memory, append-only list of events with
+increasing IDs. Subscribers block on a condition variable until events
+after the last one they saw arrive, so a reconnecting client passes its
+``Last-Event-ID`` and continues without gaps or polling.
+"""
+
+import json
+import threading
+import time
+
+# Seconds between SSE comments that keep idle connections (and proxies) open
+HEARTBEAT_SECONDS = 15
+
+
+class EventLog:
+    """Ordered events of one job."""
+
+    def __init__(self):
+        self._events = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, event_type: str, data: dict):
+        """Append an event and wake up subscribers."""
+        with self._condition:
+            if self._closed:
+                return
+            self._events.append((len(self._events) + 1, event_type, data))
+            self._condition.notify_all()
+
+    def close(self, event_type: str = None, data: dict = None):
+        """Publish a final event (if given) and end every subscription."""
+        with self._condition:
+            if self._closed:
+                return
+            if event_type:
+                self._events.append((len(self._events) + 1, event_type, data or {}))
+            self._closed = True
+            self._condition.notify_all()
+
+    def wait(self, after_id: int, timeout: float) -> list:
+        """Events with an ID above ``after_id``, waiting up to ``timeout`` for new ones."""
+        with self._condition:
+            self._condition.wait_for(lambda: len(self._events) > after_id or self._closed, timeout)
+            return self._events[after_id:]
+
+
+def format_event(event_id: int, event_type: str, data: dict) -> str:
+    """Encode one event in the text/event-stream format."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"id: {event_id}\nevent: {event_type}\ndata: {payload}\n\n"
+
+
+def stream_events(log: EventLog, last_event_id: int = 0):
+    """Yield SSE messages from ``log`` until it closes, with periodic heartbeats."""
+    # Tell EventSource how long to wait before reconnecting (ms)
+    yield "retry: 3000\n\n"
+
+    sent = last_event_id
+    last_write = time.monotonic()
+    while True:
+        events = log.wait(sent, HEARTBEAT_SECONDS)
+        for event_id, event_type, data in events:
+            yield format_event(event_id, event_type, data)
+            sent = event_id
+            last_write = time.monotonic()
+
+        if log.closed and not log.wait(sent, 0):
+            return
+
+        if time.monotonic() - last_write >= HEARTBEAT_SECONDS:
+            yield ": keep-alive\n\n"
+            last_write = time.monotonic()
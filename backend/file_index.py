@@ -0,0 +1,271 @@
+"""
+SQLite index of the uploaded audio files.
+
+Listing reads one page from the index instead of globbing and stat-ing the
+whole upload folder, so its cost doesn't grow with the library. Pages are
+addressed with keyset cursors (the last row's sort value and filename), so
+deep pages are as cheap as the first and stay stable while files are added.
+
+The index lives in the results index database, so "has results" is a join
+on the ``results`` table. It is kept current by the upload and delete
+routes; a watcher (watchdog, if installed) or a periodic rescan picks up
+files copied into the folder by other means.
+"""
+
+import base64
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Listing sort keys and the column each one sorts on
+SORT_COLUMNS = {
+    'upload_time': 'mtime',
+    'size': 'size',
+    'filename': 'filename'
+}
+
+MAX_PAGE_SIZE = 500
+
+
+class FileIndex:
+    """Indexed metadata of the audio files in the upload folder."""
+
+    def __init__(self, db_path: Path, upload_folder: Path, extensions):
+        self.db_path = Path(db_path)
+        self.upload_folder = Path(upload_folder)
+        self.extensions = {extension.lower().lstrip('.') for extension in extensions}
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS files (
+                filename TEXT PRIMARY KEY,
+                stem TEXT NOT NULL,
+                extension TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_files_mtime ON files (mtime, filename);
+            CREATE INDEX IF NOT EXISTS idx_files_size ON files (size, filename);
+            CREATE INDEX IF NOT EXISTS idx_files_extension ON files (extension, mtime);
+            CREATE INDEX IF NOT EXISTS idx_files_stem ON files (stem);
+        ''')
+        self._conn.commit()
+
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def reconnect(self):
+        """Open a new connection, e.g. in a worker process forked after the app was loaded."""
+        with self._lock:
+            self._conn = self._connect()
+
+    def add(self, file_path: Path):
+        """Index (or re-index) one file after it was written."""
+        file_path = Path(file_path)
+        if not self._is_audio(file_path.name):
+            return
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            self.remove(file_path.name)
+            return
+
+        with self._lock:
+            self._upsert(file_path.name, stat.st_size, stat.st_mtime)
+            self._conn.commit()
+
+    def remove(self, filename: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM files WHERE filename = ?', (filename,))
+            self._conn.commit()
+
+    def sync(self) -> dict:
+        """
+        Reconcile the index with the folder: add new or changed files, drop missing ones.
+
+        ``os.scandir`` returns the stat data with the directory listing, so
+        this is one pass over the folder.
+        """
+        on_disk = {}
+        with os.scandir(self.upload_folder) as entries:
+            for entry in entries:
+                if entry.is_file() and self._is_audio(entry.name):
+                    stat = entry.stat()
+                    on_disk[entry.name] = (stat.st_size, stat.st_mtime)
+
+        with self._lock:
+            indexed = {
+                row['filename']: (row['size'], row['mtime'])
+                for row in self._conn.execute('SELECT filename, size, mtime FROM files')
+            }
+            changed = [name for name, meta in on_disk.items() if indexed.get(name) != meta]
+            missing = [name for name in indexed if name not in on_disk]
+
+            for name in changed:
+                self._upsert(name, *on_disk[name])
+            self._conn.executemany('DELETE FROM files WHERE filename = ?', [(name,) for name in missing])
+            self._conn.commit()
+
+        if changed or missing:
+            logger.info(f"File index: {len(changed)} added or updated, {len(missing)} removed")
+        return {'updated': len(changed), 'removed': len(missing)}
+
+    def list(self, sort: str = 'upload_time', order: str = 'desc', limit: int = 50,
+             cursor: str = None, extension: str = None, since: str = None, until: str = None,
+             min_size: int = None, max_size: int = None, has_results: bool = None) -> dict:
+        """
+        One page of files and the cursor of the next page (None on the last page).
+
+        ``since``/``until`` are ISO dates compared with the upload time.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key: {sort}. Choose from: {', '.join(SORT_COLUMNS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        column = SORT_COLUMNS[sort]
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+        clauses, params = [], []
+        if extension:
+            clauses.append('extension = ?')
+            params.append(extension.lower().lstrip('.'))
+        if since:
+            clauses.append('mtime >= ?')
+            params.append(datetime.fromisoformat(since).timestamp())
+        if until:
+            clauses.append('mtime < ?')
+            params.append(datetime.fromisoformat(until).timestamp())
+        if min_size is not None:
+            clauses.append('size >= ?')
+            params.append(min_size)
+        if max_size is not None:
+            clauses.append('size <= ?')
+            params.append(max_size)
+        if has_results is not None:
+            clauses.append(f"{'' if has_results else 'NOT '}EXISTS ("
+                           "SELECT 1 FROM results WHERE results.audio_stem = files.stem "
+                           "AND results.status = 'success')")
+        if cursor:
+            value, filename = self._decode_cursor(cursor)
+            comparison = '<' if order == 'desc' else '>'
+            if column == 'filename':
+                clauses.append(f'filename {comparison} ?')
+                params.append(filename)
+            else:
+                clauses.append(f'({column}, filename) {comparison} (?, ?)')
+                params.extend([value, filename])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        direction = order.upper()
+        order_by = 'filename' if column == 'filename' else f'{column} {direction}, filename'
+        query = (
+            "SELECT filename, extension, size, mtime, EXISTS ("
+            "SELECT 1 FROM results WHERE results.audio_stem = files.stem "
+            "AND results.status = 'success') AS has_results "
+            f"FROM files {where} ORDER BY {order_by} {direction} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(query, params + [limit + 1]).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(last[column], last['filename'])
+
+        files = [{
+            'filename': row['filename'],
+            'extension': row['extension'],
+            'size': row['size'],
+            'upload_time': datetime.fromtimestamp(row['mtime']).isoformat(),
+            'has_results': bool(row['has_results'])
+        } for row in rows]
+        return {'files': files, 'next_cursor': next_cursor}
+
+    def start_watching(self, rescan_seconds: float = 300):
+        """
+        Keep the index current with changes made outside the app.
+
+        Uses filesystem events if ``watchdog`` is installed, and rescans
+        every ``rescan_seconds`` either way in case events were missed.
+        """
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            logger.info("watchdog not installed; file index relies on periodic rescans")
+        else:
+            index = self
+
+            class Handler(FileSystemEventHandler):
+                def on_created(self, event):
+                    if not event.is_directory:
+                        index.add(Path(event.src_path))
+
+                on_modified = on_created
+
+                def on_deleted(self, event):
+                    if not event.is_directory:
+                        index.remove(Path(event.src_path).name)
+
+                def on_moved(self, event):
+                    if not event.is_directory:
+                        index.remove(Path(event.src_path).name)
+                        index.add(Path(event.dest_path))
+
+            self._watcher = Observer()
+            self._watcher.schedule(Handler(), str(self.upload_folder), recursive=False)
+            self._watcher.daemon = True
+            self._watcher.start()
+
+        if rescan_seconds:
+            threading.Thread(target=self._rescan_loop, args=(rescan_seconds,),
+                             name='file-index-rescan', daemon=True).start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def _rescan_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"File index rescan failed: {e}")
+
+    def _is_audio(self, filename: str) -> bool:
+        return '.' in filename and filename.rsplit('.', 1)[1].lower() in self.extensions
+
+    def _upsert(self, filename: str, size: int, mtime: float):
+        """Insert or update a row. Caller must hold the lock."""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO files (filename, stem, extension, size, mtime) VALUES (?, ?, ?, ?, ?)',
+            (filename, Path(filename).stem, filename.rsplit('.', 1)[1].lower(), size, mtime)
+        )
+
+    @staticmethod
+    def _encode_cursor(value, filename: str) -> str:
+        return base64.urlsafe_b64encode(json.dumps([value, filename]).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        try:
+            value, filename = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        return value, filename
@@ -0,0 +1,115 @@
+"""
+Serving stored files: transcripts for download and audio for playback.
+
+Paths from the URL are joined to their folder with ``safe_join`` and then
+resolved, so ``..``, absolute paths and symlinks can't leave the folder,
+and hidden folders (upload staging, preprocessed audio) aren't served.
+Each route also names the extensions it serves, so databases and logs kept
+next to the files (``index.db``, ``results_log.jsonl``) stay private.
+
+Responses are conditional: they carry an ETag and Last-Modified, answer
+``If-None-Match`` with 304 and ``Range`` with 206 partial content, so the
+browser's audio element can seek without downloading the whole recording.
+The body is streamed from disk. ``wsgi.file_wrapper`` lets servers such as
+gunicorn use sendfile(2), so Python never copies the bytes. Behind nginx,
+``X-Accel-Redirect`` hands the transfer to nginx completely, and nginx then
+handles ranges and caching headers itself.
+"""
+
+import logging
+import mimetypes
+import unicodedata
+from pathlib import Path
+from urllib.parse import quote
+
+from flask import Response, send_file
+from werkzeug.security import safe_join
+
+logger = logging.getLogger(__name__)
+
+# Browsers only play audio inline with an audio/* type
+AUDIO_MIMETYPES = {
+    '.wav': 'audio/wav',
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.flac': 'audio/flac',
+    '.ogg': 'audio/ogg'
+}
+
+# Files of the results folder that can be downloaded
+TRANSCRIPT_EXTENSIONS = {'.txt'}
+
+
+def resolve_path(folder: Path, filename: str, extensions=None):
+    """
+    Path of ``filename`` inside ``folder``, or None if it would leave the
+    folder, points into a hidden folder, isn't an existing file or (when
+    ``extensions`` is given) doesn't have one of those extensions.
+    """
+    joined = safe_join(str(folder), filename)
+    if joined is None:
+        return None
+
+    root = Path(folder).resolve()
+    path = Path(joined).resolve()
+    if root not in path.parents:
+        return None
+    if any(part.startswith('.') for part in path.relative_to(root).parts):
+        return None
+    if extensions is not None and path.suffix.lower() not in extensions:
+        return None
+    if not path.is_file():
+        return None
+    return path
+
+
+def _filename_params(name: str) -> dict:
+    """
+    ``Content-Disposition`` filename parameters, encoded as ``send_file``
+    does: an ASCII fallback plus an RFC 5987 ``filename*`` for other names.
+    """
+    try:
+        name.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+        return {'filename': simple, 'filename*': f"UTF-8''{quote(name, safe='!#$&+^`|')}"}
+    return {'filename': name}
+
+
+def serve_file(path: Path, folder_key: str, settings: dict, as_attachment: bool = False,
+               mimetype: str = None, max_age: int = 0) -> Response:
+    """
+    Conditional, range-aware response for a resolved file.
+
+    ``settings`` is ``config.FILE_SERVING``; with ``x_accel_redirect`` on,
+    the response only names the file for nginx. ``folder_key`` picks the
+    internal location from ``accel_locations``.
+    """
+    mimetype = mimetype or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+
+    if settings.get('x_accel_redirect'):
+        location = settings['accel_locations'][folder_key].rstrip('/')
+        response = Response(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = f"{location}/{quote(path.name)}"
+        response.headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline',
+                             **_filename_params(path.name))
+        if max_age:
+            response.headers['Cache-Control'] = f'private, max-age={max_age}'
+        return response
+
+    # send_file streams the file (through wsgi.file_wrapper when the server
+    # offers it) and handles ETag, If-None-Match, Last-Modified and Range
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=path.name,
+        conditional=True,
+        etag=True,
+        max_age=max_age or None
+    )
+    if max_age:
+        # Uploads are per user; shared caches shouldn't keep them
+        response.cache_control.public = False
+        response.cache_control.private = True
+    return response
@@ -0,0 +1,101 @@
+"""
+Gunicorn settings for the backend, taken from ``config.SERVER``.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:application
+
+Workers are forked from a master that has already loaded the app
+(``preload_app``). Whisper weights are only part of that when
+``WHISPER_PRELOAD=true``; they are then in memory once and shared
+copy-on-write, otherwise every worker loads its own copy on first use.
+Each worker opens its own database connections and provider clients.
+
+The background tasks (file index watcher, resuming interrupted jobs and
+batches) run in one worker at a time: the one holding an ``flock`` on
+``jobs/.background.lock``. The other workers wait for the lock in a thread,
+so when the holder exits or is replaced another worker takes over. The
+elected worker also rescans every ``ORPHAN_RESCAN_SECONDS`` for jobs and
+batches of workers that exited, recognised by PID and process start time
+(PIDs are reused, e.g. by a replacement worker in a container).
+
+Metrics are kept per worker and written to ``METRICS["multiproc_dir"]``,
+where a scrape of ``/metrics`` on any worker adds them up.
+
+On SIGTERM a worker stops accepting connections, finishes its requests and
+waits for running jobs until ``graceful_timeout``; queued work is resumed
+at the next start.
+"""
+
+import fcntl
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import METRICS, SERVER  # noqa: E402
+
+bind = SERVER["bind"]
+workers = SERVER["workers"]
+threads = SERVER["threads"]
+worker_class = SERVER["worker_class"]
+preload_app = SERVER["preload"]
+timeout = SERVER["timeout"]
+graceful_timeout = SERVER["graceful_timeout"]
+keepalive = SERVER["keepalive"]
+
+# Progress streams (/api/jobs/<id>/events) hold a connection for a whole
+# job: a thread each with gthread, a greenlet with gevent/eventlet workers
+worker_connections = 1000
+
+
+# Set once a worker starts shutting down, so it doesn't take over the
+# background tasks on its way out
+exiting = threading.Event()
+
+# Open for the worker's lifetime once elected; the kernel releases the lock
+# when the worker exits
+background_lock = None
+
+
+def run_background_when_elected(app, log):
+    """Wait for the background lock, then run the background tasks in this worker."""
+    global background_lock
+
+    lock_path = Path(app.JOBS_FOLDER) / '.background.lock'
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(lock_path, 'a')
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    if exiting.is_set():
+        lock_file.close()
+        return
+    background_lock = lock_file
+    log.info("Running background tasks in this worker")
+    app.start_worker(forked=False, background=True)
+
+
+def on_starting(server):
+    # Metrics of the previous run would otherwise be added to this one's
+    for path in Path(METRICS["multiproc_dir"]).glob('*.json'):
+        path.unlink(missing_ok=True)
+
+
+def post_worker_init(worker):
+    import app
+    from transcribers import metrics
+
+    metrics.start_multiprocess()
+    app.start_worker(forked=worker.cfg.preload_app, background=False)
+    threading.Thread(
+        target=run_background_when_elected, args=(app, worker.log),
+        name='background-election', daemon=True
+    ).start()
+
+
+def worker_exit(server, worker):
+    import app
+
+    exiting.set()
+
+    # Open requests have finished; running jobs get the graceful timeout too
+    # (the master kills workers that exceed it, and their jobs resume later)
+    app.shutdown(timeout=max(1, graceful_timeout - 5))
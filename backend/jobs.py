@@ -0,0 +1,347 @@
+"""
+Background transcription jobs with on-disk state.
+
+A job is one audio file transcribed by one or more models. Jobs are queued
+on a worker pool and their state is written to a JSON file per job, so a
+restarted server can pick up work that was still queued or running. Every
+change to a model's result is also published to the job's event log, which
+the SSE progress endpoint streams to clients.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from events import EventLog
+from transcribers.processes import current_process, process_alive
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean a job or model still has work left to do
+PENDING_STATUSES = {'queued', 'uploading', 'processing'}
+
+# Finished jobs whose events stay replayable in memory
+FINISHED_EVENT_LOGS = 256
+
+# Seconds between reads of a job file followed for another worker process
+FOLLOW_INTERVAL = 1.0
+
+
+def claim(state: dict):
+    """Record the current process as the owner of a job or batch."""
+    state['pid'], state['pid_token'] = current_process()
+
+
+def owned_elsewhere(state: dict) -> bool:
+    """
+    Whether another live process has queued or is running this job or batch.
+
+    An owner with this process's PID is either this process or one that
+    exited and whose PID was reused, so this process takes over.
+    """
+    pid = state.get('pid')
+    if pid is None or pid == os.getpid():
+        return False
+    return process_alive(pid, state.get('pid_token'))
+
+
+def event_type(result: dict) -> str:
+    """SSE event name for a model result."""
+    return 'done' if result['status'] == 'success' else result['status']
+
+
+class JobManager:
+    """Runs transcription jobs in the background and persists their state."""
+
+    def __init__(self, jobs_folder: Path, runner, max_workers: int = 4):
+        """
+        Args:
+            jobs_folder: Directory holding one JSON file per job
+            runner: Callable ``runner(filename, models, on_update)`` that
+                transcribes the file and returns the list of model results.
+                ``on_update`` is called with each model result as it changes.
+            max_workers: Number of jobs processed at the same time
+        """
+        self.jobs_folder = Path(jobs_folder)
+        self.jobs_folder.mkdir(exist_ok=True)
+        self.runner = runner
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._futures = set()
+        self._jobs = {}
+        self._event_logs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, models: list) -> dict:
+        """Create a job and queue it for processing."""
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'filename': filename,
+            'status': 'queued',
+            'created_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'results': [
+                {'model_id': model_id, 'status': 'queued'}
+                for model_id in models
+            ]
+        }
+
+        claim(job)
+        with self._lock:
+            self._jobs[job['job_id']] = job
+            self._save(job)
+            self._open_events(job)
+
+        self._queue(job['job_id'])
+        logger.info(f"Queued job {job['job_id']} for {filename} ({len(models)} models)")
+        return self.get(job['job_id'])
+
+    def get(self, job_id: str):
+        """Return a snapshot of a job, or None if it does not exist."""
+        with self._lock:
+            job = self._jobs.get(job_id) or self._load(job_id)
+            if job is None:
+                return None
+            snapshot = json.loads(json.dumps(job))
+
+        snapshot['summary'] = self._summary(snapshot)
+        return snapshot
+
+    def events(self, job_id: str):
+        """
+        The event log of a job, or None if the job does not exist.
+
+        Jobs that finished long ago (or before a restart) get a closed log
+        replaying each model's final result. Unfinished jobs this process
+        isn't running (another worker runs them, or they wait to be resumed)
+        get a log that follows the job file until the job finishes.
+        """
+        with self._lock:
+            log = self._event_logs.get(job_id)
+            if log is not None:
+                return log
+
+            job = self._load(job_id)
+            if job is None:
+                return None
+
+            if job['status'] in PENDING_STATUSES:
+                log = self._open_events(job)
+                threading.Thread(
+                    target=self._follow, args=(job, log),
+                    name=f"job-events-{job_id[:8]}", daemon=True
+                ).start()
+                return log
+
+        log = EventLog()
+        for result in job['results']:
+            log.publish(event_type(result), dict(result, job_id=job_id))
+        log.close('end', self._end_event(job))
+        return log
+
+    def resume_pending(self) -> int:
+        """
+        Re-queue jobs that were queued or running when their process stopped.
+
+        Jobs owned by another live worker process are left to it, and jobs
+        this process already runs are skipped, so this can be called again
+        to pick up the jobs of a worker that exited.
+        """
+        resumed = 0
+        for job_path in sorted(self.jobs_folder.glob('*.json')):
+            try:
+                with open(job_path, 'r', encoding='utf-8') as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to read job file {job_path}: {e}")
+                continue
+
+            if job.get('status') not in PENDING_STATUSES or owned_elsewhere(job):
+                continue
+
+            with self._lock:
+                if job['job_id'] in self._jobs:
+                    continue
+                claim(job)
+                self._jobs[job['job_id']] = job
+                self._save(job)
+                self._open_events(job)
+            self._queue(job['job_id'])
+            resumed += 1
+
+        if resumed:
+            logger.info(f"Resumed {resumed} unfinished jobs")
+        return resumed
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self.executor.shutdown(wait=wait)
+
+    def drain(self, timeout: float = None) -> bool:
+        """
+        Stop accepting jobs and wait up to ``timeout`` seconds for running ones.
+
+        Jobs still queued are dropped from the pool but stay queued on disk,
+        so ``resume_pending()`` picks them up at the next start. Returns
+        whether every running job finished.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            running = list(self._futures)
+        if running:
+            logger.info(f"Waiting for {len(running)} running jobs to finish")
+        _, not_done = wait(running, timeout=timeout)
+        return not not_done
+
+    def _queue(self, job_id: str):
+        future = self.executor.submit(self._run, job_id)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _run(self, job_id: str):
+        """Process a job, skipping models that already finished before a restart."""
+        with self._lock:
+            job = self._jobs[job_id]
+            job['status'] = 'processing'
+            job['started_at'] = job['started_at'] or datetime.now().isoformat()
+            models = [r['model_id'] for r in job['results'] if r['status'] in PENDING_STATUSES]
+            self._save(job)
+
+        events = self._event_logs.get(job_id)
+
+        def on_update(result):
+            with self._lock:
+                status_changed = False
+                for index, existing in enumerate(job['results']):
+                    if existing['model_id'] == result['model_id']:
+                        status_changed = existing['status'] != result['status']
+                        job['results'][index] = dict(result)
+                # Progress-only updates are streamed but not written to disk
+                if status_changed:
+                    self._save(job)
+            if events:
+                events.publish(event_type(result), dict(result, job_id=job_id))
+
+        try:
+            self.runner(job['filename'], models, on_update)
+            status = 'completed'
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            status = 'failed'
+            with self._lock:
+                job['error'] = str(e)
+
+        with self._lock:
+            not_run = [r for r in job['results'] if r['status'] in PENDING_STATUSES]
+            for result in not_run:
+                result.update({'status': 'error', 'error': result.get('error') or 'Model was not run'})
+            job['status'] = status
+            job['finished_at'] = datetime.now().isoformat()
+            self._save(job)
+            # Finished jobs are served from disk from now on
+            self._jobs.pop(job_id, None)
+
+            if events:
+                for result in not_run:
+                    events.publish('error', dict(result, job_id=job_id))
+                events.close('end', self._end_event(job))
+                self._retire_events(job_id)
+
+        logger.info(f"Job {job_id} {status}")
+
+    def _follow(self, job: dict, log: EventLog):
+        """
+        Publish the model status changes of a job run elsewhere, read from
+        its file, and close the log once the job finishes.
+
+        Progress-only updates are not written to disk, so only status
+        changes are seen.
+        """
+        job_id = job['job_id']
+        statuses = {r['model_id']: r['status'] for r in job['results']}
+
+        while job['status'] in PENDING_STATUSES:
+            time.sleep(FOLLOW_INTERVAL)
+            with self._lock:
+                try:
+                    job = self._load(job_id)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Failed to read job {job_id}: {e}")
+                    job = None
+            if job is None:
+                with self._lock:
+                    log.close()
+                    self._event_logs.pop(job_id, None)
+                return
+
+            for result in job['results']:
+                if statuses.get(result['model_id']) != result['status']:
+                    statuses[result['model_id']] = result['status']
+                    log.publish(event_type(result), dict(result, job_id=job_id))
+
+        with self._lock:
+            log.close('end', self._end_event(job))
+            self._retire_events(job_id)
+
+    def _open_events(self, job: dict) -> EventLog:
+        """Create a job's event log with its current model states. Caller must hold the lock."""
+        log = EventLog()
+        for result in job['results']:
+            log.publish(event_type(result), dict(result, job_id=job['job_id']))
+        self._event_logs[job['job_id']] = log
+        return log
+
+    def _retire_events(self, job_id: str):
+        """Keep a finished job's closed log, dropping the oldest beyond the limit. Caller must hold the lock."""
+        if job_id in self._event_logs:
+            self._event_logs.move_to_end(job_id)
+        while len(self._event_logs) > FINISHED_EVENT_LOGS and \
+                next(iter(self._event_logs.values())).closed:
+            self._event_logs.popitem(last=False)
+
+    @staticmethod
+    def _summary(job: dict) -> dict:
+        return {
+            'total_models': len(job['results']),
+            'successful': len([r for r in job['results'] if r['status'] == 'success']),
+            'failed': len([r for r in job['results'] if r['status'] == 'error']),
+            'pending': len([r for r in job['results'] if r['status'] in PENDING_STATUSES])
+        }
+
+    def _end_event(self, job: dict) -> dict:
+        return {'job_id': job['job_id'], 'status': job['status'], 'summary': self._summary(job)}
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.jobs_folder / f"{job_id}.json"
+
+    def _load(self, job_id: str):
+        """Load a job from disk. Caller must hold the lock."""
+        if not job_id.isalnum():
+            return None
+
+        job_path = self._job_path(job_id)
+        if not job_path.exists():
+            return None
+
+        with open(job_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save(self, job: dict):
+        """Atomically write a job to disk. Caller must hold the lock."""
+        job_path = self._job_path(job['job_id'])
+        tmp_path = job_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, job_path)
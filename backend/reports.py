@@ -0,0 +1,187 @@
+"""
+Append-only log of transcription results and on-demand exports.
+
+Every finished run appends one JSON line per model to a single log file
+instead of writing a new CSV and XLSX report. Combined reports are built
+from the log when asked for: CSV is streamed straight to the client, XLSX
+is written by a background worker and downloaded once it is ready.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = [
+    'timestamp', 'filename', 'model_id', 'model_name', 'status',
+    'processing_time', 'transcript', 'error'
+]
+
+
+class ResultsLog:
+    """JSONL log with one line per (run, model) result."""
+
+    def __init__(self, log_path: Path):
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(exist_ok=True)
+        self._lock = threading.Lock()
+
+    def append(self, filename: str, results: list):
+        """Append the results of one transcription run."""
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        lines = []
+        for result in results:
+            lines.append(json.dumps({
+                'timestamp': timestamp,
+                'filename': filename,
+                'model_id': result['model_id'],
+                'model_name': result.get('model_name', ''),
+                'status': result['status'],
+                'processing_time': result.get('processing_time', 0),
+                'transcript': result.get('transcript', ''),
+                'error': result.get('error', '')
+            }, ensure_ascii=False))
+
+        with self._lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(line + '\n' for line in lines))
+
+    def iter_rows(self, since: str = None, until: str = None, filenames=None):
+        """Yield logged rows, optionally limited to a date range (ISO) and set of files."""
+        if not self.log_path.exists():
+            return
+
+        filenames = set(filenames) if filenames else None
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    # A partially written last line after a crash
+                    continue
+                if since and row['timestamp'] < since:
+                    continue
+                if until and row['timestamp'] >= until:
+                    continue
+                if filenames and row['filename'] not in filenames:
+                    continue
+                yield row
+
+
+def iter_csv(rows):
+    """Encode rows as CSV text, one line at a time, for a streaming response."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def write_xlsx(rows, output_path: Path):
+    """Write rows to an Excel workbook in openpyxl's streaming write-only mode."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Transcription Results')
+    sheet.append(EXPORT_COLUMNS)
+    for row in rows:
+        sheet.append([row.get(column, '') for column in EXPORT_COLUMNS])
+    workbook.save(output_path)
+
+
+class ExportManager:
+    """Builds XLSX exports from the results log on a background thread."""
+
+    def __init__(self, results_log: ResultsLog, exports_folder: Path, ttl_hours: float = 24):
+        """
+        Args:
+            results_log: Log the exports are built from
+            exports_folder: Where finished exports are stored
+            ttl_hours: Exports older than this are removed
+        """
+        self.results_log = results_log
+        self.exports_folder = Path(exports_folder)
+        self.exports_folder.mkdir(exist_ok=True)
+        self.ttl = ttl_hours * 3600
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+        self._exports = {}
+        self._lock = threading.Lock()
+
+    def start(self, since: str = None, until: str = None, filenames=None) -> dict:
+        """Queue an XLSX export and return its status."""
+        self.cleanup_stale()
+
+        export_id = uuid.uuid4().hex
+        with self._lock:
+            self._exports[export_id] = {
+                'export_id': export_id,
+                'status': 'queued',
+                'created_at': datetime.now().isoformat()
+            }
+        self.executor.submit(self._build, export_id, since, until, filenames)
+        return self.get(export_id)
+
+    def get(self, export_id: str):
+        """Return the status of an export, or None if it is unknown."""
+        with self._lock:
+            export = self._exports.get(export_id)
+            if export:
+                return dict(export)
+
+        # Exports finished before a restart are still on disk
+        if export_id.isalnum() and self.path_for(export_id).exists():
+            return {'export_id': export_id, 'status': 'ready'}
+        return None
+
+    def path_for(self, export_id: str) -> Path:
+        return self.exports_folder / f"transcriptions_{export_id}.xlsx"
+
+    def cleanup_stale(self):
+        """Remove finished exports, and files left by interrupted ones, older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for export_id, export in list(self._exports.items()):
+                finished = export['status'] in ('ready', 'error')
+                if finished and datetime.fromisoformat(export['created_at']).timestamp() < cutoff:
+                    del self._exports[export_id]
+
+        for path in self.exports_folder.glob('transcriptions_*'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    logger.info(f"Removing stale export {path.name}")
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _build(self, export_id: str, since, until, filenames):
+        self._update(export_id, status='processing')
+        output_path = self.path_for(export_id)
+        tmp_path = output_path.with_suffix('.tmp')
+        try:
+            write_xlsx(self.results_log.iter_rows(since, until, filenames), tmp_path)
+            os.replace(tmp_path, output_path)
+            self._update(export_id, status='ready')
+            logger.info(f"Export saved: {output_path}")
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            self._update(export_id, status='error', error=str(e))
+            logger.error(f"Export {export_id} failed: {e}")
+
+    def _update(self, export_id: str, **fields):
+        with self._lock:
+            self._exports[export_id].update(fields)
@@ -0,0 +1,182 @@
+"""
+Persistent transcript cache keyed by audio content.
+
+Entries are keyed by the SHA-256 of the audio bytes together with the model
+ID and the model settings that affect its output, so the same recording
+uploaded under a different name is served from the cache instead of being
+sent to the provider again.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Read files in 1 MiB blocks when hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Remember digests of recently hashed files, keyed by (path, size, mtime)
+_digest_memo = OrderedDict()
+_digest_lock = threading.Lock()
+_DIGEST_MEMO_SIZE = 1024
+
+
+def file_digest(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents.
+
+    Digests are memoised on path, size and modification time, so repeated
+    transcriptions of an unchanged file only hash it once.
+    """
+    stat = file_path.stat()
+    memo_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    with _digest_lock:
+        if memo_key in _digest_memo:
+            _digest_memo.move_to_end(memo_key)
+            return _digest_memo[memo_key]
+
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(block)
+    digest = sha256.hexdigest()
+
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+        while len(_digest_memo) > _DIGEST_MEMO_SIZE:
+            _digest_memo.popitem(last=False)
+
+    return digest
+
+
+def remember_digest(file_path: Path, digest: str):
+    """Seed the memo with a digest computed elsewhere (e.g. while uploading)."""
+    stat = file_path.stat()
+    memo_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        _digest_memo[memo_key] = digest
+        while len(_digest_memo) > _DIGEST_MEMO_SIZE:
+            _digest_memo.popitem(last=False)
+
+
+class ResultCache:
+    """SQLite-backed transcript cache with size- and age-based eviction."""
+
+    def __init__(self, db_path: Path, max_entries: int = 50000,
+                 max_bytes: int = 200 * 1024 * 1024, max_age_days: int = 90):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                audio_hash TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                transcript TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)')
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def reconnect(self):
+        """Open a new connection, e.g. in a worker process forked after the app was loaded."""
+        with self._lock:
+            self._conn = self._connect()
+
+    @staticmethod
+    def make_key(audio_hash: str, model_id: str, config: dict) -> str:
+        """Build a cache key from the audio digest, model and model settings."""
+        payload = json.dumps([audio_hash, model_id, config], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached transcript for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT transcript, created_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            transcript, created_at = row
+            if now - created_at > self.max_age:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            return transcript
+
+    def put(self, key: str, audio_hash: str, model_id: str, transcript: str):
+        """Store a transcript and evict old entries if the cache is over its limits."""
+        now = time.time()
+        size = len(transcript.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, audio_hash, model_id, transcript, size, now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached transcript."""
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Return the number of entries and total transcript bytes."""
+        with self._lock:
+            count, total = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache'
+            ).fetchone()
+        return {'entries': count, 'bytes': total}
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones. Caller holds the lock."""
+        self._conn.execute('DELETE FROM cache WHERE created_at < ?', (now - self.max_age,))
+
+        count, total = self._conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache'
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        # Trim to 90% of the limits so eviction doesn't run on every insert
+        target_entries = int(self.max_entries * 0.9)
+        target_bytes = int(self.max_bytes * 0.9)
+
+        evicted = 0
+        rows = self._conn.execute('SELECT key, size FROM cache ORDER BY accessed_at').fetchall()
+        for key, size in rows:
+            if count <= target_entries and total <= target_bytes:
+                break
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+
+        logger.info(f"Evicted {evicted} cached transcripts")
@@ -0,0 +1,184 @@
+"""
+SQLite index of transcription results.
+
+Each (audio file, model) pair has one row holding the status, timing and the
+path of the transcript file, so looking up, listing and deleting results no
+longer scans the transcriptions folder or parses model IDs out of file names.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = (
+    'audio_filename', 'audio_stem', 'model_id', 'model_name', 'status',
+    'transcript_path', 'processing_time', 'cached', 'error', 'created_at'
+)
+
+
+class ResultsIndex:
+    """Indexed store of per-(audio, model) transcription results."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                audio_filename TEXT NOT NULL,
+                audio_stem TEXT NOT NULL,
+                model_id TEXT NOT NULL,
+                model_name TEXT,
+                status TEXT NOT NULL,
+                transcript_path TEXT,
+                processing_time REAL,
+                cached INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created_at TEXT NOT NULL,
+                UNIQUE (audio_stem, model_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_audio ON results (audio_filename);
+            CREATE INDEX IF NOT EXISTS idx_results_model ON results (model_id, created_at);
+            CREATE INDEX IF NOT EXISTS idx_results_status ON results (status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_results_created ON results (created_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def reconnect(self):
+        """Open a new connection, e.g. in a worker process forked after the app was loaded."""
+        with self._lock:
+            self._conn = self._connect()
+
+    def record(self, filename: str, result: dict, transcript_path: Path = None):
+        """
+        Insert or replace the result of one model for one audio file.
+
+        A failed run doesn't replace an earlier successful transcript.
+        """
+        row = {
+            'audio_filename': filename,
+            'audio_stem': Path(filename).stem,
+            'model_id': result['model_id'],
+            'model_name': result.get('model_name'),
+            'status': result['status'],
+            'transcript_path': str(transcript_path) if transcript_path else None,
+            'processing_time': result.get('processing_time', 0),
+            'cached': int(bool(result.get('cached'))),
+            'error': result.get('error') or None,
+            'created_at': datetime.now().isoformat()
+        }
+        placeholders = ', '.join('?' for _ in RESULT_COLUMNS)
+        updates = ', '.join(f'{column} = excluded.{column}' for column in RESULT_COLUMNS)
+        keep_success = "WHERE results.status != 'success'" if row['status'] != 'success' else ''
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO results ({', '.join(RESULT_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (audio_stem, model_id) DO UPDATE SET {updates} {keep_success}",
+                [row[column] for column in RESULT_COLUMNS]
+            )
+            self._conn.commit()
+
+    def get(self, filename: str) -> list:
+        """All results for an audio file, in model order."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT * FROM results WHERE audio_stem = ? ORDER BY model_id',
+                (Path(filename).stem,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(self, model_id: str = None, status: str = None, since: str = None,
+              until: str = None, limit: int = 100, offset: int = 0) -> list:
+        """List results filtered by model, status and creation time (ISO dates), newest first."""
+        clauses, params = [], []
+        if model_id:
+            clauses.append('model_id = ?')
+            params.append(model_id)
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        if since:
+            clauses.append('created_at >= ?')
+            params.append(since)
+        if until:
+            clauses.append('created_at < ?')
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT * FROM results {where} ORDER BY created_at DESC LIMIT ? OFFSET ?',
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete(self, filenames) -> list:
+        """Remove the results of the given audio files and return the deleted rows."""
+        stems = [Path(filename).stem for filename in filenames]
+        if not stems:
+            return []
+
+        placeholders = ', '.join('?' for _ in stems)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT * FROM results WHERE audio_stem IN ({placeholders})', stems
+            ).fetchall()
+            self._conn.execute(f'DELETE FROM results WHERE audio_stem IN ({placeholders})', stems)
+            self._conn.commit()
+        return [dict(row) for row in rows]
+
+    def backfill(self, results_folder: Path, model_ids) -> int:
+        """
+        Index transcript files written before the index existed.
+
+        Runs once per database. File names are ``{stem}_{model_id}.txt``; the
+        model ID is matched against the known IDs so stems containing
+        underscores are split correctly.
+        """
+        with self._lock:
+            done = self._conn.execute("SELECT value FROM meta WHERE key = 'backfilled'").fetchone()
+        if done:
+            return 0
+
+        suffixes = sorted((f"_{model_id}" for model_id in model_ids), key=len, reverse=True)
+        indexed = 0
+        with self._lock:
+            for file_path in Path(results_folder).glob('*.txt'):
+                for suffix in suffixes:
+                    if not file_path.stem.endswith(suffix):
+                        continue
+                    stem = file_path.stem[:-len(suffix)]
+                    created_at = datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                    self._conn.execute(
+                        'INSERT OR IGNORE INTO results (audio_filename, audio_stem, model_id, status, '
+                        'transcript_path, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                        (stem, stem, suffix[1:], 'success', str(file_path), created_at)
+                    )
+                    indexed += 1
+                    break
+
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('backfilled', ?)",
+                               (datetime.now().isoformat(),))
+            self._conn.commit()
+
+        if indexed:
+            logger.info(f"Indexed {indexed} existing transcript files")
+        return indexed
@@ -0,0 +1,391 @@
+"""
+Resumable chunked uploads with on-the-fly hashing and deduplication.
+
+An upload is started with its name and size, then its bytes are sent in
+order as chunks at explicit offsets and finally completed. Chunks are
+streamed to a partial file in fixed-size blocks, so memory use doesn't grow
+with the recording, and the SHA-256 is updated as the bytes arrive. If the
+connection drops, the client asks for the current offset and continues from
+there. A completed upload whose content was uploaded before is discarded
+and the existing file is returned instead.
+
+Sessions live on disk, so the chunks of one upload may reach different
+worker processes; a session is locked with ``flock`` on its lock file while
+it is written, and the running hash is only reused if it covers exactly the
+bytes written so far.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sessions are only locked within the process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the request stream at a time
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Bytes needed to recognise the container format
+HEADER_BYTES = 12
+
+
+class UploadError(Exception):
+    """An upload request that can't be accepted; ``status`` is the HTTP status."""
+
+    def __init__(self, message: str, status: int = 400, **details):
+        super().__init__(message)
+        self.status = status
+        self.details = details
+
+
+def is_valid_audio_header(header: bytes, extension: str) -> bool:
+    """Check the first bytes of a file against the container its extension claims."""
+    extension = extension.lower().lstrip('.')
+    if extension == 'wav':
+        return header[:4] == b'RIFF' and header[8:12] == b'WAVE'
+    if extension == 'flac':
+        return header[:4] == b'fLaC'
+    if extension == 'ogg':
+        return header[:4] == b'OggS'
+    if extension == 'm4a':
+        return header[4:8] == b'ftyp'
+    if extension == 'mp3':
+        # ID3 tag, or an MPEG audio frame sync
+        return header[:3] == b'ID3' or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0)
+    return False
+
+
+class UploadManager:
+    """Tracks upload sessions and the digests of completed uploads."""
+
+    def __init__(self, upload_folder: Path, max_bytes: int, chunk_bytes: int,
+                 session_ttl_hours: float = 24):
+        """
+        Args:
+            upload_folder: Where completed uploads are stored
+            max_bytes: Largest accepted upload
+            chunk_bytes: Chunk size suggested to clients
+            session_ttl_hours: Unfinished uploads older than this are removed
+        """
+        self.upload_folder = Path(upload_folder)
+        self.staging_folder = self.upload_folder / '.uploads'
+        self.staging_folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.chunk_bytes = chunk_bytes
+        self.session_ttl = session_ttl_hours * 3600
+
+        self._lock = threading.Lock()
+        self._session_locks = {}
+        # upload_id -> (running SHA-256, number of bytes it covers)
+        self._hashers = {}
+
+        self._conn = self._connect()
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS digests (
+                sha256 TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.staging_folder / 'digests.db'), check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def reconnect(self):
+        """Open a new connection, e.g. in a worker process forked after the app was loaded."""
+        with self._lock:
+            self._conn = self._connect()
+
+    def find_duplicate(self, sha256: str):
+        """Return the stored filename with this content, if it still exists."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT filename FROM digests WHERE sha256 = ?', (sha256.lower(),)
+            ).fetchone()
+        if row and (self.upload_folder / row[0]).exists():
+            return row[0]
+        return None
+
+    def record_digest(self, sha256: str, filename: str, size: int):
+        """Remember the content hash of a stored upload."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?)',
+                (sha256, filename, size, datetime.now().isoformat())
+            )
+            self._conn.commit()
+
+    def forget(self, filename: str):
+        """Drop the digest of a deleted upload."""
+        with self._lock:
+            self._conn.execute('DELETE FROM digests WHERE filename = ?', (filename,))
+            self._conn.commit()
+
+    def create(self, filename: str, size: int, sha256: str = None) -> dict:
+        """
+        Start an upload of ``size`` bytes stored as ``filename``.
+
+        If ``sha256`` matches a stored upload, no session is created and the
+        existing file is returned as complete.
+        """
+        if size <= 0:
+            raise UploadError('Upload size must be positive')
+        if size > self.max_bytes:
+            raise UploadError(f"File too large (limit {self.max_bytes} bytes)", status=413)
+
+        if sha256:
+            existing = self.find_duplicate(sha256)
+            if existing:
+                logger.info(f"Upload of {filename} matches {existing}, skipping transfer")
+                return {'status': 'complete', 'filename': existing, 'deduplicated': True}
+
+        self.cleanup_stale()
+
+        session = {
+            'upload_id': uuid.uuid4().hex,
+            'filename': filename,
+            'size': size,
+            'offset': 0,
+            'sha256': sha256.lower() if sha256 else None,
+            'status': 'uploading',
+            'chunk_size': self.chunk_bytes,
+            'created_at': datetime.now().isoformat()
+        }
+        self._save(session)
+        self._hashers[session['upload_id']] = (hashlib.sha256(), 0)
+        return dict(session)
+
+    def store(self, filename: str, stream) -> dict:
+        """Save a single-request upload the same way: streamed, hashed, validated and deduplicated."""
+        session = self.create(filename, self.max_bytes)
+        upload_id = session['upload_id']
+        try:
+            session = self.write_chunk(upload_id, 0, stream)
+            if session['offset'] == 0:
+                raise UploadError('No file data received')
+            session['size'] = session['offset']
+            self._save(session)
+            return self.complete(upload_id)
+        except BaseException:
+            self._discard(upload_id)
+            raise
+
+    def get(self, upload_id: str):
+        """Return an upload session, or None if it doesn't exist."""
+        if not upload_id.isalnum():
+            return None
+        session_path = self._session_path(upload_id)
+        if not session_path.exists():
+            return None
+        with open(session_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_chunk(self, upload_id: str, offset: int, stream, length: int = None) -> dict:
+        """
+        Append bytes from ``stream`` at ``offset``.
+
+        Chunks must arrive in order; a chunk at any other offset is rejected
+        with the current offset so the client can resume from there.
+        """
+        with self._locked(upload_id, blocking=False):
+            session = self.get(upload_id)
+            if session is None:
+                raise UploadError('Upload not found', status=404)
+            if session['status'] != 'uploading':
+                raise UploadError('Upload already completed', status=409)
+            if offset != session['offset']:
+                raise UploadError('Unexpected offset', status=409, offset=session['offset'])
+
+            hasher = self._hasher(session)
+            remaining = session['size'] - offset
+            written = 0
+            # The first chunk is held back until its header can be checked:
+            # a read may return fewer bytes than the header
+            header = b'' if offset == 0 else None
+
+            with open(self._part_path(upload_id), 'ab') as part:
+                try:
+                    while True:
+                        block = stream.read(STREAM_BLOCK_SIZE)
+                        if header is not None:
+                            header += block
+                            if block and len(header) < HEADER_BYTES:
+                                continue
+                            block, header = header, None
+                            if block and not self._header_ok(session, block):
+                                raise UploadError('File is not a valid audio file', status=415)
+                        if not block:
+                            break
+                        if written + len(block) > remaining:
+                            raise UploadError('Chunk exceeds declared upload size', status=413)
+                        part.write(block)
+                        hasher.update(block)
+                        written += len(block)
+
+                    if length is not None and written != length:
+                        raise UploadError('Incomplete chunk', offset=offset)
+                except BaseException:
+                    # Roll back the whole chunk; the client resends it from ``offset``
+                    part.truncate(offset)
+                    self._hashers.pop(upload_id, None)
+                    raise
+
+            session['offset'] = offset + written
+            self._save(session)
+            self._hashers[upload_id] = (hasher, session['offset'])
+            return dict(session)
+
+    def complete(self, upload_id: str) -> dict:
+        """Finish an upload: verify it, deduplicate and move it into place."""
+        with self._locked(upload_id):
+            session = self.get(upload_id)
+            if session is None:
+                raise UploadError('Upload not found', status=404)
+            if session['offset'] != session['size']:
+                raise UploadError('Upload is incomplete', status=409, offset=session['offset'])
+
+            digest = self._hasher(session).hexdigest()
+            if session['sha256'] and session['sha256'] != digest:
+                self._discard(upload_id)
+                raise UploadError('Checksum mismatch', status=422)
+
+            part_path = self._part_path(upload_id)
+            existing = self.find_duplicate(digest)
+            if existing:
+                part_path.unlink(missing_ok=True)
+                filename, deduplicated = existing, True
+            else:
+                filename, deduplicated = session['filename'], False
+                os.replace(part_path, self.upload_folder / filename)
+                self.record_digest(digest, filename, session['size'])
+
+            self._discard(upload_id)
+
+        logger.info(f"Upload {upload_id} complete: {filename}" + (" (duplicate)" if deduplicated else ""))
+        return {
+            'status': 'complete',
+            'filename': filename,
+            'size': session['size'],
+            'sha256': digest,
+            'deduplicated': deduplicated
+        }
+
+    def abort(self, upload_id: str) -> bool:
+        """Cancel an upload and delete its partial data."""
+        try:
+            with self._locked(upload_id):
+                self._discard(upload_id)
+                return True
+        except UploadError:
+            return False
+
+    def cleanup_stale(self):
+        """Remove unfinished uploads that haven't been touched within the TTL."""
+        cutoff = time.time() - self.session_ttl
+        for session_path in self.staging_folder.glob('*.json'):
+            if session_path.stat().st_mtime < cutoff:
+                upload_id = session_path.stem
+                logger.info(f"Removing stale upload {upload_id}")
+                self._discard(upload_id)
+
+    def _header_ok(self, session: dict, block: bytes) -> bool:
+        return is_valid_audio_header(block[:HEADER_BYTES], Path(session['filename']).suffix)
+
+    def _hasher(self, session: dict):
+        """
+        The running hash of a session.
+
+        It is rebuilt from the partial file after a restart, or when chunks
+        were written by another worker process since this one last saw the
+        session (the cached hash then covers a different number of bytes).
+        """
+        upload_id = session['upload_id']
+        hasher, hashed = self._hashers.get(upload_id, (None, None))
+        if hasher is None or hashed != session['offset']:
+            hasher = hashlib.sha256()
+            part_path = self._part_path(upload_id)
+            if part_path.exists():
+                with open(part_path, 'rb') as part:
+                    # Ignore bytes past the recorded offset from an interrupted write
+                    remaining = session['offset']
+                    while remaining > 0:
+                        block = part.read(min(STREAM_BLOCK_SIZE, remaining))
+                        if not block:
+                            break
+                        hasher.update(block)
+                        remaining -= len(block)
+                with open(part_path, 'ab') as part:
+                    part.truncate(session['offset'])
+            self._hashers[upload_id] = (hasher, session['offset'])
+        return hasher
+
+    @contextmanager
+    def _locked(self, upload_id: str, blocking: bool = True):
+        """
+        Hold a session's lock: a thread lock within this process and ``flock``
+        on the session's lock file across worker processes.
+
+        Raises UploadError for unknown sessions (404), and if the lock is
+        taken and ``blocking`` is False (409).
+        """
+        if not upload_id.isalnum() or not self._session_path(upload_id).exists():
+            raise UploadError('Upload not found', status=404)
+
+        lock = self._session_lock(upload_id)
+        if not lock.acquire(blocking=blocking):
+            raise UploadError('Another chunk is being written', status=409)
+        try:
+            # Closing the file releases the flock
+            with open(self._lock_path(upload_id), 'a') as lock_file:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                    except BlockingIOError:
+                        raise UploadError('Another chunk is being written', status=409)
+                yield
+        finally:
+            lock.release()
+
+    def _session_lock(self, upload_id: str) -> threading.Lock:
+        with self._lock:
+            return self._session_locks.setdefault(upload_id, threading.Lock())
+
+    def _session_path(self, upload_id: str) -> Path:
+        return self.staging_folder / f"{upload_id}.json"
+
+    def _part_path(self, upload_id: str) -> Path:
+        return self.staging_folder / f"{upload_id}.part"
+
+    def _lock_path(self, upload_id: str) -> Path:
+        return self.staging_folder / f"{upload_id}.lock"
+
+    def _save(self, session: dict):
+        session_path = self._session_path(session['upload_id'])
+        tmp_path = session_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        os.replace(tmp_path, session_path)
+
+    def _discard(self, upload_id: str):
+        self._session_path(upload_id).unlink(missing_ok=True)
+        self._part_path(upload_id).unlink(missing_ok=True)
+        self._lock_path(upload_id).unlink(missing_ok=True)
+        self._hashers.pop(upload_id, None)
+        with self._lock:
+            self._session_locks.pop(upload_id, None)
@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production servers.
+
+    cd backend && gunicorn -c gunicorn.conf.py wsgi:application
+
+With gunicorn's ``preload_app`` this module is imported once in the master
+process, so transcribers (and preloaded Whisper weights) are set up before
+the workers are forked; ``gunicorn.conf.py`` finishes the per-worker setup.
+"""
+
+import app as backend
+
+application = backend.create_app()
+backend.prepare_services()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Speechmatics and AssemblyAI HTTP APIs.
+
+One server speaks both protocols under ``/v2``, so the real transcribers
+run unchanged against it once their base URLs point here:
+
+- Speechmatics: ``POST /v2/jobs`` (multipart upload), ``GET /v2/jobs/<id>``,
+  ``GET /v2/jobs/<id>/transcript?format=txt``, ``DELETE /v2/jobs/<id>``
+- AssemblyAI: ``POST /v2/upload``, ``POST /v2/transcript``,
+  ``GET /v2/transcript/<id>``, ``DELETE /v2/transcript/<id>``
+
+Each request waits ``request_latency`` (uploads ``upload_latency``) and
+fails with ``error_status`` at ``error_rate``. A job is queued for
+``queue_time`` seconds and then processing for ``processing_time`` seconds,
+both with +/- ``jitter``. Job state is derived from timestamps, so the
+server needs no background threads.
+
+Usage:
+    python benchmarks/mock_providers.py --port 8900 --processing-time 2 --error-rate 0.05
+    SPEECHMATICS_BASE_URL=http://127.0.0.1:8900/v2 SPEECHMATICS_API_KEY=mock \\
+    ASSEMBLYAI_BASE_URL=http://127.0.0.1:8900/v2 ASSEMBLYAI_API_KEY=mock python app.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TRANSCRIPT = "labdien šī ir testa transkripcija"
+
+DEFAULT_SETTINGS = {
+    "request_latency": 0.01,   # seconds per status/transcript request
+    "upload_latency": 0.05,    # seconds per upload or job creation
+    "queue_time": 0.1,         # seconds a job waits before processing
+    "processing_time": 0.5,    # seconds a job processes
+    "jitter": 0.2,             # +/- fraction applied to the times above
+    "error_rate": 0.0,         # share of requests answered with error_status
+    "error_status": 503,
+    "seed": None
+}
+
+
+class MockState:
+    """Jobs and request counters shared by the handler threads."""
+
+    def __init__(self, settings: dict):
+        self.settings = {**DEFAULT_SETTINGS, **settings}
+        self.random = random.Random(self.settings["seed"])
+        self.jobs = {}
+        self.counts = {"requests": 0, "errors": 0, "jobs": 0}
+        self.lock = threading.Lock()
+
+    def vary(self, seconds: float) -> float:
+        jitter = self.settings["jitter"]
+        with self.lock:
+            return max(0.0, seconds * (1 + self.random.uniform(-jitter, jitter)))
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.counts["requests"] += 1
+            failed = self.random.random() < self.settings["error_rate"]
+            if failed:
+                self.counts["errors"] += 1
+            return failed
+
+    def create_job(self) -> str:
+        job_id = uuid.uuid4().hex
+        queued = self.vary(self.settings["queue_time"])
+        processing = self.vary(self.settings["processing_time"])
+        now = time.monotonic()
+        with self.lock:
+            self.jobs[job_id] = {"started": now + queued, "done": now + queued + processing}
+            self.counts["jobs"] += 1
+        return job_id
+
+    def job_status(self, job_id: str):
+        """``queued``, ``processing``, ``done`` or None for unknown/deleted jobs."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        now = time.monotonic()
+        if now >= job["done"]:
+            return "done"
+        return "processing" if now >= job["started"] else "queued"
+
+    def delete_job(self, job_id: str) -> bool:
+        with self.lock:
+            return self.jobs.pop(job_id, None) is not None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockProviders/1.0"
+
+    # (method, path pattern, handler name, latency setting)
+    ROUTES = [
+        ("POST", r"/v2/jobs/?", "speechmatics_create", "upload_latency"),
+        ("GET", r"/v2/jobs/(\w+)/transcript", "speechmatics_transcript", "request_latency"),
+        ("GET", r"/v2/jobs/(\w+)", "speechmatics_status", "request_latency"),
+        ("DELETE", r"/v2/jobs/(\w+)", "speechmatics_delete", "request_latency"),
+        ("POST", r"/v2/upload", "assemblyai_upload", "upload_latency"),
+        ("POST", r"/v2/transcript/?", "assemblyai_create", "request_latency"),
+        ("GET", r"/v2/transcript/(\w+)", "assemblyai_status", "request_latency"),
+        ("DELETE", r"/v2/transcript/(\w+)", "assemblyai_delete", "request_latency"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method: str):
+        state = self.server.state
+        # Read the whole body so the keep-alive connection stays usable
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = self.path.split("?", 1)[0]
+
+        for route_method, pattern, name, latency in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                break
+        else:
+            return self.send_json(404, {"error": f"No route for {method} {path}"})
+
+        time.sleep(state.vary(state.settings[latency]))
+        if state.should_fail():
+            return self.send_json(state.settings["error_status"], {"error": "Injected failure"})
+        getattr(self, name)(state, body, *match.groups())
+
+    def send_json(self, status: int, data: dict):
+        self.send_body(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Speechmatics
+
+    def speechmatics_create(self, state, body):
+        self.send_json(201, {"id": state.create_job()})
+
+    def speechmatics_status(self, state, body, job_id):
+        status = state.job_status(job_id)
+        if status is None:
+            return self.send_json(404, {"error": "Job not found"})
+        self.send_json(200, {"job": {"id": job_id, "status": "done" if status == "done" else "running"}})
+
+    def speechmatics_transcript(self, state, body, job_id):
+        if state.job_status(job_id) != "done":
+            return self.send_json(404, {"error": "Job not finished"})
+        self.send_body(200, TRANSCRIPT.encode("utf-8"), "text/plain; charset=utf-8")
+
+    def speechmatics_delete(self, state, body, job_id):
+        if not state.delete_job(job_id):
+            return self.send_json(404, {"error": "Job not found"})
+        self.send_json(200, {"job": {"id": job_id, "status": "deleted"}})
+
+    # AssemblyAI
+
+    def assemblyai_upload(self, state, body):
+        host = self.headers.get("Host", "localhost")
+        self.send_json(200, {"upload_url": f"http://{host}/uploads/{uuid.uuid4().hex}"})
+
+    def assemblyai_create(self, state, body):
+        self.send_json(200, {"id": state.create_job(), "status": "queued"})
+
+    def assemblyai_status(self, state, body, transcript_id):
+        status = state.job_status(transcript_id)
+        if status is None:
+            return self.send_json(404, {"error": "Transcript not found"})
+        if status != "done":
+            return self.send_json(200, {"id": transcript_id, "status": status})
+        self.send_json(200, {"id": transcript_id, "status": "completed",
+                             "text": TRANSCRIPT, "confidence": 0.92})
+
+    def assemblyai_delete(self, state, body, transcript_id):
+        if not state.delete_job(transcript_id):
+            return self.send_json(404, {"error": "Transcript not found"})
+        self.send_json(200, {"id": transcript_id, "status": "deleted"})
+
+
+def create_server(host: str = "127.0.0.1", port: int = 0, **settings) -> ThreadingHTTPServer:
+    """Mock server (not yet serving); ``port=0`` picks a free port."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.state = MockState(settings)
+    return server
+
+
+def serve(settings: dict, ready=None, host: str = "127.0.0.1", port: int = 0):
+    """Run a mock server until the process ends; puts its port on ``ready`` (a queue)."""
+    server = create_server(host, port, **settings)
+    if ready is not None:
+        ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Mock behaviour options, shared with the load benchmark."""
+    parser.add_argument("--request-latency", type=float, default=DEFAULT_SETTINGS["request_latency"])
+    parser.add_argument("--upload-latency", type=float, default=DEFAULT_SETTINGS["upload_latency"])
+    parser.add_argument("--queue-time", type=float, default=DEFAULT_SETTINGS["queue_time"])
+    parser.add_argument("--processing-time", type=float, default=DEFAULT_SETTINGS["processing_time"])
+    parser.add_argument("--jitter", type=float, default=DEFAULT_SETTINGS["jitter"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_SETTINGS["error_rate"])
+    parser.add_argument("--error-status", type=int, default=DEFAULT_SETTINGS["error_status"])
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def settings_from_args(args) -> dict:
+    return {key: getattr(args, key) for key in DEFAULT_SETTINGS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Speechmatics and AssemblyAI APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, **settings_from_args(args))
+    print(f"Mock providers on http://{args.host}:{server.server_address[1]}/v2")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"Served: {json.dumps(server.state.counts)}")
+
+
+if __name__ == "__main__":
+    main()
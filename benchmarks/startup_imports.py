@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Measure backend import (cold start) time.
+
+Each target is imported in a fresh interpreter with ``-X importtime`` so
+nothing is cached between runs. Reports the median wall time per target and
+the modules with the highest cumulative import cost, so a provider SDK that
+sneaks back into the startup path shows up immediately.
+
+Usage:
+    python benchmarks/startup_imports.py
+    python benchmarks/startup_imports.py --repeat 10 --top 15 --output startup.json
+    python benchmarks/startup_imports.py --baseline startup.json --max-regression 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND = ROOT / "backend"
+
+# name -> (working directory, import statement)
+TARGETS = {
+    "app": (BACKEND, "import app"),
+    "transcribers": (ROOT, "import transcribers"),
+    "transcribers.speechmatics": (ROOT, "import transcribers.speechmatics"),
+    "transcribers.assemblyai": (ROOT, "import transcribers.assemblyai"),
+    "transcribers.google": (ROOT, "import transcribers.google"),
+    "transcribers.whisper": (ROOT, "import transcribers.whisper"),
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map module name -> cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self_us | cumulative_us |   package.module"
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def measure(cwd: Path, statement: str) -> tuple:
+    """Import once in a new interpreter; return wall seconds and per-module timings."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(BACKEND)]))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        raise RuntimeError(error)
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def benchmark(name: str, repeat: int, top: int) -> dict:
+    cwd, statement = TARGETS[name]
+    try:
+        runs = [measure(cwd, statement) for _ in range(repeat)]
+    except RuntimeError as e:
+        return {"target": name, "error": str(e)}
+
+    # Module timings from the median run
+    runs.sort(key=lambda run: run[0])
+    median_run = runs[len(runs) // 2]
+    heaviest = sorted(median_run[1].items(), key=lambda item: item[1], reverse=True)
+
+    return {
+        "target": name,
+        "median_seconds": round(statistics.median(run[0] for run in runs), 4),
+        "min_seconds": round(runs[0][0], 4),
+        "modules_imported": len(median_run[1]),
+        "heaviest_modules": [
+            {"module": module, "cumulative_ms": round(us / 1000, 1)}
+            for module, us in heaviest[:top]
+        ]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest modules to list per target")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="fail if a target is this fraction slower than the baseline")
+    args = parser.parse_args()
+
+    reports = []
+    for name in args.targets:
+        report = benchmark(name, args.repeat, args.top)
+        reports.append(report)
+
+        if "error" in report:
+            print(f"{name:28} ✗ {report['error']}")
+            continue
+        print(f"{name:28} {report['median_seconds'] * 1000:8.1f} ms  ({report['modules_imported']} modules)")
+        for module in report["heaviest_modules"]:
+            print(f"    {module['cumulative_ms']:8.1f} ms  {module['module']}")
+
+    if args.output:
+        args.output.write_text(json.dumps(reports, indent=2))
+        print(f"\nReport saved: {args.output}")
+
+    if args.baseline:
+        baseline = {r["target"]: r for r in json.loads(args.baseline.read_text()) if "error" not in r}
+        regressions = []
+        for report in reports:
+            before = baseline.get(report["target"])
+            if not before or "error" in report:
+                continue
+            change = report["median_seconds"] / before["median_seconds"] - 1
+            print(f"{report['target']:28} {change:+.0%} vs baseline")
+            if change > args.max_regression:
+                regressions.append(report["target"])
+        if regressions:
+            print(f"✗ Startup regression: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
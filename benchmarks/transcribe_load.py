@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Load test the transcribe path offline, against mock provider APIs.
+
+Starts ``mock_providers.py`` and, for every server and concurrency level,
+a fresh backend with Speechmatics and AssemblyAI pointed at the mock and
+Google on its offline fake client. Clients then POST ``/api/transcribe``
+at that concurrency. Servers:
+
+- ``werkzeug``: one process with werkzeug's threaded server, as
+  ``python app.py`` runs it (without the debugger and reloader)
+- ``gunicorn``: ``gunicorn.conf.py`` with ``--workers`` x ``--threads``
+
+Each level reports throughput, latency percentiles, memory of the server
+processes (Linux: peak RSS and PSS, which counts pages shared between
+workers once), and the mean time per stage from ``/metrics`` (one worker's
+view under gunicorn).
+
+The backend runs with its normal configuration, so provider rate limits
+and in-flight caps apply, per worker process. Override them through the
+environment (e.g. ``SPEECHMATICS_RATE_LIMIT=1000``) to measure the app
+alone. The result cache is off, so every request reaches the providers.
+
+``--output`` saves the run as JSON. ``--baseline`` compares a run with a
+saved one and exits with status 1 if throughput dropped, or p95 latency or
+peak memory grew, by more than ``--tolerance``.
+
+Usage:
+    python benchmarks/transcribe_load.py
+    python benchmarks/transcribe_load.py --concurrency 1 4 16 32 --requests 100 \\
+        --processing-time 2 --error-rate 0.02 --output baseline.json
+    python benchmarks/transcribe_load.py --baseline baseline.json --tolerance 0.15
+    SPEECHMATICS_RATE_LIMIT=1000 ASSEMBLYAI_RATE_LIMIT=1000 python benchmarks/transcribe_load.py \\
+        --servers werkzeug gunicorn --workers 4 --threads 16 --concurrency 8 32 64
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+import mock_providers
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Providers that can run offline; all others are switched off
+OFFLINE_MODELS = ("speechmatics", "assemblyai", "google")
+ALL_MODELS = ("speechmatics", "google", "whisper", "assemblyai")
+
+STAGE_PATTERN = re.compile(
+    r'^transcription_stage_seconds_(sum|count)\{provider="([^"]+)",stage="([^"]+)"\} (\S+)$'
+)
+
+
+def write_clip(path, seconds, sample_rate=16000):
+    """A 440 Hz tone as 16-bit mono WAV."""
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        value = int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+        frames += value.to_bytes(2, "little", signed=True)
+    with wave.open(str(path), "wb") as clip:
+        clip.setnchannels(1)
+        clip.setsampwidth(2)
+        clip.setframerate(sample_rate)
+        clip.writeframes(bytes(frames))
+
+
+def serve_werkzeug(workspace, env, ready, stop):
+    """Run the backend in this (child) process until ``stop`` is set."""
+    os.environ.update(env)
+    # The app keeps its folders relative to the working directory
+    os.chdir(Path(workspace) / "backend")
+    sys.path[:0] = [str(ROOT), str(ROOT / "backend")]
+
+    from werkzeug.serving import make_server
+
+    import app
+
+    flask_app = app.create_app()
+    app.prepare_services()
+    app.start_worker()
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ready.put(server.server_port)
+
+    stop.wait()
+    server.shutdown()
+
+
+class WerkzeugServer:
+    def __init__(self, workspace, env, args):
+        context = multiprocessing.get_context("spawn")
+        ready, self.stop_event = context.Queue(), context.Event()
+        self.process = context.Process(target=serve_werkzeug, args=(workspace, env, ready, self.stop_event))
+        self.process.start()
+        self.pid = self.process.pid
+        self.url = f"http://127.0.0.1:{ready.get(timeout=120)}"
+
+    def stop(self):
+        self.stop_event.set()
+        self.process.join(timeout=30)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+class GunicornServer:
+    def __init__(self, workspace, env, args):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        env = dict(os.environ, **env,
+                   SERVER_BIND=f"127.0.0.1:{port}",
+                   SERVER_WORKERS=str(args.workers),
+                   SERVER_THREADS=str(args.threads),
+                   PYTHONPATH=os.pathsep.join([str(ROOT / "backend"), str(ROOT)]))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", str(ROOT / "backend" / "gunicorn.conf.py"),
+             "wsgi:application"],
+            cwd=Path(workspace) / "backend", env=env
+        )
+        self.pid = self.process.pid
+        self.url = f"http://127.0.0.1:{port}"
+
+        deadline = time.monotonic() + 120
+        while True:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with status {self.process.returncode}")
+            try:
+                if requests.get(f"{self.url}/api/health", timeout=5).ok:
+                    break
+            except requests.ConnectionError:
+                pass
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError("gunicorn did not start within 120s")
+            time.sleep(0.2)
+
+    def stop(self):
+        # SIGTERM is a graceful shutdown: workers drain, then exit
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            self.process.wait(timeout=60)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+SERVERS = {"werkzeug": WerkzeugServer, "gunicorn": GunicornServer}
+
+
+def child_pids(pid):
+    """Direct children of a process, from /proc."""
+    children = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are fixed
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children.append(int(entry.name))
+    return children
+
+
+def server_memory(pid):
+    """Peak RSS and current PSS in MB, summed over a server and its workers (Linux only)."""
+    if not Path("/proc/self/smaps_rollup").exists():
+        return {"peak_rss_mb": None, "pss_mb": None}
+    peak = pss = 0
+    for process in [pid] + child_pids(pid):
+        try:
+            status = Path(f"/proc/{process}/status").read_text()
+            rollup = Path(f"/proc/{process}/smaps_rollup").read_text()
+        except OSError:
+            continue
+        peak += int(re.search(r"^VmHWM:\s+(\d+)", status, re.M).group(1))
+        pss += int(re.search(r"^Pss:\s+(\d+)", rollup, re.M).group(1))
+    return {"peak_rss_mb": round(peak / 1024, 1), "pss_mb": round(pss / 1024, 1)}
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def parse_stages(text):
+    """Mean seconds per provider and stage from a /metrics scrape."""
+    totals = {}
+    for line in text.splitlines():
+        match = STAGE_PATTERN.match(line)
+        if match:
+            kind, provider, stage, value = match.groups()
+            totals.setdefault(provider, {}).setdefault(stage, {})[kind] = float(value)
+    return {
+        provider: {stage: round(t["sum"] / t["count"], 4) for stage, t in stages.items() if t.get("count")}
+        for provider, stages in totals.items()
+    }
+
+
+def run_level(server_name, concurrency, args, workspace, env):
+    """Start a backend, send ``args.requests`` requests at ``concurrency`` and report."""
+    server = SERVERS[server_name](workspace, env, args)
+
+    try:
+        url = server.url
+        if not requests.get(f"{url}/api/transcribers", timeout=30).json()["transcribers"]:
+            raise RuntimeError("No transcriber could be initialized in the backend")
+        payload = {"filename": "clip.wav", "models": args.models}
+
+        local = threading.local()
+
+        def send():
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            start = time.perf_counter()
+            try:
+                response = local.session.post(f"{url}/api/transcribe", json=payload, timeout=600)
+                results = response.json().get("results", []) if response.ok else []
+                ok = response.ok and bool(results) and all(r["status"] == "success" for r in results)
+            except requests.RequestException:
+                ok = False
+            return time.perf_counter() - start, ok
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # One untimed round so imports, workers and connection pools are warm
+            list(pool.map(lambda _: send(), range(concurrency)))
+
+            start = time.perf_counter()
+            outcomes = list(pool.map(lambda _: send(), range(args.requests)))
+            wall = time.perf_counter() - start
+
+        stages = parse_stages(requests.get(f"{url}/metrics", timeout=30).text)
+        memory = server_memory(server.pid)
+    finally:
+        server.stop()
+
+    latencies = sorted(seconds for seconds, _ in outcomes)
+    succeeded = sum(1 for _, ok in outcomes if ok)
+    return {
+        "server": server_name,
+        "concurrency": concurrency,
+        "requests": len(outcomes),
+        "succeeded": succeeded,
+        "failed": len(outcomes) - succeeded,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(outcomes) / wall, 3),
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 4),
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(latencies[-1], 4)
+        },
+        **memory,
+        "stages": stages
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Regressions of ``report`` against ``baseline``, as printable lines."""
+    previous = {(level.get("server", "werkzeug"), level["concurrency"]): level for level in baseline["levels"]}
+    regressions = []
+    for level in report["levels"]:
+        old = previous.get((level["server"], level["concurrency"]))
+        if old is None:
+            continue
+        checks = [
+            ("throughput_rps", old["throughput_rps"], level["throughput_rps"], False),
+            ("p95 latency", old["latency_seconds"]["p95"], level["latency_seconds"]["p95"], True),
+            ("peak_rss_mb", old["peak_rss_mb"], level["peak_rss_mb"], True),
+        ]
+        for name, before, after, lower_is_better in checks:
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (change > tolerance) if lower_is_better else (change < -tolerance):
+                regressions.append(f"{level['server']} c={level['concurrency']}: "
+                                   f"{name} {before} -> {after} ({change:+.0%})")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test of /api/transcribe")
+    parser.add_argument("--models", nargs="+", default=["speechmatics", "assemblyai"],
+                        choices=OFFLINE_MODELS)
+    parser.add_argument("--servers", nargs="+", default=["werkzeug"], choices=list(SERVERS))
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=16, help="Threads per gunicorn worker")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per concurrency level")
+    parser.add_argument("--clip-seconds", type=float, default=5.0)
+    parser.add_argument("--poll-interval", type=float, default=0.1,
+                        help="Shortest poll interval of the backend (seconds, 0 = configured)")
+    parser.add_argument("--preprocess", action="store_true", help="Keep FLAC preprocessing on (needs ffmpeg)")
+    parser.add_argument("--output", help="Save the report as JSON")
+    parser.add_argument("--baseline", help="Saved report to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative change before a metric counts as a regression")
+    mock_providers.add_arguments(parser)
+    args = parser.parse_args()
+
+    mock_settings = mock_providers.settings_from_args(args)
+    context = multiprocessing.get_context("spawn")
+    mock_ready = context.Queue()
+    mock = context.Process(target=mock_providers.serve, args=(mock_settings, mock_ready), daemon=True)
+    mock.start()
+    mock_url = f"http://127.0.0.1:{mock_ready.get(timeout=30)}/v2"
+
+    env = {f"{model_id.upper()}_ENABLED": str(model_id in args.models).lower() for model_id in ALL_MODELS}
+    env.update({
+        "SPEECHMATICS_BASE_URL": mock_url,
+        "SPEECHMATICS_API_KEY": "mock",
+        "ASSEMBLYAI_BASE_URL": mock_url,
+        "ASSEMBLYAI_API_KEY": "mock",
+        "GOOGLE_SPEECH_FAKE": "true",
+        "PREPROCESS_AUDIO": str(args.preprocess).lower(),
+        "RESULT_CACHE_ENABLED": "false"
+    })
+
+    if args.poll_interval:
+        env["POLLER_MIN_INTERVAL"] = str(args.poll_interval)
+
+    levels = []
+    with tempfile.TemporaryDirectory(prefix="transcribe_load_") as workspace:
+        for folder in ("backend", "audio_clips"):
+            (Path(workspace) / folder).mkdir()
+        write_clip(Path(workspace) / "audio_clips" / "clip.wav", args.clip_seconds)
+
+        print(f"{'server':<9} {'conc':>5} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>7} "
+              f"{'failed':>7} {'PSS MB':>8}")
+        for server_name in args.servers:
+            for concurrency in args.concurrency:
+                level = run_level(server_name, concurrency, args, workspace, env)
+                latency = level["latency_seconds"]
+                print(f"{server_name:<9} {concurrency:>5} {level['throughput_rps']:>8.2f} "
+                      f"{latency['p50']:>7.3f} {latency['p95']:>7.3f} {latency['p99']:>7.3f} "
+                      f"{level['failed']:>7} {level['pss_mb'] or 0:>8.1f}")
+                levels.append(level)
+    mock.terminate()
+
+    report = {
+        "benchmark": "transcribe_load",
+        "created": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {
+            "models": args.models,
+            "requests": args.requests,
+            "clip_seconds": args.clip_seconds,
+            "poll_interval": args.poll_interval,
+            "preprocess": args.preprocess,
+            "gunicorn": {"workers": args.workers, "threads": args.threads},
+            "mock": mock_settings
+        },
+        "levels": levels
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nReport saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Time WER/CER scoring on a synthetic corpus.
+
+Generates reference/hypothesis pairs with a given error rate and scores
+them with the vectorized edit distance from ``backend/evaluation.py`` and,
+for comparison, a plain Python dynamic-programming implementation.
+
+Usage:
+    python benchmarks/wer_evaluation.py
+    python benchmarks/wer_evaluation.py --files 5000 --words 200 --error-rate 0.15
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import evaluation  # noqa: E402
+
+WORDS = ("labdien", "šī", "ir", "testa", "transkripcija", "runas", "terapija", "vārds",
+         "skaņa", "bērns", "ķēķis", "ļoti", "labi", "ņemt", "žurnāls", "ģimene")
+
+
+def make_pair(rng, words, error_rate):
+    reference = [rng.choice(WORDS) for _ in range(words)]
+    hypothesis = []
+    for word in reference:
+        roll = rng.random()
+        if roll < error_rate / 3:
+            continue                                  # deletion
+        if roll < 2 * error_rate / 3:
+            hypothesis.append(rng.choice(WORDS))      # substitution
+        elif roll < error_rate:
+            hypothesis.extend([word, rng.choice(WORDS)])  # insertion
+        else:
+            hypothesis.append(word)
+    return " ".join(reference), " ".join(hypothesis)
+
+
+def python_edit_distance(reference, hypothesis):
+    previous = list(range(len(hypothesis) + 1))
+    for i, r in enumerate(reference, start=1):
+        current = [i]
+        for j, h in enumerate(hypothesis, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WER/CER scoring")
+    parser.add_argument("--files", type=int, default=1000, help="Reference/hypothesis pairs")
+    parser.add_argument("--words", type=int, default=60, help="Words per reference")
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--python-files", type=int, default=100,
+                        help="Pairs scored with the pure Python implementation (it is slow)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [make_pair(rng, args.words, args.error_rate) for _ in range(args.files)]
+
+    start = time.perf_counter()
+    results = [evaluation.score(reference, hypothesis) for reference, hypothesis in pairs]
+    vectorized = time.perf_counter() - start
+    wer = sum(r["word_errors"] for r in results) / sum(r["ref_words"] for r in results)
+
+    sample = pairs[:args.python_files]
+    start = time.perf_counter()
+    for reference, hypothesis in sample:
+        reference = evaluation.normalize_text(reference)
+        hypothesis = evaluation.normalize_text(hypothesis)
+        python_edit_distance(reference.split(), hypothesis.split())
+        python_edit_distance(reference, hypothesis)
+    python = (time.perf_counter() - start) / len(sample) * len(pairs)
+
+    print(f"{len(pairs)} pairs x {args.words} words, corpus WER {wer:.3f}")
+    print(f"vectorized: {vectorized:.2f}s ({len(pairs) / vectorized:.0f} pairs/s)")
+    print(f"python:     {python:.2f}s (extrapolated from {len(sample)} pairs)")
+    print(f"speedup:    {python / vectorized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare Whisper inference engines on the same clips.
+
+Each engine runs in its own process so peak memory is measured separately.
+Reports model load time, real-time factor (processing time / audio
+duration, lower is better), clips per second and peak resident memory.
+With ``--batch-size`` above 1, clips of up to 30 s are decoded in batches
+(engines that support it), as the server does for concurrent requests.
+
+Usage:
+    python benchmarks/whisper_engines.py audio_clips/*.wav
+    python benchmarks/whisper_engines.py clip.mp3 --model-size small \\
+        --engines openai faster-whisper --compute-type int8 --threads 4 \\
+        --output bench_whisper.json
+    python benchmarks/whisper_engines.py short_clips/*.wav --engines openai --batch-size 1 8 16
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def run_engine(engine_name, model_size, compute_type, threads, beam_size, batch_size,
+               clips, language, queue):
+    """Benchmark one engine in a child process and put the report on ``queue``."""
+    from transcribers.audio import get_audio_duration
+    from transcribers.whisper_engines import create_engine
+
+    engine = create_engine({
+        "engine": engine_name,
+        "model_size": model_size,
+        "compute_type": compute_type,
+        "cpu_threads": threads,
+        "beam_size": beam_size
+    })
+
+    try:
+        engine.check_available()
+    except ImportError as e:
+        queue.put({"engine": engine_name, "batch_size": batch_size, "error": str(e)})
+        return
+    if batch_size > 1 and not engine.supports_batching:
+        queue.put({"engine": engine_name, "batch_size": batch_size,
+                   "error": "batched inference not supported"})
+        return
+
+    start = time.perf_counter()
+    model = engine.load()
+    load_time = time.perf_counter() - start
+
+    runs = []
+    for i in range(0, len(clips), batch_size):
+        group = clips[i:i + batch_size]
+        start = time.perf_counter()
+        if batch_size > 1:
+            transcripts = engine.transcribe_batch(model, group, language)
+        else:
+            transcripts = [engine.transcribe(model, group[0], language)]
+        # A batch's time is shared equally by its clips
+        elapsed = (time.perf_counter() - start) / len(group)
+
+        for clip, transcript in zip(group, transcripts):
+            duration = get_audio_duration(Path(clip))
+            runs.append({
+                "clip": clip,
+                "audio_seconds": round(duration, 2),
+                "processing_seconds": round(elapsed, 2),
+                "rtf": round(elapsed / duration, 3) if duration else None,
+                "transcript": transcript
+            })
+
+    total_audio = sum(r["audio_seconds"] for r in runs)
+    total_processing = sum(r["processing_seconds"] for r in runs)
+
+    queue.put({
+        "engine": engine_name,
+        "batch_size": batch_size,
+        "key": engine.key,
+        "load_seconds": round(load_time, 2),
+        "audio_seconds": round(total_audio, 2),
+        "processing_seconds": round(total_processing, 2),
+        "rtf": round(total_processing / total_audio, 3) if total_audio else None,
+        "clips_per_second": round(len(runs) / total_processing, 2) if total_processing else None,
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "runs": runs
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Whisper inference engines")
+    parser.add_argument("clips", nargs="+", help="Audio files to transcribe")
+    parser.add_argument("--model-size", default="medium")
+    parser.add_argument("--engines", nargs="+", default=["openai", "faster-whisper"])
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper compute type")
+    parser.add_argument("--threads", type=int, default=0, help="CPU threads (0 = library default)")
+    parser.add_argument("--beam-size", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1],
+                        help="Clips decoded together (one run per size, clips must be <= 30 s)")
+    parser.add_argument("--language", default="lv")
+    parser.add_argument("--output", help="Write the full report as JSON to this file")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    reports = []
+    for engine_name in args.engines:
+        for batch_size in args.batch_size:
+            print(f"Running {engine_name} (batch size {batch_size})...", flush=True)
+            queue = context.Queue()
+            process = context.Process(
+                target=run_engine,
+                args=(engine_name, args.model_size, args.compute_type, args.threads,
+                      args.beam_size, batch_size, args.clips, args.language, queue)
+            )
+            process.start()
+            report = queue.get()
+            process.join()
+            reports.append(report)
+
+    print()
+    print(f"{'engine':<16} {'batch':>5} {'load s':>8} {'audio s':>9} {'proc s':>8} {'RTF':>7} "
+          f"{'clips/s':>8} {'peak MB':>9}")
+    for report in reports:
+        if "error" in report:
+            print(f"{report['engine']:<16} {report['batch_size']:>5} {report['error']}")
+            continue
+        print(f"{report['engine']:<16} {report['batch_size']:>5} {report['load_seconds']:>8} "
+              f"{report['audio_seconds']:>9} {report['processing_seconds']:>8} {report['rtf']:>7} "
+              f"{report['clips_per_second']:>8} {report['peak_rss_mb']:>9}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"model_size": args.model_size, "reports": reports}, f, ensure_ascii=False, indent=2)
+        print(f"\nReport saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,6 @@ BASE_DIR = Path(__file__).parent
 OUTPUT_DIR = BASE_DIR / "transcriptions"
 AUDIO_DIR = BASE_DIR / "audio_clips"
 
-# Create directories if they don't exist
-OUTPUT_DIR.mkdir(exist_ok=True)
-AUDIO_DIR.mkdir(exist_ok=True)
-
 # API Keys (load from environment variables)
 SPEECHMATICS_API_KEY = os.getenv("SPEECHMATICS_API_KEY")
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
@@ -23,30 +19,222 @@ ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
 MODELS = {
     "speechmatics": {
         "name": "Speechmatics",
+        "enabled": os.getenv("SPEECHMATICS_ENABLED", "true").lower() == "true",
         "language": "lv",
+        "operating_point": "enhanced",
+        "chunk_seconds": float(os.getenv("SPEECHMATICS_CHUNK_SECONDS", "0")) or None,
         "requires_api_key": True,
-        "api_key": SPEECHMATICS_API_KEY
+        "api_key": SPEECHMATICS_API_KEY,
+        # API endpoint; point it at benchmarks/mock_providers.py to run offline
+        "base_url": os.getenv("SPEECHMATICS_BASE_URL", "https://asr.api.speechmatics.com/v2"),
+        # Rate limit, concurrency cap and circuit breaker (transcribers/limits.py)
+        "limits": {
+            "rate": float(os.getenv("SPEECHMATICS_RATE_LIMIT", "5")),  # requests per second
+            "burst": 10,
+            "max_in_flight": int(os.getenv("SPEECHMATICS_MAX_IN_FLIGHT", "20")),
+            "queue_timeout": 30,
+            "breaker": {
+                "error_rate": 0.5,
+                "min_requests": 10,
+                "window": 60,
+                "cooldown": 30
+            }
+        },
+        "http": {
+            "pool_size": int(os.getenv("SPEECHMATICS_POOL_SIZE", "10")),
+            "connect_timeout": 10,
+            "read_timeout": 120,
+            "retries": 3
+        }
     },
     "google": {
         "name": "Google Speech-to-Text",
+        "enabled": os.getenv("GOOGLE_ENABLED", "true").lower() == "true",
         "language": "lv-LV",
+        # Recognition mode: "auto" picks sync / streaming / long_running by duration
+        "mode": os.getenv("GOOGLE_MODE", "auto"),
+        "sync_max_seconds": 55,         # recognize() rejects audio over about a minute
+        "streaming_max_seconds": 290,   # streaming sessions are capped at about five minutes
+        # Long-running recognition reads audio from this Cloud Storage bucket
+        "gcs_bucket": os.getenv("GOOGLE_GCS_BUCKET"),
+        # Longer files are split before upload; without a bucket into chunks
+        # short enough for streaming recognition
+        "chunk_seconds": float(os.getenv("GOOGLE_CHUNK_SECONDS",
+                                         "480" if os.getenv("GOOGLE_GCS_BUCKET") else "240")) or None,
+        # Use the offline fake client (transcribers/google_fake.py)
+        "fake": os.getenv("GOOGLE_SPEECH_FAKE", "false").lower() == "true",
+        # Rate limit, concurrency cap and circuit breaker (transcribers/limits.py)
+        "limits": {
+            "rate": float(os.getenv("GOOGLE_RATE_LIMIT", "10")),  # requests per second
+            "burst": 10,
+            "max_in_flight": int(os.getenv("GOOGLE_MAX_IN_FLIGHT", "20")),
+            "queue_timeout": 30,
+            "breaker": {
+                "error_rate": 0.5,
+                "min_requests": 10,
+                "window": 60,
+                "cooldown": 30
+            }
+        },
         "requires_api_key": True,
         "api_key": GOOGLE_APPLICATION_CREDENTIALS
     },
     "whisper": {
         "name": "OpenAI Whisper",
+        "enabled": os.getenv("WHISPER_ENABLED", "true").lower() == "true",
         "language": "lv",
         "model_size": "medium",
-        "requires_api_key": False
+        "requires_api_key": False,
+        "local": True,
+        "chunk_seconds": float(os.getenv("WHISPER_CHUNK_SECONDS", "0")) or None,
+        # Inference backend: "openai" (PyTorch) or "faster-whisper" (CTranslate2, int8 on CPU)
+        "engine": os.getenv("WHISPER_ENGINE", "openai"),
+        "compute_type": os.getenv("WHISPER_COMPUTE_TYPE", "int8"),
+        "cpu_threads": int(os.getenv("WHISPER_CPU_THREADS", "0")),  # 0 = library default
+        "beam_size": int(os.getenv("WHISPER_BEAM_SIZE", "0")) or None,  # None = engine default
+        "max_concurrency": int(os.getenv("WHISPER_MAX_CONCURRENCY", "1")),
+        # Clips of up to 30 s arriving within the window are decoded as one batch
+        # (1 = off; batched transcripts are cached apart from transcribe() ones)
+        "batch_size": int(os.getenv("WHISPER_BATCH_SIZE", "1")),
+        "batch_window_ms": float(os.getenv("WHISPER_BATCH_WINDOW_MS", "50")),
+        "preload": os.getenv("WHISPER_PRELOAD", "false").lower() == "true",
+        "warm_up": os.getenv("WHISPER_WARM_UP", "false").lower() == "true"
     },
     "assemblyai": {
         "name": "AssemblyAI",
+        "enabled": os.getenv("ASSEMBLYAI_ENABLED", "true").lower() == "true",
         "language": "lv",
+        "chunk_seconds": float(os.getenv("ASSEMBLYAI_CHUNK_SECONDS", "0")) or None,
         "requires_api_key": True,
-        "api_key": ASSEMBLYAI_API_KEY
+        "api_key": ASSEMBLYAI_API_KEY,
+        # API endpoint; point it at benchmarks/mock_providers.py to run offline
+        "base_url": os.getenv("ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com/v2"),
+        # Rate limit, concurrency cap and circuit breaker (transcribers/limits.py)
+        "limits": {
+            "rate": float(os.getenv("ASSEMBLYAI_RATE_LIMIT", "5")),  # requests per second
+            "burst": 10,
+            "max_in_flight": int(os.getenv("ASSEMBLYAI_MAX_IN_FLIGHT", "32")),
+            "queue_timeout": 30,
+            "breaker": {
+                "error_rate": 0.5,
+                "min_requests": 10,
+                "window": 60,
+                "cooldown": 30
+            }
+        },
+        "http": {
+            "pool_size": int(os.getenv("ASSEMBLYAI_POOL_SIZE", "10")),
+            "connect_timeout": 10,
+            "read_timeout": 120,
+            "retries": 3
+        }
     }
 }
 
+# Parallel transcription: remote providers share a thread pool, local models
+# (Whisper) run on their own single worker so they don't compete for the CPU
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "8"))
+LOCAL_TRANSCRIBE_WORKERS = int(os.getenv("LOCAL_TRANSCRIBE_WORKERS", "1"))
+
+# Shared poller for remote provider jobs (Speechmatics, AssemblyAI).
+# Intervals back off exponentially and are scaled to the audio duration.
+POLLER = {
+    "workers": int(os.getenv("POLLER_WORKERS", "4")),
+    "min_interval": float(os.getenv("POLLER_MIN_INTERVAL", "1.0")),  # seconds
+    "max_interval": 30.0,       # seconds
+    "backoff": 1.5,
+    "jitter": 0.2,
+    "initial_fraction": 0.1,    # first poll after 10% of the audio duration
+    "interval_fraction": 0.25   # never wait longer than 25% of the audio duration
+}
+
+# Decode each upload once to 16 kHz mono FLAC and send that to every provider
+PREPROCESS_AUDIO = os.getenv("PREPROCESS_AUDIO", "true").lower() == "true"
+
+# Splitting long recordings on silence (used for models with "chunk_seconds")
+SEGMENTATION = {
+    "workers": int(os.getenv("SEGMENTATION_WORKERS", str(os.cpu_count() or 4))),
+    "vad_aggressiveness": 2,    # webrtcvad mode 0-3, if installed
+    "min_silence_ms": 300,      # pause length that counts as a cut point
+    "overlap_seconds": 1.0      # shared audio when a chunk has to be cut mid-speech
+}
+
+# Background job workers (jobs submitted through /api/jobs)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+# How often the worker running the background tasks looks for jobs and
+# batches left behind by a worker process that exited
+ORPHAN_RESCAN_SECONDS = float(os.getenv("ORPHAN_RESCAN_SECONDS", "60"))
+
+# Production server (backend/gunicorn.conf.py). Each worker process serves
+# requests from a thread pool, since most requests wait on the providers, so
+# one worker is the default. With "preload" the app is loaded once in the
+# master before the workers are forked; Whisper weights are only shared that
+# way with WHISPER_PRELOAD=true. Extra workers add CPU for local models but
+# each keeps its own provider rate limits, in-memory caches, job progress
+# streams and upload hashers (metrics are combined through METRICS).
+SERVER = {
+    "bind": os.getenv("SERVER_BIND", "0.0.0.0:5001"),
+    "workers": int(os.getenv("SERVER_WORKERS", "1")),
+    "threads": int(os.getenv("SERVER_THREADS", "16")),
+    "worker_class": os.getenv("SERVER_WORKER_CLASS", "gthread"),
+    "preload": os.getenv("SERVER_PRELOAD", "true").lower() == "true",
+    "timeout": int(os.getenv("SERVER_TIMEOUT", "600")),                   # /api/transcribe waits for every model
+    "graceful_timeout": int(os.getenv("SERVER_GRACEFUL_TIMEOUT", "300")),  # time to drain running jobs on shutdown
+    "keepalive": int(os.getenv("SERVER_KEEPALIVE", "5"))
+}
+
+# Prometheus metrics (/metrics). Under gunicorn every worker writes its
+# values to "multiproc_dir" every "flush_seconds" and a scrape adds them up;
+# the directory is emptied when the server starts.
+METRICS = {
+    "multiproc_dir": os.getenv("METRICS_MULTIPROC_DIR", str(BASE_DIR / "metrics")),
+    "flush_seconds": float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+}
+
+# Batch runs over whole directories (/api/batches and backend/batch_cli.py).
+# Local models run in worker processes, each with its own model copy and an
+# equal share of the CPU threads; remote providers are bounded by their "limits".
+BATCH = {
+    "local_processes": int(os.getenv("BATCH_LOCAL_PROCESSES", str(max(1, (os.cpu_count() or 4) // 4)))),
+    "max_outstanding": int(os.getenv("BATCH_MAX_OUTSTANDING", "32")),  # work items in flight per batch
+    "workers": int(os.getenv("BATCH_WORKERS", "1"))                     # batches run at the same time
+}
+
+# Transcript cache keyed by audio content hash, model and model settings
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "50000"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+RESULT_CACHE_MAX_AGE_DAYS = int(os.getenv("RESULT_CACHE_MAX_AGE_DAYS", "90"))
+
+# Uploads: size limit, suggested chunk size for resumable uploads and how
+# long an unfinished upload is kept
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(8 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+
+# How long XLSX exports (/api/exports) are kept for download
+EXPORT_TTL_HOURS = float(os.getenv("EXPORT_TTL_HOURS", "24"))
+
+# Rescan interval of the upload folder for the file listing index
+# (files added outside the app; instant with the optional watchdog package)
+FILE_INDEX_RESCAN_SECONDS = float(os.getenv("FILE_INDEX_RESCAN_SECONDS", "300"))
+
+# Serving transcripts and audio (/api/download, /api/audio). Behind nginx,
+# X-Accel-Redirect lets nginx send the file; map each folder to an
+# "internal" location aliased to it. X-Sendfile does the same for
+# Apache/lighttpd. Without either, files are streamed through sendfile(2)
+# when the WSGI server supports it.
+FILE_SERVING = {
+    "x_accel_redirect": os.getenv("SERVE_X_ACCEL_REDIRECT", "false").lower() == "true",
+    "accel_locations": {
+        "audio": os.getenv("SERVE_ACCEL_AUDIO_LOCATION", "/protected/audio_clips/"),
+        "results": os.getenv("SERVE_ACCEL_RESULTS_LOCATION", "/protected/transcriptions/")
+    },
+    "x_sendfile": os.getenv("SERVE_X_SENDFILE", "false").lower() == "true",
+    "audio_max_age": int(os.getenv("SERVE_AUDIO_MAX_AGE", "86400"))  # seconds browsers reuse audio
+}
+
 # Supported audio formats
 SUPPORTED_AUDIO_FORMATS = [".wav", ".mp3", ".m4a", ".flac", ".ogg"]
 
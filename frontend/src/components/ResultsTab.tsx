@@ -73,6 +73,7 @@ const ResultsTab: React.FC<ResultsTabProps> = ({ onShowSnackbar, onTranscription
   const [deleteDialogOpen, setDeleteDialogOpen] = useState(false);
   const [fileToDelete, setFileToDelete] = useState<string | null>(null);
   const [filesWithResults, setFilesWithResults] = useState<Set<string>>(new Set());
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   // localStorage functions
   const getFilesWithResults = (): Set<string> => {
@@ -183,17 +184,28 @@ const ResultsTab: React.FC<ResultsTabProps> = ({ onShowSnackbar, onTranscription
       setFiles(localFiles);
     }
     try {
-      const response = await apiService.listFiles();
-      const serverFiles = (response.files || []).sort((a: FileInfo, b: FileInfo) =>
-        new Date(b.upload_time).getTime() - new Date(a.upload_time).getTime()
-      );
-      setFiles((prev) => mergeUnique(prev.length ? prev : localFiles, serverFiles));
+      // Newest first, sorted by the server
+      const page = await apiService.listFiles({ sort: 'upload_time', order: 'desc' });
+      setFiles((prev) => mergeUnique(prev.length ? prev : localFiles, page.files || []));
+      setNextCursor(page.next_cursor);
     } catch (error) {
       // Keep local files if server listing fails
       console.error('Failed to load files:', error);
     }
   };
 
+  const loadMoreFiles = async () => {
+    if (!nextCursor) return;
+    try {
+      const page = await apiService.listFiles({ sort: 'upload_time', order: 'desc', cursor: nextCursor });
+      setFiles((prev) => mergeUnique(prev, page.files || []));
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Failed to load more files:', error);
+      onShowSnackbar('Failed to load more files', 'error');
+    }
+  };
+
   const loadFileResults = async (filename: string) => {
     setLoading(true);
     try {
@@ -503,6 +515,13 @@ const ResultsTab: React.FC<ResultsTabProps> = ({ onShowSnackbar, onTranscription
                   </Table>
                 </TableContainer>
               )}
+              {nextCursor && (
+                <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+                  <Button variant="outlined" size="small" onClick={loadMoreFiles}>
+                    Load more
+                  </Button>
+                </Box>
+              )}
             </CardContent>
           </Card>
         </Grid>
@@ -518,9 +537,19 @@ const ResultsTab: React.FC<ResultsTabProps> = ({ onShowSnackbar, onTranscription
               </Box>
               
               {selectedFile && (
-                <Typography variant="body2" color="text.secondary" sx={{ mb: 3, pb: 2, borderBottom: '1px solid #e0e0e0' }}>
-                  📁 {selectedFile}
-                </Typography>
+                <Box sx={{ mb: 3, pb: 2, borderBottom: '1px solid #e0e0e0' }}>
+                  <Typography variant="body2" color="text.secondary" sx={{ mb: 1 }}>
+                    📁 {selectedFile}
+                  </Typography>
+                  {/* Streamed with Range requests, so seeking doesn't download the whole file */}
+                  <audio
+                    key={selectedFile}
+                    controls
+                    preload="metadata"
+                    src={apiService.audioUrl(selectedFile)}
+                    style={{ width: '100%' }}
+                  />
+                </Box>
               )}
 
               {selectedFile && (
@@ -23,7 +23,7 @@ import {
   Error as ErrorIcon,
 } from '@mui/icons-material';
 import { useDropzone } from 'react-dropzone';
-import { apiService, TranscriptionResponse } from '../utils/api';
+import { apiService, ModelProgressEvent, TranscriptionResponse } from '../utils/api';
 
 interface UploadTabProps {
   onTranscriptionComplete: () => void;
@@ -60,6 +60,7 @@ const UploadTab: React.FC<UploadTabProps> = ({
   const [uploadProgress, setUploadProgress] = useState(0);
   const [transcriptionResults, setTranscriptionResults] = useState<TranscriptionResponse | null>(null);
   const [isUploading, setIsUploading] = useState(false);
+  const [modelProgress, setModelProgress] = useState<{ [modelId: string]: ModelProgressEvent }>({});
 
   const onDrop = useCallback((acceptedFiles: File[]) => {
     const file = acceptedFiles[0];
@@ -105,13 +106,35 @@ const UploadTab: React.FC<UploadTabProps> = ({
         setUploadProgress(100);
       } else {
         // For local development, use two-step process
-        setUploadProgress(25);
-        const uploadResponse = await apiService.uploadFile(uploadedFile);
-        setUploadProgress(50);
-        transcriptionResponse = await apiService.transcribeAudio(
-          uploadResponse.filename,
-          selectedModels
+        const uploadResponse = await apiService.uploadFileChunked(
+          uploadedFile,
+          (fraction) => setUploadProgress(Math.round(fraction * 50))
         );
+        setUploadProgress(50);
+        const job = await apiService.submitJob(uploadResponse.filename, selectedModels);
+        setModelProgress({});
+        
+        // Each model's result is shown as soon as it arrives
+        await new Promise<void>((resolve, reject) => {
+          apiService.streamJobEvents(
+            job.job_id,
+            (event) => {
+              setModelProgress((current) => ({ ...current, [event.model_id]: event }));
+              if (event.status === 'success' || event.status === 'error' || event.status === 'cancelled') {
+                const outcome = { success: 'done', error: 'failed', cancelled: 'cancelled' }[event.status];
+                onShowSnackbar(
+                  `${modelNames[event.model_id] || event.model_id}: ${outcome}`,
+                  event.status === 'success' ? 'success' : event.status === 'error' ? 'error' : 'warning'
+                );
+              }
+            },
+            () => resolve(),
+            reject
+          );
+        });
+        
+        const finishedJob = await apiService.getJob(job.job_id);
+        transcriptionResponse = { ...finishedJob, filename: uploadResponse.filename };
         setUploadProgress(100);
       }
       
@@ -164,6 +187,7 @@ const UploadTab: React.FC<UploadTabProps> = ({
   const handleClearResults = () => {
     setUploadedFile(null);
     setTranscriptionResults(null);
+    setModelProgress({});
     setUploadProgress(0);
   };
 
@@ -228,6 +252,28 @@ const UploadTab: React.FC<UploadTabProps> = ({
                     Uploading and processing...
                   </Typography>
                   <LinearProgress variant="determinate" value={uploadProgress} />
+                  {Object.values(modelProgress).map((event) => (
+                    <Box key={event.model_id} sx={{ mt: 1 }}>
+                      <Typography variant="body2">
+                        {modelNames[event.model_id] || event.model_id}: {event.status}
+                        {event.provider_status ? ` (${event.provider_status})` : ''}
+                        {event.processing_time ? ` – ${event.processing_time.toFixed(1)}s` : ''}
+                      </Typography>
+                      {event.progress != null && event.status === 'processing' && (
+                        <LinearProgress variant="determinate" value={event.progress * 100} />
+                      )}
+                      {event.status === 'success' && event.transcript && (
+                        <Typography variant="caption" color="text.secondary">
+                          {event.transcript.slice(0, 200)}
+                        </Typography>
+                      )}
+                      {event.status === 'error' && event.error && (
+                        <Typography variant="caption" color="error.main">
+                          {event.error}
+                        </Typography>
+                      )}
+                    </Box>
+                  ))}
                 </Box>
               )}
             </CardContent>
@@ -37,6 +37,26 @@ export interface FileInfo {
   filename: string;
   size: number;
   upload_time: string;
+  extension?: string;
+  has_results?: boolean;
+}
+
+export interface ListFilesParams {
+  sort?: 'upload_time' | 'size' | 'filename';
+  order?: 'asc' | 'desc';
+  limit?: number;
+  cursor?: string;
+  extension?: string;
+  since?: string;
+  until?: string;
+  min_size?: number;
+  max_size?: number;
+  has_results?: boolean;
+}
+
+export interface FilePage {
+  files: FileInfo[];
+  next_cursor: string | null;
 }
 
 export interface TranscriptionResult {
@@ -52,12 +72,47 @@ export interface FileResults {
   results: TranscriptionResult[];
 }
 
+export type ModelStatus = 'queued' | 'uploading' | 'processing' | 'success' | 'error' | 'cancelled';
+
+export interface ModelProgressEvent {
+  job_id: string;
+  model_id: string;
+  model_name?: string;
+  status: ModelStatus;
+  progress?: number | null;
+  provider_status?: string;
+  partial_transcript?: string;
+  elapsed?: number;
+  transcript?: string;
+  error?: string;
+  processing_time?: number;
+}
+
+export interface JobEndEvent {
+  job_id: string;
+  status: 'completed' | 'failed';
+  summary: { total_models: number; successful: number; failed: number; pending: number };
+}
+
 export interface TranscriptionResponse {
   message: string;
   results: TranscriptionResult[];
   summary_file: string;
 }
 
+// crypto.subtle can only hash a whole buffer, so larger files would have to be
+// read into memory at once; they are uploaded without a checksum instead
+const SHA256_MAX_BYTES = 100 * 1024 * 1024;
+
+// Hex SHA-256 of a file, sent so the server can skip uploads it already has
+// and verify the assembled file. crypto.subtle only exists in secure contexts
+// (https or localhost); elsewhere the upload goes ahead without a checksum.
+async function sha256Hex(file: File): Promise<string | undefined> {
+  if (!globalThis.crypto?.subtle || file.size > SHA256_MAX_BYTES) return undefined;
+  const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest), (byte) => byte.toString(16).padStart(2, '0')).join('');
+}
+
 export const apiService = {
   // Health check
   async checkHealth() {
@@ -84,6 +139,42 @@ export const apiService = {
     return response.data;
   },
 
+  // Resumable chunked upload; retries a failed chunk from the server's offset
+  async uploadFileChunked(file: File, onProgress?: (fraction: number) => void, maxRetries = 5) {
+    const { data: session } = await api.post('/api/uploads', {
+      filename: file.name,
+      size: file.size,
+      sha256: await sha256Hex(file),
+    });
+    if (session.status === 'complete') {
+      onProgress?.(1);
+      return session;
+    }
+
+    let offset = 0;
+    let retries = 0;
+    while (offset < file.size) {
+      const chunk = file.slice(offset, offset + session.chunk_size);
+      try {
+        const { data } = await api.put(`/api/uploads/${session.upload_id}`, chunk, {
+          params: { offset },
+          headers: { 'Content-Type': 'application/octet-stream' },
+        });
+        offset = data.offset;
+        retries = 0;
+        onProgress?.(offset / file.size);
+      } catch (error: any) {
+        if (++retries > maxRetries) throw error;
+        // Ask where the server is and continue from there
+        const { data } = await api.get(`/api/uploads/${session.upload_id}`);
+        offset = data.offset;
+      }
+    }
+
+    const { data } = await api.post(`/api/uploads/${session.upload_id}/complete`);
+    return data;
+  },
+
   // Transcribe audio (two-step for local development)
   async transcribeAudio(filename: string, models: string[]) {
     const response = await api.post('/api/transcribe', { filename, models });
@@ -104,6 +195,64 @@ export const apiService = {
     return response.data;
   },
 
+  // Queue a transcription job; progress is followed with streamJobEvents
+  async submitJob(filename: string, models: string[]) {
+    const response = await api.post('/api/jobs', { filename, models });
+    return response.data;
+  },
+
+  async getJob(jobId: string) {
+    const response = await api.get(`/api/jobs/${jobId}`);
+    return response.data;
+  },
+
+  // Subscribe to per-model progress events (Server-Sent Events).
+  // EventSource reconnects on its own and resumes from the last event. When
+  // the connection fails, the job is looked up: a finished job ends the
+  // stream with onEnd, a missing one (or a stream the browser gave up on)
+  // with onError.
+  streamJobEvents(
+    jobId: string,
+    onModelEvent: (event: ModelProgressEvent) => void,
+    onEnd: (event: JobEndEvent) => void,
+    onError?: (error: Error) => void,
+  ) {
+    const source = new EventSource(`${API_BASE_URL}/api/jobs/${jobId}/events`);
+    let finished = false;
+    const finish = (callback: () => void) => {
+      if (finished) return;
+      finished = true;
+      source.close();
+      callback();
+    };
+
+    const checkJob = async () => {
+      try {
+        const { data: job } = await api.get(`/api/jobs/${jobId}`);
+        if (job.status === 'completed' || job.status === 'failed') {
+          finish(() => onEnd({ job_id: jobId, status: job.status, summary: job.summary }));
+        } else if (source.readyState === EventSource.CLOSED) {
+          finish(() => onError?.(new Error('Lost connection to the job progress stream')));
+        }
+      } catch (error: any) {
+        finish(() => onError?.(error));
+      }
+    };
+
+    ['queued', 'uploading', 'processing', 'done', 'error', 'cancelled'].forEach((type) => {
+      source.addEventListener(type, (message) => {
+        const data = (message as MessageEvent).data;
+        // Connection errors also fire "error" events, without data
+        if (data) onModelEvent(JSON.parse(data));
+        else if (type === 'error') checkJob();
+      });
+    });
+    source.addEventListener('end', (message) => {
+      finish(() => onEnd(JSON.parse((message as MessageEvent).data)));
+    });
+    return source;
+  },
+
   // Get transcription results
   async getResults(filename: string) {
     const response = await api.get(`/api/results/${filename}`);
@@ -111,19 +260,25 @@ export const apiService = {
   },
 
   // List uploaded files
-  async listFiles() {
-    const response = await api.get('/api/files');
+  // List uploaded files, one page at a time (pass next_cursor for the next page)
+  async listFiles(params: ListFilesParams = {}): Promise<FilePage> {
+    const response = await api.get('/api/files', { params });
     return response.data;
   },
 
   // Download file
   async downloadFile(filename: string) {
-    const response = await api.get(`/api/download/${filename}`, {
+    const response = await api.get(`/api/download/${encodeURIComponent(filename)}`, {
       responseType: 'text',
     });
     return response.data;
   },
 
+  // URL of an uploaded recording for an <audio> element (supports seeking)
+  audioUrl(filename: string) {
+    return `${API_BASE_URL}/api/audio/${encodeURIComponent(filename)}`;
+  },
+
   // Delete results for a specific file
   async deleteResults(filename: string) {
     const response = await api.delete(`/api/results/${filename}`);
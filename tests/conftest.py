@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The backend modules import each other by bare name, as when run from backend/
+sys.path[:0] = [str(ROOT), str(ROOT / "backend")]
@@ -0,0 +1,17 @@
+import os
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def test_importing_the_app_creates_no_folders(tmp_path):
+    backend = tmp_path / "backend"
+    backend.mkdir()
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT), str(ROOT / "backend")]),
+           "GOOGLE_SPEECH_FAKE": "true"}
+
+    subprocess.run([sys.executable, "-c", "import app"], cwd=backend, env=env, check=True)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["backend"]
+    assert list(backend.iterdir()) == []
@@ -0,0 +1,158 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from batch import INCOMPLETE, BatchManager
+
+
+@pytest.fixture
+def files(tmp_path):
+    folder = tmp_path / "audio"
+    folder.mkdir()
+    paths = []
+    for number in range(6):
+        path = folder / f"clip{number}.wav"
+        path.write_bytes(b"RIFF")
+        paths.append(path)
+    return paths
+
+
+class Provider:
+    """Starts work items and finishes them when told to; tracks how many ran at once."""
+
+    def __init__(self, unavailable=()):
+        self.unavailable = set(unavailable)
+        self.pending = []
+        self.in_flight = {}
+        self.peak = {}
+        self.started = []
+        self.lock = threading.Lock()
+
+    def start(self, model_id, file_path):
+        future = Future()
+        with self.lock:
+            self.started.append((model_id, file_path.name))
+            self.in_flight[model_id] = self.in_flight.get(model_id, 0) + 1
+            self.peak[model_id] = max(self.peak.get(model_id, 0), self.in_flight[model_id])
+            self.pending.append((model_id, file_path, future))
+        if (model_id, file_path.name) in self.unavailable:
+            self.finish_one(len(self.pending) - 1)
+        return future
+
+    def finish_one(self, index=0):
+        with self.lock:
+            model_id, file_path, future = self.pending.pop(index)
+            self.in_flight[model_id] -= 1
+        if (model_id, file_path.name) in self.unavailable:
+            future.set_result({"model_id": model_id, "status": "error", "retryable": True,
+                               "error": f"{model_id} is at capacity"})
+        else:
+            future.set_result({"model_id": model_id, "status": "success", "transcript": file_path.stem})
+
+    def finish_all(self, done):
+        """Finish items in the background as they are started until ``done`` is set."""
+        def loop():
+            while not done.is_set():
+                with self.lock:
+                    waiting = bool(self.pending)
+                if waiting:
+                    self.finish_one()
+                else:
+                    done.wait(0.001)
+        threading.Thread(target=loop, daemon=True).start()
+
+
+def run_batch(manager, provider, batch_id):
+    done = threading.Event()
+    provider.finish_all(done)
+    try:
+        return manager.run(batch_id)
+    finally:
+        done.set()
+
+
+def test_items_in_flight_are_capped_per_model(tmp_path, files):
+    provider = Provider()
+    manager = BatchManager(tmp_path / "batches", provider.start, max_outstanding=5,
+                           capacity={"remote": 2, "local": 0}.get)
+    batch = manager.create(files, ["remote", "local"])
+
+    result = run_batch(manager, provider, batch["batch_id"])
+
+    assert result["status"] == "completed"
+    assert result["successful"] == 12
+    assert provider.peak["remote"] <= 2
+    assert len(list(manager.iter_results(batch["batch_id"]))) == 12
+
+
+def test_capped_model_does_not_hold_up_the_others(tmp_path, files):
+    provider = Provider()
+    manager = BatchManager(tmp_path / "batches", provider.start, max_outstanding=10,
+                           capacity={"remote": 1, "local": 0}.get)
+    batch = manager.create(files, ["remote", "local"])
+    runner = threading.Thread(target=manager.run, args=(batch["batch_id"],))
+    runner.start()
+
+    # Nothing finishes yet: one remote item and every local item are started
+    deadline = time.monotonic() + 5
+    while len(provider.started) < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    assert sorted(model_id for model_id, _ in provider.started) == ["local"] * 6 + ["remote"]
+
+    done = threading.Event()
+    provider.finish_all(done)
+    runner.join(5)
+    done.set()
+    assert manager.get(batch["batch_id"])["completed"] == 12
+
+
+def test_items_turned_away_by_the_provider_are_retried_on_resume(tmp_path, files):
+    unavailable = {("remote", "clip1.wav"), ("remote", "clip4.wav")}
+    provider = Provider(unavailable=unavailable)
+    manager = BatchManager(tmp_path / "batches", provider.start, capacity=lambda model_id: 0)
+    batch = manager.create(files, ["remote"])
+
+    first = run_batch(manager, provider, batch["batch_id"])
+
+    assert first["status"] == INCOMPLETE
+    assert (first["completed"], first["deferred"]) == (4, 2)
+    checkpointed = {row["filename"] for row in manager.iter_results(batch["batch_id"])}
+    assert checkpointed == {"clip0.wav", "clip2.wav", "clip3.wav", "clip5.wav"}
+
+    provider.unavailable.clear()
+    provider.started.clear()
+    resumed = run_batch(manager, provider, batch["batch_id"])
+
+    assert sorted(name for _, name in provider.started) == ["clip1.wav", "clip4.wav"]
+    assert resumed["status"] == "completed"
+    assert (resumed["completed"], resumed["successful"], resumed["deferred"]) == (6, 6, 0)
+
+
+def test_resume_skips_checkpointed_items_and_drops_a_partial_line(tmp_path, files):
+    provider = Provider()
+    manager = BatchManager(tmp_path / "batches", provider.start)
+    batch = manager.create(files[:3], ["remote"])
+    results_path = tmp_path / "batches" / f"{batch['batch_id']}.jsonl"
+    row = {"filename": "clip0.wav", "file_path": str(files[0]), "model_id": "remote", "status": "success"}
+    results_path.write_text(json.dumps(row) + "\n" + '{"filename": "clip1.w')
+
+    result = run_batch(manager, provider, batch["batch_id"])
+
+    assert sorted(name for _, name in provider.started) == ["clip1.wav", "clip2.wav"]
+    assert result["completed"] == 3
+    assert all(line.endswith("}") for line in results_path.read_text().splitlines())
+
+
+def test_missing_file_is_recorded_as_an_error(tmp_path, files):
+    provider = Provider()
+    manager = BatchManager(tmp_path / "batches", provider.start)
+    files[0].unlink()
+    batch = manager.create(files[:2], ["remote"])
+
+    result = run_batch(manager, provider, batch["batch_id"])
+
+    assert (result["successful"], result["failed"]) == (1, 1)
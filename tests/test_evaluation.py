@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+import pytest
+
+from evaluation import edit_distance, normalize_text, score
+
+
+def reference_distance(a, b):
+    """Plain dynamic-programming Levenshtein distance."""
+    row = list(range(len(b) + 1))
+    for i, x in enumerate(a, start=1):
+        previous, row[0] = row[0], i
+        for j, y in enumerate(b, start=1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (x != y))
+    return row[-1]
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0),
+    ("abc", "", 3),
+    ("", "ab", 2),
+    ("kitten", "sitting", 3),
+    ("flaw", "lawn", 2),
+])
+def test_edit_distance_examples(a, b, expected):
+    assert edit_distance(np.array([ord(c) for c in a]), np.array([ord(c) for c in b])) == expected
+
+
+def test_edit_distance_matches_the_plain_algorithm():
+    rng = random.Random(0)
+    for _ in range(200):
+        a = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        b = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        assert edit_distance(np.array(a), np.array(b)) == reference_distance(a, b)
+
+
+def test_normalization_keeps_latvian_diacritics_unless_asked():
+    assert normalize_text("Ābols,  ĶIRSIS — ogas!") == "ābols ķirsis ogas"
+    assert normalize_text("Ābols ķirsis", strip_diacritics=True) == "abols kirsis"
+
+
+def test_score_counts_word_and_character_errors():
+    result = score("Labdien, kā jums iet?", "labdien kā jums iet labi")
+
+    assert result["word_errors"] == 1
+    assert result["ref_words"] == 4
+    assert result["wer"] == 0.25
+    assert result["char_errors"] == 5
+
+
+def test_empty_reference():
+    assert score("", "")["wer"] == 0.0
+    assert score("", "vārds")["wer"] == 1.0
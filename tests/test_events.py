@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+
+import jobs
+from events import EventLog, stream_events
+from jobs import JobManager
+
+
+def drain(log, after_id=0):
+    """Every event of a closed log after ``after_id``."""
+    return [(event_id, event_type) for event_id, event_type, _ in log.wait(after_id, 5)]
+
+
+def test_wait_returns_events_after_the_given_id():
+    log = EventLog()
+    log.publish("processing", {})
+    log.publish("done", {})
+
+    assert [event_id for event_id, _, _ in log.wait(1, 0)] == [2]
+    assert log.wait(2, 0) == []
+
+
+def test_close_wakes_waiting_subscribers():
+    log = EventLog()
+    received = []
+    subscriber = threading.Thread(target=lambda: received.extend(log.wait(0, 5)))
+    subscriber.start()
+
+    log.close("end", {"status": "completed"})
+    subscriber.join(5)
+
+    assert [event_type for _, event_type, _ in received] == ["end"]
+    log.publish("done", {})
+    assert len(log.wait(0, 0)) == 1
+
+
+def test_stream_resumes_after_last_event_id():
+    log = EventLog()
+    log.publish("processing", {"model_id": "a"})
+    log.publish("done", {"model_id": "a"})
+    log.close("end", {})
+
+    messages = list(stream_events(log, last_event_id=1))
+
+    assert messages[0].startswith("retry:")
+    assert [m.split("\n")[0] for m in messages[1:]] == ["id: 2", "id: 3"]
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def make_runner(release):
+    def runner(filename, models, on_update):
+        for model_id in models:
+            on_update({"model_id": model_id, "status": "processing"})
+        release.wait(5)
+        results = [{"model_id": model_id, "status": "success", "text": "hi"} for model_id in models]
+        for result in results:
+            on_update(result)
+        return results
+    return runner
+
+
+def test_running_job_streams_updates_and_ends(tmp_path, release):
+    manager = JobManager(tmp_path, make_runner(release), max_workers=1)
+    job = manager.submit("a.wav", ["m1", "m2"])
+
+    log = manager.events(job["job_id"])
+    release.set()
+    manager.drain(5)
+
+    types = [event_type for _, event_type in drain(log)]
+    assert types[:2] == ["queued", "queued"]
+    assert types.count("done") == 2
+    assert types[-1] == "end"
+    assert log.closed
+
+
+def test_finished_job_replays_final_results(tmp_path, release):
+    release.set()
+    manager = JobManager(tmp_path, make_runner(release), max_workers=1)
+    job = manager.submit("a.wav", ["m1"])
+    manager.drain(5)
+
+    restarted = JobManager(tmp_path, make_runner(release))
+    log = restarted.events(job["job_id"])
+
+    assert log.closed
+    assert [event_type for _, event_type in drain(log)] == ["done", "end"]
+    assert restarted.events("missing") is None
+
+
+def test_job_run_by_another_worker_is_followed_until_it_ends(tmp_path, release, monkeypatch):
+    monkeypatch.setattr(jobs, "FOLLOW_INTERVAL", 0.05)
+    worker = JobManager(tmp_path, make_runner(release), max_workers=1)
+    job = worker.submit("a.wav", ["m1"])
+
+    # Another process sees the job only through its file
+    other = JobManager(tmp_path, make_runner(release))
+    log = other.events(job["job_id"])
+    assert not log.closed
+
+    release.set()
+    worker.drain(5)
+
+    deadline = time.monotonic() + 5
+    while not log.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    types = [event_type for _, event_type in drain(log)]
+    assert "done" in types
+    assert types[-1] == "end"
+    assert other.events(job["job_id"]) is log
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from file_index import FileIndex
+from results_index import ResultsIndex
+
+
+@pytest.fixture
+def folder(tmp_path):
+    uploads = tmp_path / "audio"
+    uploads.mkdir()
+    # Sizes and upload times both increase with the number; two files share a time
+    for number in range(7):
+        path = uploads / f"clip{number}.{'mp3' if number % 2 else 'wav'}"
+        path.write_bytes(b"x" * (100 + number))
+        mtime = 1_700_000_000 + min(number, 5) * 60
+        os.utime(path, (mtime, mtime))
+    (uploads / "notes.txt").write_text("not audio")
+    return uploads
+
+
+@pytest.fixture
+def index(tmp_path, folder):
+    ResultsIndex(tmp_path / "index.db")
+    file_index = FileIndex(tmp_path / "index.db", folder, {"wav", "mp3"})
+    file_index.sync()
+    return file_index
+
+
+def all_pages(index, **options):
+    pages, cursor = [], None
+    while True:
+        page = index.list(cursor=cursor, **options)
+        pages.append([f["filename"] for f in page["files"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("sort", ["upload_time", "size", "filename"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_pages_cover_every_file_once_in_order(index, sort, order):
+    pages = all_pages(index, sort=sort, order=order, limit=3)
+    names = [name for page in pages for name in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sorted(names) == [f"clip{number}.{'mp3' if number % 2 else 'wav'}" for number in range(7)]
+    if sort == "filename":
+        assert names == sorted(names, reverse=order == "desc")
+    if sort == "size":
+        expected = [f"clip{number}" for number in range(7)]
+        assert [name.split(".")[0] for name in names] == (expected[::-1] if order == "desc" else expected)
+
+
+def test_files_sharing_a_sort_value_are_not_skipped_across_pages(index):
+    # clip5 and clip6 have the same upload time and fall on either side of a page break
+    pages = all_pages(index, sort="upload_time", order="desc", limit=1)
+
+    assert [page[0] for page in pages[:2]] == ["clip6.wav", "clip5.mp3"]
+    assert len(pages) == 7
+
+
+def test_cursor_is_stable_while_files_are_added(index, folder):
+    first = index.list(sort="filename", order="asc", limit=3)
+    (folder / "clip00.wav").write_bytes(b"new")
+    index.sync()
+
+    second = index.list(sort="filename", order="asc", limit=3, cursor=first["next_cursor"])
+
+    assert [f["filename"] for f in second["files"]] == ["clip3.mp3", "clip4.wav", "clip5.mp3"]
+
+
+def test_filters(index, tmp_path):
+    ResultsIndex(tmp_path / "index.db").record("clip2.wav", {"model_id": "whisper", "status": "success"})
+
+    def names(**options):
+        return [f["filename"] for f in index.list(sort="filename", order="asc", **options)["files"]]
+
+    assert names(extension="MP3") == ["clip1.mp3", "clip3.mp3", "clip5.mp3"]
+    assert names(min_size=104, max_size=105) == ["clip4.wav", "clip5.mp3"]
+    assert names(has_results=True) == ["clip2.wav"]
+    assert "clip2.wav" not in names(has_results=False)
+
+
+def test_sync_drops_deleted_files_and_ignores_other_extensions(index, folder):
+    (folder / "clip0.wav").unlink()
+
+    assert index.sync() == {"updated": 0, "removed": 1}
+    assert len(index.list(limit=100)["files"]) == 6
+
+
+def test_unknown_sort_key_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.list(sort="duration")
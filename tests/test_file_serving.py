@@ -0,0 +1,87 @@
+import pytest
+from flask import Flask, abort
+
+from file_serving import AUDIO_MIMETYPES, TRANSCRIPT_EXTENSIONS, resolve_path, serve_file
+
+SETTINGS = {"x_accel_redirect": False, "accel_locations": {"audio": "/protected/audio/"}}
+
+
+@pytest.fixture
+def folder(tmp_path):
+    (tmp_path / "clip.wav").write_bytes(bytes(range(256)) * 4)
+    (tmp_path / "clip_whisper.txt").write_text("labdien")
+    (tmp_path / "index.db").write_bytes(b"SQLite")
+    (tmp_path / ".uploads").mkdir()
+    (tmp_path / ".uploads" / "part.wav").write_bytes(b"RIFF")
+    return tmp_path
+
+
+@pytest.fixture
+def client(folder):
+    app = Flask(__name__)
+
+    @app.route("/audio/<path:filename>")
+    def audio(filename):
+        path = resolve_path(folder, filename, AUDIO_MIMETYPES)
+        if path is None:
+            abort(404)
+        return serve_file(path, "audio", SETTINGS, mimetype=AUDIO_MIMETYPES[path.suffix], max_age=60)
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("filename", ["../clip.wav", "/etc/passwd", ".uploads/part.wav", "index.db", "missing.txt"])
+def test_paths_outside_the_served_files_are_refused(folder, filename):
+    assert resolve_path(folder, filename, TRANSCRIPT_EXTENSIONS) is None
+
+
+def test_symlink_out_of_the_folder_is_refused(folder, tmp_path_factory):
+    outside = tmp_path_factory.mktemp("outside") / "secret.txt"
+    outside.write_text("secret")
+    (folder / "link.txt").symlink_to(outside)
+
+    assert resolve_path(folder, "link.txt", TRANSCRIPT_EXTENSIONS) is None
+    assert resolve_path(folder, "clip_whisper.txt", TRANSCRIPT_EXTENSIONS) == (folder / "clip_whisper.txt").resolve()
+
+
+def test_range_request_returns_partial_content(client, folder):
+    response = client.get("/audio/clip.wav", headers={"Range": "bytes=256-511"})
+
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == "bytes 256-511/1024"
+    assert response.data == bytes(range(256))
+    assert response.mimetype == "audio/wav"
+    assert "private" in response.headers["Cache-Control"]
+
+
+def test_matching_etag_returns_not_modified(client):
+    etag = client.get("/audio/clip.wav").headers["ETag"]
+
+    response = client.get("/audio/clip.wav", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def test_accel_redirect_only_names_the_file(folder):
+    app = Flask(__name__)
+    with app.test_request_context():
+        response = serve_file(folder / "clip.wav", "audio", {**SETTINGS, "x_accel_redirect": True})
+
+    assert response.headers["X-Accel-Redirect"] == "/protected/audio/clip.wav"
+    assert response.get_data() == b""
+
+
+@pytest.mark.parametrize("as_attachment", [False, True])
+def test_accel_redirect_and_send_file_encode_names_alike(folder, as_attachment):
+    name = 'ārsta "piezīmes" 1.txt'
+    (folder / name).write_text("labdien")
+    app = Flask(__name__)
+    with app.test_request_context():
+        accel = serve_file(folder / name, "audio", {**SETTINGS, "x_accel_redirect": True},
+                           as_attachment=as_attachment)
+        direct = serve_file(folder / name, "audio", SETTINGS, as_attachment=as_attachment)
+        direct.close()
+
+    assert accel.headers["X-Accel-Redirect"] == "/protected/audio/%C4%81rsta%20%22piez%C4%ABmes%22%201.txt"
+    assert accel.headers["Content-Disposition"] == direct.headers["Content-Disposition"]
+    assert "filename*=UTF-8''%C4%81rsta" in accel.headers["Content-Disposition"]
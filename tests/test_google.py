@@ -0,0 +1,53 @@
+import wave
+
+import pytest
+
+from transcribers import google, google_fake
+from transcribers.base import TranscriptionError
+from transcribers.google import GoogleTranscriber
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Five seconds of 16 kHz mono silence (160 KB of audio)."""
+    path = tmp_path / "recording.wav"
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\0\0" * 16000 * 5)
+    return path
+
+
+def streaming_transcriber(client):
+    transcriber = GoogleTranscriber(client=client)
+    transcriber.mode = "streaming"
+    return transcriber
+
+
+def test_streaming_requests_stay_under_the_audio_limit(recording):
+    client = google_fake.FakeSpeechClient(interim_every=2)
+    interim = []
+
+    future = streaming_transcriber(client).transcribe_async(recording, on_progress=interim.append)
+
+    assert future.result() == client.transcript
+    assert client.calls == ["streaming_recognize"]
+    assert google.STREAM_CHUNK_BYTES <= google_fake.STREAM_REQUEST_MAX_BYTES
+    assert interim and all(update["provider_status"] == "streaming" for update in interim)
+
+
+def test_fake_rejects_oversized_streaming_requests(recording, monkeypatch):
+    monkeypatch.setattr(google, "STREAM_CHUNK_BYTES", 32 * 1024)
+
+    with pytest.raises(TranscriptionError, match="exceeds"):
+        streaming_transcriber(google_fake.FakeSpeechClient()).transcribe_async(recording)
+
+
+def test_mode_follows_audio_duration():
+    transcriber = GoogleTranscriber(client=google_fake.FakeSpeechClient())
+    transcriber.mode = "auto"
+
+    assert transcriber.select_mode(transcriber.sync_max_seconds) == "sync"
+    assert transcriber.select_mode(transcriber.sync_max_seconds + 1) == "streaming"
+    assert transcriber.select_mode(transcriber.streaming_max_seconds + 1) == "long_running"
@@ -0,0 +1,217 @@
+import time
+
+import pytest
+import requests
+
+from transcribers.http_session import LimitedSession
+from transcribers.limits import CircuitBreaker, ProviderLimiter, ProviderUnavailableError, TokenBucket
+
+
+def test_bucket_allows_a_burst_then_waits_for_refill():
+    bucket = TokenBucket(rate=20, burst=3)
+
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    assert not bucket.acquire(timeout=0)
+
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert 0.02 <= time.monotonic() - started < 0.5
+
+
+def test_bucket_gives_up_after_timeout():
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.acquire(timeout=0)
+
+    assert not bucket.acquire(timeout=0.05)
+
+
+def test_unlimited_bucket_never_waits():
+    bucket = TokenBucket(rate=0, burst=1)
+
+    assert all(bucket.acquire(timeout=0) for _ in range(100))
+    assert bucket.available() == float("inf")
+
+
+def breaker(**options):
+    return CircuitBreaker(**{"error_rate": 0.5, "min_requests": 4, "window": 60, "cooldown": 0.05, **options})
+
+
+def test_breaker_opens_once_error_rate_is_reached():
+    circuit = breaker()
+    for succeeded in (True, False, True):
+        circuit.record(succeeded)
+    assert circuit.state == CircuitBreaker.CLOSED
+
+    circuit.record(False)
+
+    assert circuit.state == CircuitBreaker.OPEN
+    assert not circuit.allow()
+
+
+def test_breaker_needs_min_requests_before_opening():
+    circuit = breaker(min_requests=10)
+    for _ in range(9):
+        circuit.record(False)
+
+    assert circuit.state == CircuitBreaker.CLOSED
+
+
+def tripped():
+    circuit = breaker(min_requests=1)
+    circuit.record(False)
+    time.sleep(0.06)
+    return circuit
+
+
+def test_half_open_lets_one_probe_through_and_closes_on_success():
+    circuit = tripped()
+
+    assert circuit.admit() == (True, True)
+    assert circuit.admit() == (False, False)
+
+    circuit.record(True, probe=True)
+
+    assert circuit.state == CircuitBreaker.CLOSED
+    assert circuit.admit() == (True, False)
+
+
+def test_failed_probe_reopens_the_circuit():
+    circuit = tripped()
+    circuit.admit()
+
+    circuit.record(False, probe=True)
+
+    assert circuit.state == CircuitBreaker.OPEN
+
+
+def test_only_the_probe_decides_a_half_open_circuit():
+    circuit = tripped()
+    circuit.admit()
+
+    circuit.record(True)
+    circuit.record(False)
+
+    assert circuit.state == CircuitBreaker.HALF_OPEN
+    assert circuit.admit() == (False, False)
+
+
+def test_released_probe_can_be_taken_again():
+    circuit = tripped()
+    circuit.admit()
+
+    circuit.release_probe()
+
+    assert circuit.admit() == (True, True)
+
+
+def rate_limited_half_open_limiter():
+    limiter = ProviderLimiter("Test", {"rate": 1, "burst": 1, "queue_timeout": 0,
+                                       "breaker": {"min_requests": 1, "cooldown": 0.05}})
+    limiter.bucket.acquire(timeout=0)
+    limiter.breaker.record(False)
+    time.sleep(0.06)
+    return limiter
+
+
+def test_rate_limited_probe_is_given_back():
+    limiter = rate_limited_half_open_limiter()
+
+    with pytest.raises(ProviderUnavailableError, match="rate limit"):
+        limiter.before_request()
+
+    assert limiter.breaker.admit() == (True, True)
+
+
+def test_rejected_request_leaves_another_requests_probe_taken():
+    limiter = rate_limited_half_open_limiter()
+    assert limiter.breaker.admit() == (True, True)
+
+    with pytest.raises(ProviderUnavailableError, match="circuit open"):
+        limiter.before_request()
+
+    assert limiter.breaker.admit() == (False, False)
+
+
+def test_limiter_caps_transcriptions_in_flight():
+    limiter = ProviderLimiter("Test", {"max_in_flight": 1, "queue_timeout": 0.05})
+    limiter.admit()
+
+    with pytest.raises(ProviderUnavailableError):
+        limiter.admit()
+
+    limiter.release()
+    limiter.admit()
+    assert limiter.stats()["in_flight"] == 1
+
+
+class FakeAdapter(requests.adapters.BaseAdapter):
+    """Answers every request with ``status``, or raises ``error``."""
+
+    def __init__(self, status=200, error=None):
+        super().__init__()
+        self.status = status
+        self.error = error
+        self.methods = []
+
+    def send(self, request, **kwargs):
+        self.methods.append(request.method)
+        if self.error:
+            raise self.error
+        response = requests.Response()
+        response.status_code = self.status
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+def session_with(adapter, limits=None):
+    limiter = ProviderLimiter("Test", {"breaker": {"min_requests": 1, "cooldown": 0.05}, **(limits or {})})
+    session = LimitedSession(limiter)
+    session.mount("https://", adapter)
+    return session, limiter
+
+
+def test_polls_and_cancels_are_sent_while_the_circuit_is_open():
+    adapter = FakeAdapter()
+    session, limiter = session_with(adapter)
+    limiter.breaker.cooldown = 60
+    limiter.after_request(status_code=503)
+    assert limiter.breaker.state == CircuitBreaker.OPEN
+
+    assert session.get("https://provider/jobs/1").status_code == 200
+    assert session.delete("https://provider/jobs/1").status_code == 200
+    with pytest.raises(ProviderUnavailableError, match="circuit open"):
+        session.post("https://provider/jobs")
+
+    assert adapter.methods == ["GET", "DELETE"]
+
+
+def test_polls_are_still_rate_limited():
+    session, limiter = session_with(FakeAdapter(), {"rate": 1, "burst": 1, "queue_timeout": 0})
+    session.get("https://provider/jobs/1")
+
+    with pytest.raises(ProviderUnavailableError, match="rate limit"):
+        session.get("https://provider/jobs/1")
+
+
+def test_successful_probe_closes_the_circuit():
+    session, limiter = session_with(FakeAdapter())
+    limiter.after_request(status_code=503)
+    time.sleep(0.06)
+
+    session.post("https://provider/jobs")
+
+    assert limiter.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_is_released_when_the_request_fails_unexpectedly():
+    session, limiter = session_with(FakeAdapter(error=KeyboardInterrupt()))
+    limiter.after_request(status_code=503)
+    time.sleep(0.06)
+
+    with pytest.raises(KeyboardInterrupt):
+        session.post("https://provider/jobs")
+
+    assert limiter.breaker.admit() == (True, True)
@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from transcribers import metrics
+from transcribers.processes import process_alive
+
+
+@pytest.fixture
+def multiproc_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_multiproc_dir", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def write_worker(folder, pid, requests, in_flight):
+    snapshot = {
+        "provider_api_requests_total": [[["test", "200"], requests]],
+        "transcriptions_in_flight": [[["test"], in_flight]],
+    }
+    (folder / f"{pid}.json").write_text(json.dumps(snapshot))
+
+
+def sample(text, line_start):
+    return [line for line in text.splitlines() if line.startswith(line_start)]
+
+
+def test_process_alive(exited_pid):
+    assert process_alive(os.getpid())
+    assert not process_alive(exited_pid)
+
+
+def test_counters_add_up_over_all_workers_and_gauges_over_live_ones(multiproc_dir, exited_pid):
+    # A live worker (the parent of this process) and one that exited
+    write_worker(multiproc_dir, os.getppid(), requests=3, in_flight=2)
+    write_worker(multiproc_dir, exited_pid, requests=4, in_flight=5)
+
+    text = metrics.render()
+
+    own = metrics.API_REQUESTS.current().get(("test", "200"), 0)
+    assert sample(text, 'provider_api_requests_total{provider="test",status="200"}') == [
+        f'provider_api_requests_total{{provider="test",status="200"}} {own + 7:g}'
+    ]
+    own_in_flight = metrics.IN_FLIGHT.current().get(("test",), 0)
+    assert sample(text, 'transcriptions_in_flight{provider="test"}') == [
+        f'transcriptions_in_flight{{provider="test"}} {own_in_flight + 2:g}'
+    ]
+
+
+def test_render_writes_this_workers_file(multiproc_dir):
+    metrics.render()
+
+    assert (multiproc_dir / f"{os.getpid()}.json").exists()
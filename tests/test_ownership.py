@@ -0,0 +1,154 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from batch import BatchManager
+from jobs import JobManager, claim, owned_elsewhere
+from transcribers.processes import current_process, process_alive, process_token
+
+linux_only = pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+
+
+@pytest.fixture
+def exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@linux_only
+def test_reused_pid_is_not_the_recorded_process():
+    parent = os.getppid()
+
+    assert process_alive(parent, process_token(parent))
+    assert not process_alive(parent, "another-boot:1")
+    assert not process_alive(os.getpid(), "another-boot:1")
+    assert process_alive(*current_process())
+
+
+def test_exited_process_is_not_alive(exited_pid):
+    assert not process_alive(exited_pid)
+    assert not owned_elsewhere({"pid": exited_pid})
+
+
+@linux_only
+def test_owner_with_this_processes_pid_is_taken_over():
+    assert not owned_elsewhere({"pid": os.getpid(), "pid_token": "another-boot:1"})
+    assert owned_elsewhere({"pid": os.getppid(), "pid_token": process_token(os.getppid())})
+    assert not owned_elsewhere({"pid": os.getppid(), "pid_token": "another-boot:1"})
+
+
+def write_job(folder, job_id, **owner):
+    job = {
+        "job_id": job_id, "filename": "a.wav", "status": "queued",
+        "created_at": "2026-01-01T00:00:00", "started_at": None, "finished_at": None,
+        "results": [{"model_id": "m1", "status": "queued"}], **owner
+    }
+    (folder / f"{job_id}.json").write_text(json.dumps(job))
+
+
+class Runner:
+    def __init__(self):
+        self.release = threading.Event()
+        self.files = []
+
+    def __call__(self, filename, models, on_update):
+        self.files.append(filename)
+        self.release.wait(5)
+        for model_id in models:
+            on_update({"model_id": model_id, "status": "success"})
+
+
+@linux_only
+def test_resume_takes_over_only_jobs_of_exited_workers(tmp_path, exited_pid):
+    parent = os.getppid()
+    write_job(tmp_path, "live", pid=parent, pid_token=process_token(parent))
+    write_job(tmp_path, "reused", pid=parent, pid_token="another-boot:1")
+    write_job(tmp_path, "exited", pid=exited_pid)
+    runner = Runner()
+    runner.release.set()
+    manager = JobManager(tmp_path, runner, max_workers=4)
+
+    assert manager.resume_pending() == 2
+    manager.drain(5)
+
+    assert manager.get("live")["status"] == "queued"
+    assert manager.get("reused")["status"] == "completed"
+    assert manager.get("exited")["status"] == "completed"
+
+
+def test_rescan_does_not_resume_a_job_twice(tmp_path, exited_pid):
+    write_job(tmp_path, "job", pid=exited_pid)
+    runner = Runner()
+    manager = JobManager(tmp_path, runner, max_workers=2)
+
+    assert manager.resume_pending() == 1
+    assert manager.resume_pending() == 0
+    runner.release.set()
+    manager.drain(5)
+
+    assert runner.files == ["a.wav"]
+    assert manager.get("job")["pid"] == os.getpid()
+
+
+def test_drain_waits_for_running_jobs_and_leaves_queued_ones_for_the_next_start(tmp_path, exited_pid):
+    runner = Runner()
+    manager = JobManager(tmp_path, runner, max_workers=1)
+    running = manager.submit("a.wav", ["m1"])
+    queued = manager.submit("b.wav", ["m1"])
+
+    threading.Timer(0.05, runner.release.set).start()
+    assert manager.drain(5)
+
+    assert manager.get(running["job_id"])["status"] == "completed"
+    assert manager.get(queued["job_id"])["status"] == "queued"
+
+    # The next start is a new process; this test process would still own the job
+    job = json.loads((tmp_path / f"{queued['job_id']}.json").read_text())
+    job["pid"] = exited_pid
+    (tmp_path / f"{queued['job_id']}.json").write_text(json.dumps(job))
+    restarted = JobManager(tmp_path, runner, max_workers=1)
+    assert restarted.resume_pending() == 1
+    restarted.drain(5)
+    assert restarted.get(queued["job_id"])["status"] == "completed"
+
+
+def test_rescan_does_not_resume_a_batch_this_process_runs(tmp_path):
+    release = threading.Event()
+    started = []
+
+    def start(model_id, file_path):
+        future = Future()
+        started.append(file_path.name)
+        threading.Thread(target=lambda: (release.wait(5), future.set_result(
+            {"model_id": model_id, "status": "success"}))).start()
+        return future
+
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"RIFF")
+    manager = BatchManager(tmp_path / "batches", start)
+    batch = manager.submit([audio], ["m1"])
+
+    deadline = time.monotonic() + 5
+    while not started and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert manager.resume_pending() == 0
+    release.set()
+    manager.drain(5)
+
+    assert started == ["a.wav"]
+    assert manager.get(batch["batch_id"])["status"] == "completed"
+
+
+def test_claim_records_pid_and_token():
+    state = {}
+    claim(state)
+
+    assert (state["pid"], state["pid_token"]) == current_process()
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from transcribers.base import EmptyTranscriptError, TranscriptionError
+from transcribers.poller import JobPoller
+
+
+@pytest.fixture
+def poller():
+    return JobPoller(workers=2, min_interval=0.02, max_interval=0.1, backoff=2, jitter=0)
+
+
+def test_poll_delays_back_off_up_to_the_cap(poller):
+    times = []
+
+    def check():
+        times.append(time.monotonic())
+        return "done" if len(times) == 6 else None
+
+    assert poller.watch(check, timeout=5).result(timeout=5) == "done"
+
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert gaps[0] == pytest.approx(0.04, abs=0.02)
+    assert gaps[1] == pytest.approx(0.08, abs=0.02)
+    assert gaps[-1] == pytest.approx(0.1, abs=0.02)
+    assert poller.pending() == 0
+
+
+def test_intervals_scale_with_audio_duration():
+    poller = JobPoller(min_interval=1, max_interval=30, initial_fraction=0.1, interval_fraction=0.25)
+
+    assert poller._intervals(None) == (1, 30)
+    assert poller._intervals(5) == (1, 1.25)
+    assert poller._intervals(600) == (30, 30)
+
+
+def test_job_times_out(poller):
+    future = poller.watch(lambda: None, timeout=0.1)
+
+    with pytest.raises(TranscriptionError, match="timed out"):
+        future.result(timeout=5)
+
+
+def test_failure_keeps_its_transcription_error_type(poller):
+    def check():
+        raise EmptyTranscriptError("no text")
+
+    with pytest.raises(EmptyTranscriptError, match="AssemblyAI transcription failed: no text"):
+        poller.watch(check, description="AssemblyAI transcription").result(timeout=5)
+
+
+def test_other_errors_become_transcription_errors(poller):
+    def check():
+        raise ConnectionError("reset")
+
+    with pytest.raises(TranscriptionError, match="reset"):
+        poller.watch(check).result(timeout=5)
+
+
+def test_cancelling_calls_on_cancel(poller):
+    cancelled = threading.Event()
+    future = poller.watch(lambda: None, timeout=5, on_cancel=cancelled.set)
+
+    assert future.cancel()
+
+    assert cancelled.wait(5)
@@ -0,0 +1,117 @@
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from transcribers import segmentation
+from transcribers.base import EmptyTranscriptError
+from transcribers.segmentation import FRAME_BYTES, merge_transcripts, segment_audio, transcribe_in_chunks
+
+SPEECH = b"\x01" * FRAME_BYTES
+SILENCE = b"\x00" * FRAME_BYTES
+
+
+class FrameVAD:
+    """Treats frames of zero bytes as silence."""
+
+    def is_speech(self, frame, sample_rate):
+        return frame[0] != 0
+
+
+@pytest.fixture
+def frames(monkeypatch):
+    """Set the decoded frames of the next recording."""
+    decoded = []
+    monkeypatch.setattr(segmentation, "decode_frames", lambda path: iter(decoded))
+    monkeypatch.setattr(segmentation, "create_vad", lambda aggressiveness: FrameVAD())
+    return decoded
+
+
+def test_merge_drops_words_repeated_across_an_overlap():
+    parts = [("labdien, kā jums iet", 0), ("Jums iet labi", 1.0), ("paldies", 0)]
+
+    assert merge_transcripts(parts) == "labdien, kā jums iet labi paldies"
+
+
+def test_merge_keeps_repeats_without_overlap():
+    assert merge_transcripts([("jā jā", 0), ("jā", 0)]) == "jā jā jā"
+
+
+def test_chunks_are_cut_in_a_pause(frames, tmp_path):
+    frames.extend([SPEECH] * 7 + [SILENCE] * 2 + [SPEECH] * 6)
+
+    chunks = list(segment_audio("a.wav", tmp_path, max_chunk_seconds=0.3, min_silence_ms=60,
+                                overlap_seconds=0.09, vad=FrameVAD()))
+
+    assert [(c.start, c.end, c.overlap) for c in chunks] == [
+        (0, pytest.approx(0.24), 0),
+        (pytest.approx(0.24), pytest.approx(0.45), 0)
+    ]
+    assert all(c.path.exists() for c in chunks)
+
+
+def test_chunks_without_a_pause_overlap(frames, tmp_path):
+    frames.extend([SPEECH] * 25)
+
+    chunks = list(segment_audio("a.wav", tmp_path, max_chunk_seconds=0.3, min_silence_ms=60,
+                                overlap_seconds=0.09, vad=FrameVAD()))
+
+    assert chunks[1].start == pytest.approx(0.21)
+    assert [c.overlap for c in chunks[1:]] == [pytest.approx(0.09)] * (len(chunks) - 1)
+    assert chunks[-1].end == pytest.approx(0.75)
+
+
+def test_silent_chunks_are_skipped(frames, tmp_path):
+    frames.extend([SILENCE] * 10 + [SPEECH] * 5)
+
+    chunks = list(segment_audio("a.wav", tmp_path, max_chunk_seconds=0.3, min_silence_ms=60,
+                                overlap_seconds=0, vad=FrameVAD()))
+
+    # The silent first half is cut off in its pause and dropped
+    assert [c.index for c in chunks] == [0]
+    assert chunks[0].start == pytest.approx(0.15)
+
+
+class AsyncTranscriber:
+    """Answers with the chunk's name from another thread; ``empty`` chunks have no text."""
+
+    def __init__(self, empty=()):
+        self.empty = set(empty)
+        self.paths = []
+
+    def transcribe_async(self, path):
+        self.paths.append(path)
+        future = Future()
+
+        def answer():
+            if path.stem in self.empty:
+                future.set_exception(EmptyTranscriptError("no speech"))
+            else:
+                future.set_result(path.stem)
+        threading.Timer(0.01, answer).start()
+        return future
+
+
+@pytest.fixture
+def short_chunks(monkeypatch, frames):
+    monkeypatch.setitem(segmentation.SEGMENTATION, "overlap_seconds", 0)
+    frames.extend([SPEECH] * 40)
+
+
+def test_chunk_texts_are_joined_in_order(short_chunks):
+    transcriber = AsyncTranscriber(empty={"chunk_00002"})
+
+    text = transcribe_in_chunks(transcriber, Path("a.wav"), max_chunk_seconds=0.3, max_parallel=2)
+
+    assert text == "chunk_00000 chunk_00001 chunk_00003"
+    assert not any(path.exists() for path in transcriber.paths)
+
+
+def test_chunk_failure_fails_the_file(short_chunks):
+    class Failing:
+        def transcribe(self, path):
+            raise segmentation.TranscriptionError("provider down")
+
+    with pytest.raises(segmentation.TranscriptionError, match="provider down"):
+        transcribe_in_chunks(Failing(), Path("a.wav"), max_chunk_seconds=0.3)
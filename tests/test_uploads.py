@@ -0,0 +1,150 @@
+import hashlib
+import io
+
+import pytest
+
+from uploads import UploadError, UploadManager
+
+WAV = b"RIFF\x24\x00\x00\x00WAVEfmt " + bytes(range(256)) * 8
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return UploadManager(tmp_path, max_bytes=1 << 20, chunk_bytes=1024)
+
+
+def upload_in_chunks(manager, session, data, size):
+    for offset in range(0, len(data), size):
+        manager.write_chunk(session["upload_id"], offset, io.BytesIO(data[offset:offset + size]))
+
+
+def test_chunked_upload_is_stored_with_its_digest(manager, tmp_path):
+    session = manager.create("a.wav", len(WAV))
+    upload_in_chunks(manager, session, WAV, 500)
+
+    result = manager.complete(session["upload_id"])
+
+    assert result["sha256"] == hashlib.sha256(WAV).hexdigest()
+    assert result["deduplicated"] is False
+    assert (tmp_path / "a.wav").read_bytes() == WAV
+    assert list(manager.staging_folder.glob(session["upload_id"] + ".*")) == []
+
+
+def test_wrong_offset_reports_where_to_resume(manager):
+    session = manager.create("a.wav", len(WAV))
+    manager.write_chunk(session["upload_id"], 0, io.BytesIO(WAV[:100]))
+
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session["upload_id"], 50, io.BytesIO(WAV[50:100]))
+
+    assert error.value.status == 409
+    assert error.value.details == {"offset": 100}
+
+
+def test_incomplete_chunk_is_rolled_back(manager):
+    session = manager.create("a.wav", len(WAV))
+    manager.write_chunk(session["upload_id"], 0, io.BytesIO(WAV[:100]))
+
+    with pytest.raises(UploadError):
+        manager.write_chunk(session["upload_id"], 100, io.BytesIO(WAV[100:150]), length=100)
+
+    assert manager.get(session["upload_id"])["offset"] == 100
+    manager.write_chunk(session["upload_id"], 100, io.BytesIO(WAV[100:]))
+    assert manager.complete(session["upload_id"])["sha256"] == hashlib.sha256(WAV).hexdigest()
+
+
+def test_upload_resumes_in_a_new_process(manager, tmp_path):
+    session = manager.create("a.wav", len(WAV))
+    manager.write_chunk(session["upload_id"], 0, io.BytesIO(WAV[:1000]))
+
+    restarted = UploadManager(tmp_path, max_bytes=1 << 20, chunk_bytes=1024)
+    restarted.write_chunk(session["upload_id"], 1000, io.BytesIO(WAV[1000:]))
+
+    assert restarted.complete(session["upload_id"])["sha256"] == hashlib.sha256(WAV).hexdigest()
+
+
+def test_stale_hasher_is_rebuilt_after_another_worker_wrote(manager, tmp_path):
+    other = UploadManager(tmp_path, max_bytes=1 << 20, chunk_bytes=1024)
+    session = manager.create("a.wav", len(WAV))
+    upload_id = session["upload_id"]
+
+    manager.write_chunk(upload_id, 0, io.BytesIO(WAV[:500]))
+    other.write_chunk(upload_id, 500, io.BytesIO(WAV[500:1000]))
+    manager.write_chunk(upload_id, 1000, io.BytesIO(WAV[1000:]))
+
+    assert manager.complete(upload_id)["sha256"] == hashlib.sha256(WAV).hexdigest()
+
+
+def test_known_digest_skips_the_transfer(manager):
+    first = manager.create("a.wav", len(WAV))
+    upload_in_chunks(manager, first, WAV, len(WAV))
+    manager.complete(first["upload_id"])
+
+    again = manager.create("b.wav", len(WAV), sha256=hashlib.sha256(WAV).hexdigest())
+
+    assert again == {"status": "complete", "filename": "a.wav", "deduplicated": True}
+
+
+def test_same_content_under_another_name_is_deduplicated(manager, tmp_path):
+    for name in ("a.wav", "b.wav"):
+        session = manager.create(name, len(WAV))
+        upload_in_chunks(manager, session, WAV, 700)
+        result = manager.complete(session["upload_id"])
+
+    assert result["filename"] == "a.wav"
+    assert result["deduplicated"] is True
+    assert not (tmp_path / "b.wav").exists()
+
+
+def test_checksum_mismatch_discards_the_upload(manager):
+    session = manager.create("a.wav", len(WAV), sha256="0" * 64)
+    upload_in_chunks(manager, session, WAV, len(WAV))
+
+    with pytest.raises(UploadError) as error:
+        manager.complete(session["upload_id"])
+
+    assert error.value.status == 422
+    assert manager.get(session["upload_id"]) is None
+
+
+def test_invalid_header_is_rejected(manager):
+    session = manager.create("a.wav", 100)
+
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session["upload_id"], 0, io.BytesIO(b"not audio" * 10))
+
+    assert error.value.status == 415
+
+
+def test_busy_session_rejects_a_concurrent_chunk(manager):
+    session = manager.create("a.wav", len(WAV))
+
+    with manager._locked(session["upload_id"]):
+        with pytest.raises(UploadError) as error:
+            manager.write_chunk(session["upload_id"], 0, io.BytesIO(WAV))
+
+    assert error.value.status == 409
+
+
+class Trickle(io.BytesIO):
+    """A request stream that returns a few bytes per read."""
+
+    def read(self, size=-1):
+        return super().read(min(size, 5) if size and size > 0 else 5)
+
+
+def test_header_split_across_reads_is_accepted(manager):
+    session = manager.create("a.wav", len(WAV))
+
+    manager.write_chunk(session["upload_id"], 0, Trickle(WAV))
+
+    assert manager.complete(session["upload_id"])["sha256"] == hashlib.sha256(WAV).hexdigest()
+
+
+def test_file_shorter_than_a_header_is_rejected(manager):
+    session = manager.create("a.wav", 4)
+
+    with pytest.raises(UploadError) as error:
+        manager.write_chunk(session["upload_id"], 0, Trickle(b"RIFF"))
+
+    assert error.value.status == 415
@@ -1,16 +1,37 @@
 """Transcription services package."""
 
-from .base import BaseTranscriber, TranscriptionError
-from .speechmatics import SpeechmaticsTranscriber
-from .google import GoogleTranscriber
-from .whisper import WhisperTranscriber
-from .assemblyai import AssemblyAITranscriber
+import importlib
+
+from .base import BaseTranscriber, EmptyTranscriptError, Transcript, TranscriptionError
+from .registry import create_transcriber, enabled_providers, get_transcriber_class
+
+# Provider classes are imported on first access, so importing the package
+# doesn't pull in every provider's SDK
+_LAZY_CLASSES = {
+    "SpeechmaticsTranscriber": ".speechmatics",
+    "GoogleTranscriber": ".google",
+    "WhisperTranscriber": ".whisper",
+    "AssemblyAITranscriber": ".assemblyai",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        module = importlib.import_module(_LAZY_CLASSES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseTranscriber",
-    "TranscriptionError", 
+    "TranscriptionError",
+    "EmptyTranscriptError",
+    "Transcript",
     "SpeechmaticsTranscriber",
     "GoogleTranscriber",
     "WhisperTranscriber",
-    "AssemblyAITranscriber"
+    "AssemblyAITranscriber",
+    "create_transcriber",
+    "enabled_providers",
+    "get_transcriber_class"
 ]
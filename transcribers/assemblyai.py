@@ -1,12 +1,16 @@
 """AssemblyAI transcription service."""
 
 import os
-import time
-import requests
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from .base import BaseTranscriber, TranscriptionError
+from .audio import get_audio_duration
+from .base import BaseTranscriber, EmptyTranscriptError, Transcript, TranscriptionError
+from .http_session import create_session, get_http_config
+from .limits import get_limiter
+from .poller import get_poller
+from config import MODELS
 
 
 class AssemblyAITranscriber(BaseTranscriber):
@@ -15,54 +19,75 @@ class AssemblyAITranscriber(BaseTranscriber):
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(
             name="AssemblyAI",
-            language="lv"
+            language="lv",
+            chunk_seconds=MODELS["assemblyai"].get("chunk_seconds")
         )
         
         self.api_key = api_key or os.getenv('ASSEMBLYAI_API_KEY')
         if not self.api_key:
             raise ValueError("AssemblyAI API key is required")
         
-        self.base_url = "https://api.assemblyai.com/v2"
+        self.speech_model = "best"
+        self.base_url = MODELS["assemblyai"]["base_url"].rstrip("/")
         self.headers = {
             "authorization": self.api_key,
             "content-type": "application/json"
         }
+        
+        # One keep-alive connection pool for the lifetime of this transcriber
+        http_config = get_http_config(MODELS["assemblyai"])
+        self.session = create_session(http_config, get_limiter("assemblyai"))
+        self.request_timeout = (http_config["connect_timeout"], http_config["read_timeout"])
     
     def transcribe(self, audio_file_path: Path) -> str:
         """Transcribe audio using AssemblyAI."""
+        return self.transcribe_async(audio_file_path).result()
+    
+    def transcribe_async(self, audio_file_path: Path,
+                         on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Upload the file, request a transcript and return a future for it.
+        
+        Polling is done by the shared poller, so no thread waits on the job.
+        ``on_progress`` receives the transcript status reported at each poll.
+        """
         if not self.validate_audio_file(audio_file_path):
             raise TranscriptionError(f"Invalid audio file: {audio_file_path}")
         
         try:
             self.logger.info(f"Starting AssemblyAI transcription for: {audio_file_path}")
             
-            # Step 1: Upload the audio file
-            upload_url = self._upload_file(audio_file_path)
-            self.logger.info(f"File uploaded successfully")
-            
-            # Step 2: Request transcription
-            transcript_id = self._request_transcription(upload_url)
+            with self.stage("upload"):
+                # Step 1: Upload the audio file
+                upload_url = self._upload_file(audio_file_path)
+                self.logger.info(f"File uploaded successfully")
+                
+                # Step 2: Request transcription
+                transcript_id = self._request_transcription(upload_url)
             self.logger.info(f"Transcription requested, ID: {transcript_id}")
             
-            # Step 3: Poll for completion
-            transcript = self._wait_for_completion(transcript_id)
-            self.logger.info(f"Transcription completed successfully")
-            
-            return transcript
-            
         except Exception as e:
             self.logger.error(f"AssemblyAI transcription failed: {str(e)}")
             raise TranscriptionError(f"AssemblyAI transcription failed: {str(e)}")
+        
+        # Step 3: Poll for completion
+        return self._wait_for_completion(transcript_id, audio_duration=get_audio_duration(audio_file_path),
+                                         on_progress=on_progress)
+    
+    def get_config(self) -> dict:
+        """Settings that change the transcript output."""
+        return {"language": self.language, "speech_model": self.speech_model}
     
     def _upload_file(self, file_path: Path) -> str:
         """Upload audio file to AssemblyAI and get upload URL."""
         upload_endpoint = f"{self.base_url}/upload"
         
         with open(file_path, 'rb') as f:
-            response = requests.post(
+            response = self.session.post(
                 upload_endpoint,
                 headers={"authorization": self.api_key},
-                data=f
+                data=f,
+                timeout=self.request_timeout
             )
         
         if response.status_code != 200:
@@ -77,13 +102,14 @@ class AssemblyAITranscriber(BaseTranscriber):
         json_data = {
             "audio_url": audio_url,
             "language_code": "lv",  # Latvian language
-            "speech_model": "best"  # Use the best available model
+            "speech_model": self.speech_model  # Use the best available model
         }
         
-        response = requests.post(
+        response = self.session.post(
             transcript_endpoint,
             json=json_data,
-            headers=self.headers
+            headers=self.headers,
+            timeout=self.request_timeout
         )
         
         if response.status_code != 200:
@@ -91,34 +117,59 @@ class AssemblyAITranscriber(BaseTranscriber):
         
         return response.json()['id']
     
-    def _wait_for_completion(self, transcript_id: str, max_wait: int = 300) -> str:
-        """Poll AssemblyAI API until transcription is complete."""
+    def _wait_for_completion(self, transcript_id: str, max_wait: int = 300,
+                             audio_duration: Optional[float] = None,
+                             on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """Register the transcript with the shared poller and return its future."""
+        # Time spent "queued" at AssemblyAI, then "processing"
+        clock = self.stage_clock("queue")
+        return get_poller().watch(
+            lambda: self._check_transcript(transcript_id, on_progress, clock),
+            timeout=max_wait,
+            audio_duration=audio_duration,
+            description="AssemblyAI transcription",
+            on_cancel=lambda: self._cancel_transcript(transcript_id)
+        )
+    
+    def _cancel_transcript(self, transcript_id: str):
+        """Delete a transcript that is no longer needed."""
+        response = self.session.delete(f"{self.base_url}/transcript/{transcript_id}",
+                                       headers=self.headers, timeout=self.request_timeout)
+        if response.status_code != 200:
+            raise TranscriptionError(f"Cancel failed: {response.status_code} - {response.text}")
+        self.logger.info(f"Cancelled AssemblyAI transcript {transcript_id}")
+    
+    def _check_transcript(self, transcript_id: str,
+                          on_progress: Optional[Callable[[dict], None]] = None,
+                          clock=None) -> Optional[str]:
+        """Poll a transcript once. Returns the text when completed, None while processing."""
         polling_endpoint = f"{self.base_url}/transcript/{transcript_id}"
         
-        start_time = time.time()
+        response = self.session.get(polling_endpoint, headers=self.headers, timeout=self.request_timeout)
         
-        while time.time() - start_time < max_wait:
-            response = requests.get(polling_endpoint, headers=self.headers)
-            
-            if response.status_code != 200:
-                raise TranscriptionError(f"Polling failed: {response.status_code} - {response.text}")
-            
-            result = response.json()
-            status = result['status']
-            
-            if status == 'completed':
-                # Ensure UTF-8 encoding for Latvian characters
-                transcript = result.get('text', '')
-                if not transcript:
-                    raise TranscriptionError("No transcription text returned")
-                return transcript
-            
-            elif status == 'error':
-                error_msg = result.get('error', 'Unknown error')
-                raise TranscriptionError(f"Transcription failed: {error_msg}")
-            
-            # Still processing - wait before polling again
-            time.sleep(3)
+        if response.status_code != 200:
+            raise TranscriptionError(f"Polling failed: {response.status_code} - {response.text}")
         
-        raise TranscriptionError(f"Transcription timed out after {max_wait} seconds")
-
+        result = response.json()
+        status = result['status']
+        if on_progress:
+            on_progress({'provider_status': status})
+        if clock and status == 'processing':
+            clock.enter('processing')
+        
+        if status == 'completed':
+            if clock:
+                clock.finish()
+            # Ensure UTF-8 encoding for Latvian characters
+            transcript = result.get('text', '')
+            if not transcript:
+                raise EmptyTranscriptError("No transcription text returned")
+            self.logger.info(f"Transcription completed successfully")
+            return Transcript(transcript, result.get('confidence'))
+        
+        elif status == 'error':
+            error_msg = result.get('error', 'Unknown error')
+            raise TranscriptionError(f"Transcription failed: {error_msg}")
+        
+        # Still processing - the poller will check again later
+        return None
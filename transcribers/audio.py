@@ -0,0 +1,108 @@
+"""Audio file helpers shared by the transcription services."""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+logger = logging.getLogger("transcriber.audio")
+
+# Rough bitrate used to estimate duration when the file can't be probed
+# (128 kbps compressed audio)
+FALLBACK_BYTES_PER_SECOND = 16000
+
+
+def get_audio_duration(audio_file_path: Path) -> float:
+    """
+    Return the duration of an audio file in seconds.
+
+    Tries soundfile first, then ffprobe, and finally falls back to an
+    estimate from the file size.
+    """
+    try:
+        import soundfile
+        return float(soundfile.info(str(audio_file_path)).duration)
+    except Exception:
+        pass
+
+    try:
+        output = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "json", str(audio_file_path)],
+            capture_output=True, check=True, timeout=30
+        ).stdout
+        return float(json.loads(output)["format"]["duration"])
+    except Exception as e:
+        logger.debug(f"ffprobe failed for {audio_file_path}: {e}")
+
+    return audio_file_path.stat().st_size / FALLBACK_BYTES_PER_SECOND
+
+
+# Normalized copies of uploads live in this folder next to the originals
+PREPROCESSED_DIRNAME = ".preprocessed"
+PREPROCESSED_SAMPLE_RATE = 16000
+
+_prepare_locks = {}
+_prepare_locks_lock = threading.Lock()
+
+
+def preprocessed_path(audio_file_path: Path) -> Path:
+    """Where the normalized copy of an upload is stored."""
+    return audio_file_path.parent / PREPROCESSED_DIRNAME / f"{audio_file_path.name}.16k.flac"
+
+
+def is_preprocessed(audio_file_path: Path) -> bool:
+    """Whether a path points at a normalized 16 kHz mono FLAC artifact."""
+    return audio_file_path.parent.name == PREPROCESSED_DIRNAME
+
+
+def prepare_audio(audio_file_path: Path) -> Path:
+    """
+    Decode an upload once to 16 kHz mono FLAC and return the artifact path.
+
+    The artifact is cached next to the upload and reused by every provider
+    until the original changes. Concurrent callers for the same file wait for
+    a single decode. If ffmpeg is unavailable or fails, the original path is
+    returned so providers can still try the file as uploaded.
+    """
+    target = preprocessed_path(audio_file_path)
+
+    with _prepare_locks_lock:
+        lock = _prepare_locks.setdefault(str(target), threading.Lock())
+
+    with lock:
+        if target.exists() and target.stat().st_mtime >= audio_file_path.stat().st_mtime:
+            return target
+
+        if shutil.which("ffmpeg") is None:
+            logger.warning("ffmpeg not found, providers will receive the original upload")
+            return audio_file_path
+
+        target.parent.mkdir(exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        try:
+            subprocess.run(
+                ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", str(audio_file_path),
+                 "-ac", "1", "-ar", str(PREPROCESSED_SAMPLE_RATE), "-sample_fmt", "s16",
+                 "-c:a", "flac", "-f", "flac", str(tmp_path)],
+                capture_output=True, check=True, timeout=600
+            )
+            os.replace(tmp_path, target)
+        except (subprocess.SubprocessError, OSError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            logger.warning(f"Preprocessing {audio_file_path.name} failed, using original: "
+                           f"{stderr.decode('utf-8', 'replace').strip() or e}")
+            tmp_path.unlink(missing_ok=True)
+            return audio_file_path
+
+        logger.info(f"Preprocessed {audio_file_path.name} -> {target.name} "
+                    f"({audio_file_path.stat().st_size} -> {target.stat().st_size} bytes)")
+        return target
+
+
+def remove_preprocessed(audio_file_path: Path):
+    """Delete the normalized copy of an upload, if there is one."""
+    preprocessed_path(audio_file_path).unlink(missing_ok=True)
@@ -3,16 +3,23 @@
 import logging
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+from . import metrics
+from .audio import get_audio_duration
 
 
 class BaseTranscriber(ABC):
     """Base class for all transcription services."""
     
-    def __init__(self, name: str, language: str = "lv"):
+    def __init__(self, name: str, language: str = "lv", chunk_seconds: Optional[float] = None):
         self.name = name
         self.language = language
+        # Audio longer than this is split on silence and transcribed in chunks
+        self.chunk_seconds = chunk_seconds
         self.logger = logging.getLogger(f"transcriber.{name.lower()}")
+        # Metrics label; create_transcriber() sets it to the model ID
+        self.provider = name.lower()
     
     @abstractmethod
     def transcribe(self, audio_file_path: Path) -> str:
@@ -30,6 +37,51 @@ class BaseTranscriber(ABC):
         """
         pass
     
+    def get_config(self) -> dict:
+        """Settings that change the transcript output (used to key cached results)."""
+        return {"language": self.language}
+    
+    def needs_chunking(self, audio_file_path: Path) -> bool:
+        """Whether the file is too long to send to this service in one piece."""
+        return bool(self.chunk_seconds) and get_audio_duration(audio_file_path) > self.chunk_seconds
+    
+    def transcribe_chunked(self, audio_file_path: Path,
+                           on_progress: Optional[Callable[[dict], None]] = None) -> str:
+        """
+        Split the audio on silence, transcribe the chunks in parallel and join them.
+        
+        ``on_progress`` receives the fraction of the audio transcribed so far.
+        """
+        from .segmentation import transcribe_in_chunks
+        
+        try:
+            return transcribe_in_chunks(self, audio_file_path, self.chunk_seconds,
+                                        on_progress=on_progress)
+        except TranscriptionError:
+            raise
+        except Exception as e:
+            self.logger.error(f"{self.name} chunked transcription failed: {str(e)}")
+            raise TranscriptionError(f"{self.name} chunked transcription failed: {str(e)}")
+    
+    def stage(self, stage: str):
+        """Context manager timing one stage of a transcription (see ``metrics``)."""
+        return metrics.timed_stage(self.provider, stage)
+    
+    def stage_clock(self, stage: str) -> "metrics.StageClock":
+        """Clock for stages that span several calls, e.g. queue -> processing while polling."""
+        return metrics.StageClock(self.provider, stage)
+    
+    def record_transcription(self, status: str, seconds: float, audio_seconds: Optional[float] = None,
+                             cached: bool = False):
+        """Count a finished transcription and, for fresh results, its timing and real-time factor."""
+        metrics.TRANSCRIPTIONS.inc(provider=self.provider, status=status)
+        if cached:
+            return
+        metrics.TRANSCRIPTION_SECONDS.observe(seconds, provider=self.provider)
+        if status == "success" and audio_seconds:
+            metrics.AUDIO_SECONDS.inc(audio_seconds, provider=self.provider)
+            metrics.REALTIME_FACTOR.observe(seconds / audio_seconds, provider=self.provider)
+    
     def validate_audio_file(self, audio_file_path: Path) -> bool:
         """Validate that the audio file exists and is supported."""
         if not audio_file_path.exists():
@@ -46,3 +98,23 @@ class BaseTranscriber(ABC):
 class TranscriptionError(Exception):
     """Custom exception for transcription errors."""
     pass
+
+
+class EmptyTranscriptError(TranscriptionError):
+    """The provider finished but recognised no speech."""
+    pass
+
+
+class Transcript(str):
+    """
+    Transcript text with the provider's confidence (0-1) attached.
+    
+    Behaves exactly like ``str``; ``confidence`` is None when the provider
+    doesn't report one. String operations return plain ``str``, so wrap the
+    final text only.
+    """
+    
+    def __new__(cls, text: str, confidence: Optional[float] = None):
+        transcript = super().__new__(cls, text)
+        transcript.confidence = confidence
+        return transcript
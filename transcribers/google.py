@@ -1,31 +1,90 @@
 """Google Speech-to-Text transcription service."""
 
 import os
+import uuid
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 try:
     from google.cloud import speech
     GOOGLE_AVAILABLE = True
 except ImportError:
+    speech = None
     GOOGLE_AVAILABLE = False
 
-from .base import BaseTranscriber, TranscriptionError
+try:
+    from google.cloud import storage
+    GCS_AVAILABLE = True
+except ImportError:
+    storage = None
+    GCS_AVAILABLE = False
+
+from . import google_fake
+from .audio import PREPROCESSED_SAMPLE_RATE, get_audio_duration, is_preprocessed
+from .base import BaseTranscriber, EmptyTranscriptError, Transcript, TranscriptionError
+from .limits import get_limiter
+from .poller import get_poller
 from config import MODELS
 
+# Bytes of audio per streaming request (about half a second of 16 kHz mono
+# FLAC); Google rejects streaming requests with more than 25 KB of audio
+STREAM_CHUNK_BYTES = 16 * 1024
+
+# Object name prefix of audio uploaded for long-running recognition
+GCS_PREFIX = "long-running/"
+
 
 class GoogleTranscriber(BaseTranscriber):
-    """Google Speech-to-Text transcription service."""
+    """
+    Google Speech-to-Text transcription service.
+    
+    Three recognition modes are supported and picked from the audio duration
+    unless ``config.MODELS["google"]["mode"]`` forces one:
     
-    def __init__(self, credentials_path: Optional[str] = None, project_id: Optional[str] = None):
+    - ``sync``: ``recognize`` with the file inlined (up to about a minute)
+    - ``streaming``: ``streaming_recognize`` fed fixed-size chunks from a
+      generator, with interim results (up to about five minutes)
+    - ``long_running``: ``long_running_recognize`` on a copy of the file in
+      the Cloud Storage bucket ``config.MODELS["google"]["gcs_bucket"]``
+      (inline audio is capped at 10 MB), polled with backoff by the shared
+      poller. Without a bucket, longer recordings are split into chunks
+      short enough to stream instead.
+    """
+    
+    def __init__(self, credentials_path: Optional[str] = None, project_id: Optional[str] = None,
+                 client=None, storage_client=None):
         super().__init__(
             name=MODELS["google"]["name"],
-            language=MODELS["google"]["language"]
+            language=MODELS["google"]["language"],
+            chunk_seconds=MODELS["google"].get("chunk_seconds")
         )
         
+        self.model = "latest_long"
+        self.mode = MODELS["google"].get("mode", "auto")
+        self.sync_max_seconds = MODELS["google"].get("sync_max_seconds", 55)
+        self.streaming_max_seconds = MODELS["google"].get("streaming_max_seconds", 290)
+        self.gcs_bucket = MODELS["google"].get("gcs_bucket")
+        self.storage_client = storage_client
+        self.limiter = get_limiter("google")
+        
+        if client is None and MODELS["google"].get("fake"):
+            client = google_fake.FakeSpeechClient()
+        
+        if client is not None:
+            # Injected client (e.g. the offline fake); use matching request types
+            self.client = client
+            self.speech = google_fake if isinstance(client, google_fake.FakeSpeechClient) else speech
+            if self.speech is google_fake and self.storage_client is None:
+                self.storage_client = google_fake.FakeStorageClient()
+                self.gcs_bucket = self.gcs_bucket or "fake-bucket"
+            return
+        
         if not GOOGLE_AVAILABLE:
             raise ImportError("Google Cloud Speech library not installed. Install with: pip install google-cloud-speech")
         
+        self.speech = speech
+        
         # Set up credentials
         credentials_path = credentials_path or MODELS["google"]["api_key"]
         project_id = project_id or os.getenv("GOOGLE_CLOUD_PROJECT")
@@ -40,57 +99,273 @@ class GoogleTranscriber(BaseTranscriber):
             self.client = speech.SpeechClient()
         except Exception as e:
             raise ValueError(f"Failed to initialize Google Speech client: {str(e)}")
+        
+        if self.gcs_bucket and self.storage_client is None:
+            if not GCS_AVAILABLE:
+                raise ImportError("Google Cloud Storage library not installed (needed for GOOGLE_GCS_BUCKET). "
+                                  "Install with: pip install google-cloud-storage")
+            self.storage_client = storage.Client(project=project_id)
     
     def transcribe(self, audio_file_path: Path) -> str:
         """Transcribe audio using Google Speech-to-Text."""
+        return self.transcribe_async(audio_file_path).result()
+    
+    def transcribe_async(self, audio_file_path: Path,
+                         on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Start recognition in the mode suited to the audio length.
+        
+        Sync and streaming recognition finish before this returns; long-running
+        operations are handed to the shared poller. ``on_progress`` receives
+        interim streaming text and the operation's progress percentage.
+        """
         if not self.validate_audio_file(audio_file_path):
             raise TranscriptionError(f"Invalid audio file: {audio_file_path}")
         
+        future = Future()
         try:
-            # Read audio file
-            with open(audio_file_path, "rb") as audio_file:
-                content = audio_file.read()
-            
-            # Configure recognition
-            audio = speech.RecognitionAudio(content=content)
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-                sample_rate_hertz=16000,  # Common sample rate
-                language_code=self.language,
-                enable_automatic_punctuation=False,  # Raw output as requested
-                model="latest_long",  # Better for longer audio
-                use_enhanced=True  # Use enhanced model if available
-            )
-            
-            # Perform transcription
-            response = self.client.recognize(config=config, audio=audio)
+            duration = get_audio_duration(audio_file_path)
+            mode = self.select_mode(duration)
+            self.logger.info(f"Using {mode} recognition for {audio_file_path.name} ({duration:.1f}s)")
             
-            # Extract text from results
-            if response.results:
-                # Combine all results
-                transcript_parts = []
-                for result in response.results:
-                    if result.alternatives:
-                        transcript_parts.append(result.alternatives[0].transcript)
-                
-                return " ".join(transcript_parts).strip()
+            if mode == "long_running":
+                return self._transcribe_long_running(audio_file_path, duration, on_progress)
+            elif mode == "streaming":
+                on_interim = None
+                if on_progress:
+                    on_interim = lambda text: on_progress({"provider_status": "streaming",
+                                                           "partial_transcript": text})
+                with self.stage("processing"):
+                    future.set_result(self.transcribe_streaming(audio_file_path, on_interim))
             else:
-                raise TranscriptionError("No transcription results returned")
-                
+                with self.stage("processing"):
+                    future.set_result(self._transcribe_sync(audio_file_path))
+        
+        except EmptyTranscriptError:
+            raise
         except Exception as e:
             self.logger.error(f"Google Speech-to-Text transcription failed: {str(e)}")
             raise TranscriptionError(f"Google Speech-to-Text transcription failed: {str(e)}")
+        
+        return future
+    
+    def select_mode(self, duration: float) -> str:
+        """Pick sync, streaming or long_running recognition for an audio duration."""
+        if self.mode != "auto":
+            return self.mode
+        if duration <= self.sync_max_seconds:
+            return "sync"
+        if duration <= self.streaming_max_seconds:
+            return "streaming"
+        return "long_running"
+    
+    def transcribe_streaming(self, audio_file_path: Path,
+                             on_interim: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Transcribe with streaming recognition.
+        
+        ``on_interim`` is called with the best guess so far (final text plus
+        the current interim hypothesis) whenever Google sends an update.
+        """
+        final_parts = []
+        for is_final, text in self.iter_streaming_results(audio_file_path):
+            if is_final:
+                final_parts.append(text)
+            if on_interim:
+                on_interim(" ".join(final_parts + ([] if is_final else [text])).strip())
+        
+        transcript = " ".join(final_parts).strip()
+        if not transcript:
+            raise EmptyTranscriptError("No transcription results returned")
+        return transcript
+    
+    def iter_streaming_results(self, audio_file_path: Path) -> Iterator[tuple]:
+        """Stream the file to Google and yield ``(is_final, text)`` as results arrive."""
+        streaming_config = self.speech.StreamingRecognitionConfig(
+            config=self._recognition_config(audio_file_path),
+            interim_results=True
+        )
+        requests = (
+            self.speech.StreamingRecognizeRequest(audio_content=chunk)
+            for chunk in self._audio_chunks(audio_file_path)
+        )
+        
+        probe = self.limiter.before_request()
+        recorded = False
+        try:
+            for response in self.client.streaming_recognize(config=streaming_config, requests=requests):
+                for result in response.results:
+                    if result.alternatives:
+                        yield result.is_final, result.alternatives[0].transcript.strip()
+        except Exception as e:
+            recorded = True
+            self._record_error(e, probe)
+            raise
+        else:
+            recorded = True
+            self.limiter.after_request(probe=probe)
+        finally:
+            # The consumer may stop reading early; don't keep the probe slot
+            if probe and not recorded:
+                self.limiter.breaker.release_probe()
+    
+    def get_config(self) -> dict:
+        """Settings that change the transcript output."""
+        return {"language": self.language, "model": self.model}
+    
+    def _transcribe_sync(self, audio_file_path: Path) -> str:
+        """Recognize a short file in a single request."""
+        # Read audio file
+        with open(audio_file_path, "rb") as audio_file:
+            content = audio_file.read()
+        
+        # Configure recognition
+        audio = self.speech.RecognitionAudio(content=content)
+        config = self._recognition_config(audio_file_path)
+        
+        # Perform transcription
+        response = self._call(self.client.recognize, config=config, audio=audio)
+        return self._extract_transcript(response)
+    
+    def _transcribe_long_running(self, audio_file_path: Path, duration: float,
+                                 on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Upload the file to the Cloud Storage bucket, start a long-running
+        operation on it and let the shared poller wait for it.
+        
+        The uploaded object is deleted once the operation finishes or is
+        cancelled; a lifecycle rule on the bucket should expire objects left
+        behind by timeouts or restarts.
+        """
+        if not self.gcs_bucket:
+            raise TranscriptionError(
+                f"Audio over {self.streaming_max_seconds:.0f}s needs GOOGLE_GCS_BUCKET for long-running "
+                f"recognition, or GOOGLE_CHUNK_SECONDS to split it into streamable chunks"
+            )
+        
+        with self.stage("upload"):
+            blob = self.storage_client.bucket(self.gcs_bucket).blob(
+                f"{GCS_PREFIX}{uuid.uuid4().hex}{audio_file_path.suffix}"
+            )
+            blob.upload_from_filename(str(audio_file_path))
+            audio = self.speech.RecognitionAudio(uri=f"gs://{self.gcs_bucket}/{blob.name}")
+            try:
+                operation = self._call(
+                    self.client.long_running_recognize,
+                    config=self._recognition_config(audio_file_path),
+                    audio=audio
+                )
+            except Exception:
+                self._delete_blob(blob)
+                raise
+        clock = self.stage_clock("processing")
+        
+        def cancel():
+            operation.cancel()
+            self._delete_blob(blob)
+        
+        def check():
+            if not operation.done():
+                percent = getattr(getattr(operation, "metadata", None), "progress_percent", None)
+                if on_progress and percent is not None:
+                    on_progress({"provider_status": "running", "progress": percent / 100})
+                return None
+            clock.finish()
+            try:
+                return self._extract_transcript(operation.result())
+            finally:
+                self._delete_blob(blob)
+        
+        return get_poller().watch(
+            check,
+            timeout=max(300, duration * 2),
+            audio_duration=duration,
+            description="Google Speech-to-Text transcription",
+            on_cancel=cancel
+        )
+    
+    def _delete_blob(self, blob):
+        try:
+            blob.delete()
+        except Exception as e:
+            self.logger.warning(f"Failed to delete gs://{self.gcs_bucket}/{blob.name}: {str(e)}")
+    
+    def _call(self, method, **kwargs):
+        """Make one API call through the provider's rate limit and circuit breaker."""
+        probe = self.limiter.before_request()
+        try:
+            response = method(**kwargs)
+        except Exception as e:
+            self._record_error(e, probe)
+            raise
+        except BaseException:
+            if probe:
+                self.limiter.breaker.release_probe()
+            raise
+        self.limiter.after_request(probe=probe)
+        return response
+    
+    def _record_error(self, error: Exception, probe: bool = False):
+        # google.api_core exceptions carry the HTTP status as ``code``
+        code = getattr(error, "code", None)
+        if isinstance(code, int):
+            self.limiter.after_request(status_code=code, probe=probe)
+        else:
+            self.limiter.after_request(error=error, probe=probe)
+    
+    def _extract_transcript(self, response) -> str:
+        """Join the top alternative of every result."""
+        if response.results:
+            # Combine all results
+            transcript_parts = []
+            confidences = []
+            for result in response.results:
+                if result.alternatives:
+                    transcript_parts.append(result.alternatives[0].transcript)
+                    if result.alternatives[0].confidence:
+                        confidences.append(result.alternatives[0].confidence)
+            
+            confidence = sum(confidences) / len(confidences) if confidences else None
+            return Transcript(" ".join(transcript_parts).strip(), confidence)
+        else:
+            raise EmptyTranscriptError("No transcription results returned")
+    
+    def _audio_chunks(self, audio_file_path: Path) -> Iterator[bytes]:
+        """Read the file in fixed-size pieces for streaming requests."""
+        with open(audio_file_path, "rb") as audio_file:
+            while True:
+                chunk = audio_file.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    
+    def _recognition_config(self, audio_file_path: Path):
+        """Build the recognition config matching the file's encoding."""
+        options = {}
+        if is_preprocessed(audio_file_path):
+            # Normalized artifact: 16 kHz mono FLAC
+            options["sample_rate_hertz"] = PREPROCESSED_SAMPLE_RATE
+        
+        return self.speech.RecognitionConfig(
+            encoding=self._detect_audio_encoding(audio_file_path),
+            language_code=self.language,
+            enable_automatic_punctuation=False,  # Raw output as requested
+            model=self.model,  # Better for longer audio
+            use_enhanced=True,  # Use enhanced model if available
+            **options
+        )
     
-    def _detect_audio_encoding(self, audio_file_path: Path) -> speech.RecognitionConfig.AudioEncoding:
+    def _detect_audio_encoding(self, audio_file_path: Path):
         """Detect audio encoding from file extension."""
         extension = audio_file_path.suffix.lower()
+        encodings = self.speech.RecognitionConfig.AudioEncoding
         
         encoding_map = {
-            ".wav": speech.RecognitionConfig.AudioEncoding.LINEAR16,
-            ".flac": speech.RecognitionConfig.AudioEncoding.FLAC,
-            ".mp3": speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-            ".m4a": speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED,
-            ".ogg": speech.RecognitionConfig.AudioEncoding.OGG_OPUS,
+            ".wav": encodings.LINEAR16,
+            ".flac": encodings.FLAC,
+            ".mp3": encodings.ENCODING_UNSPECIFIED,
+            ".m4a": encodings.ENCODING_UNSPECIFIED,
+            ".ogg": encodings.OGG_OPUS,
         }
         
-        return encoding_map.get(extension, speech.RecognitionConfig.AudioEncoding.ENCODING_UNSPECIFIED)
+        return encoding_map.get(extension, encodings.ENCODING_UNSPECIFIED)
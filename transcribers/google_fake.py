@@ -0,0 +1,164 @@
+"""
+Offline stand-in for the Google Speech-to-Text client.
+
+Mirrors the parts of ``google.cloud.speech`` that ``GoogleTranscriber`` uses:
+the request types, ``SpeechClient.recognize``, ``long_running_recognize``
+(returning an operation that finishes after a few polls) and
+``streaming_recognize`` (consuming a request generator and yielding interim
+and final results). Enable it with ``GOOGLE_SPEECH_FAKE=true`` or pass
+``client=FakeSpeechClient()`` to ``GoogleTranscriber`` to exercise every
+recognition mode without credentials or network access. ``FakeStorageClient``
+stands in for the Cloud Storage bucket that long-running recognition reads
+its audio from.
+"""
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Audio accepted per streaming request, as documented for the real service
+STREAM_REQUEST_MAX_BYTES = 25 * 1024
+
+
+class _Message(SimpleNamespace):
+    """Request message accepting keyword arguments, like the proto-plus types."""
+
+
+class RecognitionAudio(_Message):
+    pass
+
+
+class StreamingRecognitionConfig(_Message):
+    pass
+
+
+class StreamingRecognizeRequest(_Message):
+    pass
+
+
+class RecognitionConfig(_Message):
+    class AudioEncoding:
+        ENCODING_UNSPECIFIED = 0
+        LINEAR16 = 1
+        FLAC = 2
+        OGG_OPUS = 6
+
+
+def _response(text: str, is_final: bool = True, stability: float = 1.0, confidence: float = 0.9):
+    alternative = SimpleNamespace(transcript=text, confidence=confidence)
+    result = SimpleNamespace(alternatives=[alternative], is_final=is_final, stability=stability)
+    return SimpleNamespace(results=[result] if text else [])
+
+
+class FakeOperation:
+    """Long-running operation that completes after ``polls_until_done`` checks."""
+
+    def __init__(self, response, polls_until_done: int = 2, error: Exception = None):
+        self._response = response
+        self._polls = max(1, polls_until_done)
+        self._remaining = polls_until_done
+        self._error = error
+        self.metadata = SimpleNamespace(progress_percent=0)
+        self.cancelled = False
+
+    def done(self) -> bool:
+        self._remaining -= 1
+        self.metadata.progress_percent = min(100, int(100 * (self._polls - self._remaining) / self._polls))
+        return self._remaining <= 0
+
+    def cancel(self) -> bool:
+        self.cancelled = True
+        return True
+
+    def result(self, timeout=None):
+        if self._error:
+            raise self._error
+        return self._response
+
+
+class FakeSpeechClient:
+    """In-process fake of ``speech.SpeechClient``."""
+
+    def __init__(self, transcript: str = "labdien šī ir testa transkripcija",
+                 latency: float = 0.0, polls_until_done: int = 2,
+                 interim_every: int = 4, error: Exception = None, confidence: float = 0.9):
+        """
+        Args:
+            transcript: Text returned for every request
+            latency: Seconds each call sleeps, to imitate network time
+            polls_until_done: ``done()`` calls before a long-running operation finishes
+            interim_every: Streaming: emit an interim result every N audio chunks
+            error: Raise this from every call instead of returning a result
+            confidence: Confidence reported for the transcript
+        """
+        self.transcript = transcript
+        self.latency = latency
+        self.polls_until_done = polls_until_done
+        self.interim_every = interim_every
+        self.error = error
+        self.confidence = confidence
+        self.calls = []
+
+    def recognize(self, config, audio):
+        self.calls.append("recognize")
+        self._wait()
+        return _response(self.transcript, confidence=self.confidence)
+
+    def long_running_recognize(self, config, audio):
+        self.calls.append("long_running_recognize")
+        self._wait()
+        return FakeOperation(_response(self.transcript, confidence=self.confidence), self.polls_until_done)
+
+    def streaming_recognize(self, config, requests):
+        self.calls.append("streaming_recognize")
+        words = self.transcript.split()
+        chunks = 0
+        for request in requests:
+            if not getattr(request, "audio_content", None):
+                continue
+            if len(request.audio_content) > STREAM_REQUEST_MAX_BYTES:
+                raise ValueError(f"400 Request audio exceeds {STREAM_REQUEST_MAX_BYTES} bytes")
+            chunks += 1
+            if getattr(config, "interim_results", False) and chunks % self.interim_every == 0:
+                self._wait()
+                heard = words[:min(len(words), chunks // self.interim_every)]
+                yield _response(" ".join(heard), is_final=False, stability=0.5)
+        self._wait()
+        yield _response(self.transcript, confidence=self.confidence)
+
+    def _wait(self):
+        if self.error:
+            raise self.error
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeStorageClient:
+    """In-process fake of ``storage.Client``; ``objects`` maps ``(bucket, name)`` to the size uploaded."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def bucket(self, name: str):
+        return _FakeBucket(self, name)
+
+
+class _FakeBucket:
+    def __init__(self, client: FakeStorageClient, name: str):
+        self.client = client
+        self.name = name
+
+    def blob(self, name: str):
+        return _FakeBlob(self, name)
+
+
+class _FakeBlob:
+    def __init__(self, bucket: _FakeBucket, name: str):
+        self.bucket = bucket
+        self.name = name
+
+    def upload_from_filename(self, filename: str):
+        self.bucket.client.objects[(self.bucket.name, self.name)] = Path(filename).stat().st_size
+
+    def delete(self):
+        self.bucket.client.objects.pop((self.bucket.name, self.name), None)
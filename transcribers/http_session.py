@@ -0,0 +1,81 @@
+"""Pooled HTTP sessions for the remote transcription services."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Defaults for the "http" entry of a model in config.MODELS
+DEFAULT_HTTP_CONFIG = {
+    "pool_size": 10,         # Keep-alive connections kept per host
+    "connect_timeout": 10,   # Seconds to establish a connection
+    "read_timeout": 60,      # Seconds to wait for the server between bytes
+    "retries": 3,            # Transport-level retries for idempotent requests
+    "backoff_factor": 0.5    # Retry delays: 0.5s, 1s, 2s, ...
+}
+
+# Status codes worth retrying; POST uploads are never retried automatically
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Polls and cancellations of jobs the provider already accepted: rate
+# limited, but sent even while the circuit is open
+CIRCUIT_EXEMPT_METHODS = frozenset(["GET", "HEAD", "DELETE"])
+
+
+def get_http_config(model_config: dict) -> dict:
+    """Merge a model's "http" settings over the defaults."""
+    return {**DEFAULT_HTTP_CONFIG, **model_config.get("http", {})}
+
+
+class LimitedSession(requests.Session):
+    """Session that passes every request through a provider's limiter."""
+    
+    def __init__(self, limiter):
+        super().__init__()
+        self.limiter = limiter
+    
+    def request(self, method, url, *args, **kwargs):
+        probe = self.limiter.before_request(check_circuit=method.upper() not in CIRCUIT_EXEMPT_METHODS)
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except requests.RequestException as e:
+            self.limiter.after_request(error=e, probe=probe)
+            raise
+        except BaseException:
+            # Not a provider failure (e.g. a bad argument or an interrupt), but
+            # the probe slot must not stay taken
+            if probe:
+                self.limiter.breaker.release_probe()
+            raise
+        self.limiter.after_request(status_code=response.status_code, probe=probe)
+        return response
+
+
+def create_session(http_config: dict, limiter=None) -> requests.Session:
+    """
+    Create a keep-alive session with a bounded connection pool and retries.
+    
+    The session is safe to share between the threads that run transcriptions
+    for one transcriber instance. With a ``limiter``, requests are rate
+    limited and their outcomes feed the provider's circuit breaker.
+    """
+    retry = Retry(
+        total=http_config["retries"],
+        connect=http_config["retries"],
+        read=http_config["retries"],
+        status=http_config["retries"],
+        backoff_factor=http_config["backoff_factor"],
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "HEAD", "DELETE"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=http_config["pool_size"],
+        pool_maxsize=http_config["pool_size"],
+        max_retries=retry
+    )
+    
+    session = LimitedSession(limiter) if limiter else requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
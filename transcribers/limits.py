@@ -0,0 +1,301 @@
+"""
+Per-provider rate limits, concurrency caps and circuit breakers.
+
+Every remote provider gets one ``ProviderLimiter`` built from the "limits"
+entry of its ``config.MODELS`` settings:
+
+- a token bucket bounding API requests per second (uploads and polls),
+- a cap on transcriptions in flight at the provider at the same time,
+- a circuit breaker that opens when too many recent requests failed with
+  429/5xx or connection errors, so new work fails fast instead of piling
+  onto a struggling provider, and lets a single probe through after a
+  cooldown to find out whether it recovered.
+
+The breaker only gates new work. Status polls and cancellations of jobs the
+provider already accepted are rate limited but always sent, so an outage
+elsewhere doesn't fail jobs that are still running fine.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from . import metrics
+from .base import TranscriptionError
+from config import MODELS
+
+# Defaults for the "limits" entry of a model in config.MODELS
+DEFAULT_LIMITS = {
+    "rate": 0,               # API requests per second, 0 = unlimited
+    "burst": 10,             # Requests allowed back to back
+    "max_in_flight": 0,      # Concurrent transcriptions, 0 = unlimited
+    "queue_timeout": 30,     # Seconds to wait for a free slot or token
+    "breaker": {
+        "error_rate": 0.5,   # Failed fraction of recent requests that opens the circuit
+        "min_requests": 10,  # Requests in the window before the rate is trusted
+        "window": 60,        # Seconds of history considered
+        "cooldown": 30       # Seconds the circuit stays open before a probe
+    }
+}
+
+# HTTP statuses that count against a provider's health
+FAILURE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class ProviderUnavailableError(TranscriptionError):
+    """The provider is rate limited, at capacity or its circuit is open."""
+    pass
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``burst`` stored."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, waiting up to ``timeout`` seconds for it."""
+        if not self.rate:
+            return True
+
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def available(self) -> float:
+        if not self.rate:
+            return float("inf")
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker with closed, open and half-open states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, error_rate: float = 0.5, min_requests: int = 10,
+                 window: float = 60, cooldown: float = 30):
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. In half-open state only one probe is let through."""
+        return self.admit()[0]
+
+    def admit(self) -> tuple:
+        """``(allowed, probe)``: like ``allow()``, and whether the request is the half-open probe."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True, False
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True, True
+            return False, False
+
+    def record(self, succeeded: bool, probe: bool = False):
+        """
+        Record the outcome of a request.
+
+        While half-open only the probe (``probe=True``) decides whether the
+        circuit closes again; other requests, e.g. polls of running jobs, are
+        ignored.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state()
+            if state == self.HALF_OPEN:
+                if not probe:
+                    return
+                self._probing = False
+                if succeeded:
+                    self._state = self.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip(now)
+                return
+
+            self._outcomes.append((now, succeeded))
+            self._expire(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if state == self.CLOSED and len(self._outcomes) >= self.min_requests and \
+                    failures / len(self._outcomes) >= self.error_rate:
+                self._trip(now)
+
+    def release_probe(self):
+        """Give back a probe slot that wasn't used for a request."""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            total = len(self._outcomes)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            return {
+                "state": self._current_state(),
+                "requests": total,
+                "error_rate": round(failures / total, 3) if total else 0.0
+            }
+
+    def _current_state(self) -> str:
+        """State with the cooldown applied. Caller must hold the lock."""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._state = self.HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def _trip(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def _expire(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+
+class ProviderLimiter:
+    """Rate limit, in-flight cap and circuit breaker of one provider."""
+
+    def __init__(self, name: str, limits: Optional[dict] = None, provider: Optional[str] = None):
+        limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.name = name
+        self.provider = provider or name.lower()
+        self.queue_timeout = limits["queue_timeout"]
+        self.max_in_flight = limits["max_in_flight"]
+        self.bucket = TokenBucket(limits["rate"], limits["burst"])
+        self.breaker = CircuitBreaker(**{**DEFAULT_LIMITS["breaker"], **limits.get("breaker", {})})
+
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def admit(self) -> None:
+        """
+        Reserve an in-flight slot for one transcription.
+
+        Raises ProviderUnavailableError straight away if the circuit is open,
+        or after ``queue_timeout`` if every slot stays taken. Call
+        ``release()`` when the transcription finishes.
+        """
+        if self.breaker.state == CircuitBreaker.OPEN:
+            raise ProviderUnavailableError(f"{self.name} is unavailable (circuit open)")
+
+        with self._condition:
+            if self.max_in_flight:
+                has_slot = self._condition.wait_for(
+                    lambda: self._in_flight < self.max_in_flight, self.queue_timeout
+                )
+                if not has_slot:
+                    raise ProviderUnavailableError(
+                        f"{self.name} is at capacity ({self.max_in_flight} transcriptions in flight)"
+                    )
+            self._in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def before_request(self, check_circuit: bool = True) -> bool:
+        """
+        Gate one API request: circuit breaker first, then the rate limit.
+
+        With ``check_circuit`` False (polls and cancellations of accepted
+        jobs) only the rate limit applies. Returns whether the request is the
+        circuit's half-open probe; pass that on to ``after_request()``, or
+        call ``breaker.release_probe()`` if the request is given up.
+        """
+        if not check_circuit:
+            if not self.bucket.acquire(self.queue_timeout):
+                raise ProviderUnavailableError(f"{self.name} rate limit exceeded")
+            return False
+
+        allowed, probe = self.breaker.admit()
+        if not allowed:
+            raise ProviderUnavailableError(f"{self.name} is unavailable (circuit open)")
+        if not self.bucket.acquire(self.queue_timeout):
+            # Not the provider's fault: don't count it, just free the probe slot
+            if probe:
+                self.breaker.release_probe()
+            raise ProviderUnavailableError(f"{self.name} rate limit exceeded")
+        return probe
+
+    def after_request(self, status_code: Optional[int] = None, error: Optional[Exception] = None,
+                      probe: bool = False):
+        """Record how a request went; 429/5xx and connection errors count as failures."""
+        self.breaker.record(error is None and status_code not in FAILURE_STATUS_CODES, probe=probe)
+        status = str(status_code) if status_code else ("error" if error is not None else "ok")
+        metrics.API_REQUESTS.inc(provider=self.provider, status=status)
+
+    @property
+    def status(self) -> str:
+        """``available``, ``degraded`` (probing after an outage) or ``unavailable``."""
+        return {
+            CircuitBreaker.CLOSED: "available",
+            CircuitBreaker.HALF_OPEN: "degraded",
+            CircuitBreaker.OPEN: "unavailable"
+        }[self.breaker.state]
+
+    def stats(self) -> dict:
+        with self._condition:
+            in_flight = self._in_flight
+        tokens = self.bucket.available()
+        return {
+            "status": self.status,
+            "circuit": self.breaker.stats(),
+            "in_flight": in_flight,
+            "max_in_flight": self.max_in_flight or None,
+            "rate_limit": self.bucket.rate or None,
+            "tokens_available": None if tokens == float("inf") else round(tokens, 2)
+        }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model_id: str) -> ProviderLimiter:
+    """Return the process-wide limiter of a provider, built from ``config.MODELS``."""
+    with _limiters_lock:
+        if model_id not in _limiters:
+            model_config = MODELS.get(model_id, {})
+            _limiters[model_id] = ProviderLimiter(model_config.get("name", model_id),
+                                                  model_config.get("limits"), provider=model_id)
+        return _limiters[model_id]
@@ -0,0 +1,377 @@
+"""
+Process-wide transcription metrics in the Prometheus text format.
+
+A small, dependency-free implementation of counters, gauges and histograms
+with labels, rendered by ``render()`` for the ``/metrics`` endpoint.
+Transcribers report through ``BaseTranscriber.stage()`` and
+``record_transcription()``, so every provider is measured the same way.
+
+Stages (``transcription_stage_seconds``):
+
+- ``admission``: waiting for a free in-flight slot of the provider
+- ``preprocess``: decoding the upload to 16 kHz mono FLAC
+- ``upload``: sending the audio and creating the provider job
+- ``queue``: job accepted but not yet started at the provider
+- ``processing``: provider working on the job (we are polling or streaming)
+- ``download``: fetching the finished transcript
+- ``batch_wait``: local clip waiting for a batched decode to start
+- ``inference``: local model decoding
+
+Values live in the memory of each process. With several server workers,
+``start_multiprocess()`` makes every worker write its values to
+``{pid}.json`` in a shared directory every few seconds, and ``render()``
+adds up all files, so a scrape covers the whole server whichever worker
+answers it. Counters of exited workers keep counting towards the totals;
+gauges only count live processes.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+from .processes import process_alive
+from config import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a short clip decoded locally up to a long remote job
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Processing time / audio duration
+REALTIME_FACTOR_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labelnames, labelvalues, extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(labelnames, labelvalues)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def current(self) -> dict:
+        """Copy of this process's values: ``{label values tuple: value}``."""
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def add(total, value):
+        """Combine the values of one series from two processes."""
+        return total + value
+
+    def render(self, values: dict) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is computed when scraped."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames=(),
+                 collect: Optional[Callable[[Callable], dict]] = None):
+        """
+        ``collect(values)`` returns ``{label values tuple: value}`` at every
+        scrape; ``values(metric)`` gives another metric's values for that
+        scrape (added up over the worker processes in multiprocess mode).
+        """
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    def current(self) -> dict:
+        with self._lock:
+            return {key: dict(series, buckets=list(series["buckets"]))
+                    for key, series in self._values.items()}
+
+    @staticmethod
+    def add(total, value):
+        return {
+            "buckets": [a + b for a, b in zip(total["buckets"], value["buckets"])],
+            "sum": total["sum"] + value["sum"],
+            "count": total["count"] + value["count"]
+        }
+
+    def render(self, values: dict) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["buckets"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+            lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class StageClock:
+    """
+    Times consecutive stages of one transcription, e.g. queue -> processing -> download.
+
+    ``enter()`` closes the current stage and starts the next one; entering the
+    stage that is already running does nothing.
+    """
+
+    def __init__(self, provider: str, stage: str):
+        self.provider = provider
+        self.stage = stage
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enter(self, stage: str):
+        with self._lock:
+            if stage == self.stage:
+                return
+            now = time.perf_counter()
+            if self.stage is not None:
+                STAGE_SECONDS.observe(now - self.started, provider=self.provider, stage=self.stage)
+            self.stage = stage
+            self.started = now
+
+    def finish(self):
+        self.enter(None)
+
+
+REGISTRY = []
+
+TRANSCRIPTIONS = Counter(
+    "transcriptions_total",
+    "Finished transcriptions by provider and status (success, error, cancelled)",
+    ["provider", "status"]
+)
+TRANSCRIPTION_SECONDS = Histogram(
+    "transcription_duration_seconds",
+    "Wall-clock time of a transcription from start to result",
+    ["provider"]
+)
+STAGE_SECONDS = Histogram(
+    "transcription_stage_seconds",
+    "Time spent in each stage of a transcription",
+    ["provider", "stage"]
+)
+REALTIME_FACTOR = Histogram(
+    "transcription_realtime_factor",
+    "Processing time divided by audio duration (below 1 is faster than real time)",
+    ["provider"],
+    buckets=REALTIME_FACTOR_BUCKETS
+)
+AUDIO_SECONDS = Counter(
+    "transcription_audio_seconds_total",
+    "Seconds of audio transcribed",
+    ["provider"]
+)
+CACHE_LOOKUPS = Counter(
+    "transcription_cache_lookups_total",
+    "Result cache lookups by outcome (hit, miss)",
+    ["provider", "result"]
+)
+API_REQUESTS = Counter(
+    "provider_api_requests_total",
+    "HTTP/RPC requests sent to providers by response status (error = no response)",
+    ["provider", "status"]
+)
+IN_FLIGHT = Gauge(
+    "transcriptions_in_flight",
+    "Transcriptions started and not yet finished",
+    ["provider"]
+)
+
+
+def _cache_hit_ratio(values) -> dict:
+    lookups = values(CACHE_LOOKUPS)
+    ratios = {}
+    for provider in {key[0] for key in lookups}:
+        hits = lookups.get((provider, "hit"), 0)
+        total = hits + lookups.get((provider, "miss"), 0)
+        ratios[(provider,)] = hits / total if total else 0.0
+    return ratios
+
+
+CACHE_HIT_RATIO = Gauge(
+    "transcription_cache_hit_ratio",
+    "Share of result cache lookups that were hits since the server started",
+    ["provider"],
+    collect=_cache_hit_ratio
+)
+
+
+@contextmanager
+def timed_stage(provider: str, stage: str):
+    """Observe the time spent in the ``with`` block as one stage (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, provider=provider, stage=stage)
+
+
+# Directory shared by the worker processes, once start_multiprocess() ran
+_multiproc_dir = None
+
+
+def start_multiprocess(directory: str = None, flush_seconds: float = None) -> bool:
+    """
+    Share metrics with the other worker processes through ``directory``
+    (default ``METRICS["multiproc_dir"]``). Call in every worker after it
+    is forked; returns False if no directory is configured.
+    """
+    global _multiproc_dir
+    directory = directory or METRICS["multiproc_dir"]
+    if not directory:
+        return False
+
+    _multiproc_dir = Path(directory)
+    _multiproc_dir.mkdir(parents=True, exist_ok=True)
+    interval = flush_seconds or METRICS["flush_seconds"]
+
+    def flush_periodically():
+        while True:
+            time.sleep(interval)
+            try:
+                flush()
+            except OSError as e:
+                logger.warning(f"Failed to write metrics: {e}")
+
+    flush()
+    threading.Thread(target=flush_periodically, name="metrics-flush", daemon=True).start()
+    return True
+
+
+def flush():
+    """Write this process's values to its file in the multiprocess directory."""
+    if _multiproc_dir is None:
+        return
+    snapshot = {
+        metric.name: [[list(key), value] for key, value in metric.current().items()]
+        for metric in REGISTRY
+    }
+    path = _multiproc_dir / f"{os.getpid()}.json"
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _aggregate() -> dict:
+    """Values of every metric added up over the files of all worker processes."""
+    metrics = {metric.name: metric for metric in REGISTRY}
+    totals = {name: {} for name in metrics}
+    for path in _multiproc_dir.glob("*.json"):
+        try:
+            pid = int(path.stem)
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = process_alive(pid)
+
+        for name, items in snapshot.items():
+            metric = metrics.get(name)
+            if metric is None or (metric.kind == "gauge" and not alive):
+                continue
+            values = totals[name]
+            for key, value in items:
+                key = tuple(key)
+                values[key] = metric.add(values[key], value) if key in values else value
+    return totals
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    if _multiproc_dir is None:
+        current = {metric.name: metric.current() for metric in REGISTRY}
+    else:
+        flush()
+        current = _aggregate()
+
+    lines = []
+    for metric in REGISTRY:
+        values = current[metric.name]
+        if isinstance(metric, Gauge) and metric.collect:
+            values = metric.collect(lambda other: current[other.name])
+        lines.extend(metric.render(values))
+    return "\n".join(lines) + "\n"
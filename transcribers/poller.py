@@ -0,0 +1,205 @@
+"""
+Shared poller for remote transcription jobs.
+
+Remote providers (Speechmatics, AssemblyAI) accept a job and then have to be
+polled until it finishes. Instead of every transcription sleeping in its own
+thread, jobs are registered with one process-wide poller: a single scheduler
+thread keeps a heap of next-poll times and hands due polls to a small worker
+pool. Poll intervals back off exponentially with jitter and are scaled to the
+audio duration, so short clips are picked up quickly and long recordings
+aren't polled needlessly. Callers get a ``concurrent.futures.Future`` back.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from .base import TranscriptionError
+from config import POLLER
+
+logger = logging.getLogger("transcriber.poller")
+
+
+class _PollTask:
+    """State of one remote job being polled."""
+
+    def __init__(self, check, future, description, timeout, delay, max_delay):
+        self.check = check
+        self.future = future
+        self.description = description
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self.delay = delay
+        self.max_delay = max_delay
+        self.polls = 0
+
+
+class JobPoller:
+    """Polls outstanding remote jobs from one scheduler thread."""
+
+    def __init__(self, workers: int = 4, min_interval: float = 1.0, max_interval: float = 30.0,
+                 backoff: float = 1.5, jitter: float = 0.2,
+                 initial_fraction: float = 0.1, interval_fraction: float = 0.25):
+        """
+        Args:
+            workers: Threads that run status requests
+            min_interval: Shortest delay between two polls of a job (seconds)
+            max_interval: Longest delay between two polls of a job (seconds)
+            backoff: Factor the delay grows by after every unfinished poll
+            jitter: Random +/- fraction applied to every delay
+            initial_fraction: First poll happens after this fraction of the
+                audio duration
+            interval_fraction: Delays are capped at this fraction of the audio
+                duration
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.initial_fraction = initial_fraction
+        self.interval_fraction = interval_fraction
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poller")
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._in_flight = 0
+
+    def watch(self, check: Callable[[], Optional[object]], timeout: float = 300,
+              audio_duration: Optional[float] = None, description: str = "Transcription",
+              on_cancel: Optional[Callable[[], None]] = None) -> Future:
+        """
+        Start polling a remote job.
+
+        Args:
+            check: Called on every poll. Returns None while the job is still
+                running and the final result once it is done; raises to fail it.
+            timeout: Seconds before the job is given up
+            audio_duration: Audio length in seconds, used to scale intervals
+            description: Prefix for error messages, e.g. "AssemblyAI transcription"
+            on_cancel: Called if the returned future is cancelled
+
+        Returns:
+            Future resolved with the value returned by ``check``
+        """
+        future = Future()
+        delay, max_delay = self._intervals(audio_duration)
+        task = _PollTask(check, future, description, timeout, delay, max_delay)
+
+        if on_cancel:
+            future.add_done_callback(
+                lambda f: f.cancelled() and self._executor.submit(self._cancel, task, on_cancel)
+            )
+
+        with self._condition:
+            self._in_flight += 1
+        future.add_done_callback(self._job_finished)
+
+        self._schedule(task, delay)
+        return future
+
+    def pending(self) -> int:
+        """Number of jobs still being polled."""
+        with self._condition:
+            return self._in_flight
+
+    def _intervals(self, audio_duration: Optional[float]):
+        """Return the first poll delay and the delay cap for a job."""
+        if not audio_duration:
+            return self.min_interval, self.max_interval
+
+        first = audio_duration * self.initial_fraction
+        cap = audio_duration * self.interval_fraction
+        first = min(max(first, self.min_interval), self.max_interval)
+        cap = min(max(cap, self.min_interval), self.max_interval)
+        return first, cap
+
+    def _schedule(self, task: _PollTask, delay: float):
+        """Queue the next poll of a task after ``delay`` seconds (with jitter)."""
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        due = min(time.monotonic() + delay, task.deadline)
+
+        with self._condition:
+            heapq.heappush(self._heap, (due, next(self._counter), task))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="poller-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        """Scheduler loop: wait for the next due poll and dispatch it."""
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+
+                due, _, task = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+
+            self._executor.submit(self._poll, task)
+
+    def _poll(self, task: _PollTask):
+        """Run one status check and either resolve the future or reschedule."""
+        if task.future.done():
+            return
+
+        if time.monotonic() >= task.deadline:
+            self._fail(task, TranscriptionError(f"Transcription timed out after {task.timeout} seconds"))
+            return
+
+        task.polls += 1
+        try:
+            value = task.check()
+        except Exception as e:
+            self._fail(task, e)
+            return
+
+        if value is None:
+            task.delay = min(task.delay * self.backoff, task.max_delay)
+            self._schedule(task, task.delay)
+            return
+
+        if task.future.set_running_or_notify_cancel():
+            logger.debug(f"{task.description} finished after {task.polls} polls")
+            task.future.set_result(value)
+
+    def _fail(self, task: _PollTask, error: Exception):
+        logger.error(f"{task.description} failed: {error}")
+        if task.future.set_running_or_notify_cancel():
+            # Keep the type (e.g. EmptyTranscriptError) so callers can tell failures apart
+            error_type = type(error) if isinstance(error, TranscriptionError) else TranscriptionError
+            task.future.set_exception(error_type(f"{task.description} failed: {error}"))
+
+    def _cancel(self, task: _PollTask, on_cancel: Callable[[], None]):
+        try:
+            on_cancel()
+        except Exception as e:
+            logger.warning(f"Failed to cancel {task.description}: {e}")
+
+    def _job_finished(self, future: Future):
+        with self._condition:
+            self._in_flight -= 1
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller() -> JobPoller:
+    """Return the process-wide poller, creating it on first use."""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = JobPoller(**POLLER)
+        return _poller
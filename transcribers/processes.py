@@ -0,0 +1,67 @@
+"""
+Identity and liveness of processes, for state shared between server workers.
+
+Job and batch files record the worker process that runs them, and metric
+files the process that wrote them; both use ``process_alive()`` to tell a
+live owner from one that exited.
+
+A PID alone doesn't identify a process: PIDs are reused, and in a container
+a replacement worker often gets the PID of the one that crashed. Owners are
+therefore recorded with a token, the process's start time (and the boot ID)
+read from ``/proc``. Where ``/proc`` isn't available the token is None and
+only the PID is checked.
+"""
+
+import os
+from typing import Optional
+
+# (pid, token) of this process; recomputed after a fork
+_current = None
+
+
+def process_token(pid: int) -> Optional[str]:
+    """Start time of a process since boot, prefixed with the boot ID; None if unknown."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name (field 2) may contain spaces and parentheses; the
+    # fields after its closing parenthesis are fixed, starttime is field 22
+    start_ticks = stat.rsplit(b")", 1)[1].split()[19].decode()
+    try:
+        with open("/proc/sys/kernel/random/boot_id", "r") as f:
+            return f"{f.read().strip()}:{start_ticks}"
+    except OSError:
+        return start_ticks
+
+
+def current_process() -> tuple:
+    """``(pid, token)`` of the current process."""
+    global _current
+    pid = os.getpid()
+    if _current is None or _current[0] != pid:
+        _current = (pid, process_token(pid))
+    return _current
+
+
+def process_alive(pid: int, token: Optional[str] = None) -> bool:
+    """
+    Whether the process with this ID (and, if given, this token) is running.
+
+    Other processes can only be checked on POSIX; elsewhere (a single
+    development server) only the current process counts as running.
+    """
+    if pid == os.getpid():
+        return token is None or token == current_process()[1]
+    if pid <= 0 or os.name != "posix":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        pass
+    # A different token: the PID was reused by a newer process
+    return token is None or process_token(pid) == token
@@ -0,0 +1,63 @@
+"""
+Registry of transcription providers.
+
+Providers are listed by import path and only imported when they are
+enabled in ``config.MODELS`` and created, so a disabled provider never
+loads its SDK. Heavy ML libraries (torch, whisper) are deferred further,
+until the model is first loaded.
+"""
+
+import importlib
+import threading
+
+from config import MODELS
+
+# model_id -> "module:ClassName", relative to this package
+PROVIDERS = {
+    "speechmatics": ".speechmatics:SpeechmaticsTranscriber",
+    "google": ".google:GoogleTranscriber",
+    "whisper": ".whisper:WhisperTranscriber",
+    "assemblyai": ".assemblyai:AssemblyAITranscriber",
+}
+
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+def register_provider(model_id: str, target: str):
+    """Add or replace a provider, given as ``"package.module:ClassName"``."""
+    with _classes_lock:
+        PROVIDERS[model_id] = target
+        _classes.pop(model_id, None)
+
+
+def is_enabled(model_id: str) -> bool:
+    """Whether a provider is switched on in ``config.MODELS``."""
+    return MODELS.get(model_id, {}).get("enabled", True)
+
+
+def enabled_providers() -> list:
+    """IDs of registered providers that are enabled, in registry order."""
+    return [model_id for model_id in PROVIDERS if is_enabled(model_id)]
+
+
+def get_transcriber_class(model_id: str):
+    """Import a provider's module on first use and return its transcriber class."""
+    with _classes_lock:
+        if model_id in _classes:
+            return _classes[model_id]
+
+        if model_id not in PROVIDERS:
+            raise KeyError(f"Unknown transcriber: {model_id}")
+
+        module_name, class_name = PROVIDERS[model_id].split(":")
+        module = importlib.import_module(module_name, package=__package__)
+        _classes[model_id] = getattr(module, class_name)
+        return _classes[model_id]
+
+
+def create_transcriber(model_id: str, **kwargs):
+    """Instantiate a provider's transcriber."""
+    transcriber = get_transcriber_class(model_id)(**kwargs)
+    transcriber.provider = model_id
+    return transcriber
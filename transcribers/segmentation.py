@@ -0,0 +1,322 @@
+"""
+Split long recordings on silence and transcribe the pieces in parallel.
+
+Audio is decoded by ffmpeg to 16 kHz mono PCM and read as a stream of 30 ms
+frames, so memory stays bounded by one chunk no matter how long the file is.
+A voice-activity detector (webrtcvad when installed, otherwise an adaptive
+energy threshold) marks silent frames; chunks are cut at the last pause
+before ``max_chunk_seconds``. When no pause is found the chunk is cut hard
+and the next one starts ``overlap_seconds`` earlier; the duplicated words
+are removed again when the transcripts are stitched together.
+"""
+
+import logging
+import math
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .audio import get_audio_duration
+from .base import EmptyTranscriptError, TranscriptionError
+from config import SEGMENTATION
+
+logger = logging.getLogger("transcriber.segmentation")
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit PCM
+FRAME_MS = 30
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * SAMPLE_WIDTH
+
+# Longest run of words compared when removing duplicates at a chunk boundary
+MAX_OVERLAP_WORDS = 12
+
+
+@dataclass
+class AudioChunk:
+    """A piece of a recording written to its own WAV file."""
+    index: int
+    path: Path
+    start: float
+    end: float
+    overlap: float = 0.0  # Seconds shared with the previous chunk
+
+
+class EnergyVAD:
+    """Fallback voice-activity detector using an adaptive energy threshold."""
+
+    def __init__(self, threshold_db: float = 12.0, floor_db: float = -55.0):
+        self.threshold_db = threshold_db
+        self.floor_db = floor_db
+        self.noise_db = None
+
+    def is_speech(self, frame: bytes, sample_rate: int) -> bool:
+        import numpy as np
+
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        rms = math.sqrt(float(np.mean(samples * samples))) if len(samples) else 0.0
+        level_db = 20 * math.log10(max(rms, 1.0) / 32768)
+
+        # Track the noise floor: follow drops immediately, and only drift up
+        # during non-speech frames so long stretches of speech don't raise it
+        if self.noise_db is None or level_db < self.noise_db:
+            self.noise_db = level_db
+
+        speech = level_db > max(self.noise_db + self.threshold_db, self.floor_db)
+        if not speech:
+            self.noise_db += 0.05 * (level_db - self.noise_db)
+        return speech
+
+
+def create_vad(aggressiveness: int = 2):
+    """Return a webrtcvad detector if available, otherwise the energy detector."""
+    try:
+        import webrtcvad
+        return webrtcvad.Vad(aggressiveness)
+    except ImportError:
+        return EnergyVAD()
+
+
+def decode_frames(audio_file_path: Path) -> Iterator[bytes]:
+    """Decode any ffmpeg-readable file to 16 kHz mono PCM, one 30 ms frame at a time."""
+    if shutil.which("ffmpeg") is None:
+        raise TranscriptionError("ffmpeg is required to split long audio files")
+
+    process = subprocess.Popen(
+        ["ffmpeg", "-nostdin", "-loglevel", "error", "-i", str(audio_file_path),
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    try:
+        while True:
+            frame = process.stdout.read(FRAME_BYTES)
+            if len(frame) < FRAME_BYTES:
+                if frame:
+                    # Pad the last partial frame with silence
+                    yield frame + b"\0" * (FRAME_BYTES - len(frame))
+                break
+            yield frame
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", "replace")
+        process.stderr.close()
+        if process.wait() != 0:
+            raise TranscriptionError(f"Failed to decode audio: {stderr.strip()}")
+
+
+def _write_wav(path: Path, pcm: bytes):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+
+
+def segment_audio(audio_file_path: Path, output_dir: Path,
+                  max_chunk_seconds: float = 30.0, min_silence_ms: int = 300,
+                  overlap_seconds: float = 1.0, vad=None) -> Iterator[AudioChunk]:
+    """
+    Split a recording into WAV chunks of at most ``max_chunk_seconds``.
+
+    Chunks are yielded as soon as they are written. Chunks without any
+    detected speech are skipped.
+    """
+    vad = vad or create_vad(SEGMENTATION["vad_aggressiveness"])
+    max_frames = int(max_chunk_seconds * 1000 / FRAME_MS)
+    min_chunk_frames = max_frames // 2
+    silence_frames_needed = max(1, min_silence_ms // FRAME_MS)
+    overlap_frames = int(overlap_seconds * 1000 / FRAME_MS)
+
+    frames = []          # PCM frames of the current chunk
+    speech_flags = []    # VAD decision per frame
+    chunk_start = 0      # Frame offset of the current chunk in the file
+    chunk_overlap = 0    # Frames shared with the previous chunk
+    last_pause = None    # Frame index (within chunk) in the middle of the latest pause
+    silence_run = 0
+    index = 0
+
+    def emit(cut, overlap_next):
+        nonlocal frames, speech_flags, chunk_start, chunk_overlap, last_pause, silence_run, index
+        chunk = None
+        if any(speech_flags[:cut]):
+            path = output_dir / f"chunk_{index:05d}.wav"
+            _write_wav(path, b"".join(frames[:cut]))
+            chunk = AudioChunk(
+                index=index,
+                path=path,
+                start=chunk_start * FRAME_MS / 1000,
+                end=(chunk_start + cut) * FRAME_MS / 1000,
+                overlap=chunk_overlap * FRAME_MS / 1000
+            )
+            index += 1
+
+        keep_from = max(cut - overlap_next, 0)
+        frames = frames[keep_from:]
+        speech_flags = speech_flags[keep_from:]
+        chunk_start += keep_from
+        chunk_overlap = cut - keep_from
+        last_pause = None
+        silence_run = 0
+        return chunk
+
+    for frame in decode_frames(audio_file_path):
+        try:
+            speech = vad.is_speech(frame, SAMPLE_RATE)
+        except Exception:
+            speech = True
+
+        frames.append(frame)
+        speech_flags.append(speech)
+
+        silence_run = 0 if speech else silence_run + 1
+        if silence_run >= silence_frames_needed:
+            # Remember the middle of the pause as a cut point
+            last_pause = len(frames) - silence_run // 2
+
+        if len(frames) >= max_frames:
+            if last_pause is not None and last_pause >= min_chunk_frames:
+                chunk = emit(last_pause, 0)
+            else:
+                chunk = emit(len(frames), overlap_frames)
+            if chunk:
+                yield chunk
+
+    if frames:
+        chunk = emit(len(frames), 0)
+        if chunk:
+            yield chunk
+
+
+def merge_transcripts(parts) -> str:
+    """Join chunk transcripts in order, dropping words repeated across an overlap."""
+    words = []
+    for text, overlap in parts:
+        next_words = text.split()
+        if overlap and words and next_words:
+            limit = min(MAX_OVERLAP_WORDS, len(words), len(next_words))
+            for size in range(limit, 0, -1):
+                tail = [w.lower().strip(".,!?") for w in words[-size:]]
+                head = [w.lower().strip(".,!?") for w in next_words[:size]]
+                if tail == head:
+                    next_words = next_words[size:]
+                    break
+        words.extend(next_words)
+    return " ".join(words)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_chunk_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all chunked transcriptions."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=SEGMENTATION["workers"], thread_name_prefix="chunk")
+        return _executor
+
+
+def transcribe_in_chunks(transcriber, audio_file_path: Path, max_chunk_seconds: float,
+                         max_parallel: Optional[int] = None,
+                         on_progress: Optional[Callable[[dict], None]] = None) -> str:
+    """
+    Transcribe a long recording chunk by chunk and stitch the text in order.
+
+    Chunks are submitted while the file is still being segmented, with at
+    most ``max_parallel`` chunks in flight, so only a bounded number of chunk
+    files exist at any time. For transcribers with ``transcribe_async`` a
+    chunk thread only starts the work (e.g. the upload) and the chunk's
+    future then follows the returned one, so waiting on the provider doesn't
+    hold a thread. ``on_progress`` is called with the fraction of audio
+    transcribed as chunks finish.
+    """
+    executor = get_chunk_executor()
+    max_parallel = max_parallel or SEGMENTATION["workers"]
+    output_dir = Path(tempfile.mkdtemp(prefix="chunks_"))
+
+    def start(chunk: AudioChunk, result: Future):
+        if not result.set_running_or_notify_cancel():
+            return
+        try:
+            if hasattr(transcriber, "transcribe_async"):
+                transcriber.transcribe_async(chunk.path).add_done_callback(lambda f: _copy_outcome(f, result))
+            else:
+                result.set_result(transcriber.transcribe(chunk.path))
+        except Exception as e:
+            result.set_exception(e)
+
+    total_seconds = get_audio_duration(audio_file_path) if on_progress else 0
+    progress = {"seconds": 0.0, "chunks": 0}
+    progress_lock = threading.Lock()
+
+    def report(chunk: AudioChunk):
+        with progress_lock:
+            progress["seconds"] += chunk.end - chunk.start - chunk.overlap
+            progress["chunks"] += 1
+            fraction = min(1.0, progress["seconds"] / total_seconds) if total_seconds else None
+            chunks_done = progress["chunks"]
+        on_progress({"progress": fraction, "chunks_done": chunks_done})
+
+    def done(chunk: AudioChunk, future: Future):
+        # Chunk files are removed as soon as they are transcribed
+        chunk.path.unlink(missing_ok=True)
+        if on_progress and not future.cancelled() and future.exception() is None:
+            report(chunk)
+
+    def submit(chunk: AudioChunk) -> Future:
+        future = Future()
+        future.add_done_callback(lambda f: done(chunk, f))
+        executor.submit(start, chunk, future)
+        return future
+
+    pending = []
+    parts = []
+    try:
+        for chunk in segment_audio(
+            audio_file_path, output_dir,
+            max_chunk_seconds=max_chunk_seconds,
+            min_silence_ms=SEGMENTATION["min_silence_ms"],
+            overlap_seconds=SEGMENTATION["overlap_seconds"]
+        ):
+            pending.append((chunk, submit(chunk)))
+            if len([f for _, f in pending if not f.done()]) >= max_parallel:
+                # Wait for the oldest chunk before reading further
+                chunk_done, future = pending[0]
+                parts.append((_chunk_text(chunk_done, future), chunk_done.overlap))
+                pending.pop(0)
+
+        for chunk, future in pending:
+            parts.append((_chunk_text(chunk, future), chunk.overlap))
+    finally:
+        for _, future in pending:
+            future.cancel()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    logger.info(f"Transcribed {audio_file_path.name} in {len(parts)} chunks")
+    return merge_transcripts(parts)
+
+
+def _copy_outcome(source: Future, target: Future):
+    """Resolve ``target`` (already running) the way ``source`` finished."""
+    if source.cancelled():
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def _chunk_text(chunk: AudioChunk, future: Future) -> str:
+    try:
+        return future.result()
+    except EmptyTranscriptError:
+        # A chunk with no speech the provider could recognise shouldn't fail the file
+        logger.warning(f"Chunk {chunk.index} ({chunk.start:.1f}-{chunk.end:.1f}s) returned no text")
+        return ""
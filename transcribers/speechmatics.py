@@ -1,12 +1,15 @@
 """Speechmatics transcription service."""
 
 import json
-import time
-import requests
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from .base import BaseTranscriber, TranscriptionError
+from .audio import get_audio_duration
+from .base import BaseTranscriber, EmptyTranscriptError, TranscriptionError
+from .http_session import create_session, get_http_config
+from .limits import get_limiter
+from .poller import get_poller
 from config import MODELS
 
 
@@ -16,40 +19,57 @@ class SpeechmaticsTranscriber(BaseTranscriber):
     def __init__(self, api_key: Optional[str] = None):
         super().__init__(
             name=MODELS["speechmatics"]["name"],
-            language=MODELS["speechmatics"]["language"]
+            language=MODELS["speechmatics"]["language"],
+            chunk_seconds=MODELS["speechmatics"].get("chunk_seconds")
         )
         
         self.api_key = api_key or MODELS["speechmatics"]["api_key"]
         if not self.api_key:
             raise ValueError("Speechmatics API key is required")
         
-        self.base_url = "https://asr.api.speechmatics.com/v2"
+        self.operating_point = MODELS["speechmatics"]["operating_point"]
+        self.base_url = MODELS["speechmatics"]["base_url"].rstrip("/")
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # One keep-alive connection pool for the lifetime of this transcriber
+        http_config = get_http_config(MODELS["speechmatics"])
+        self.session = create_session(http_config, get_limiter("speechmatics"))
+        self.request_timeout = (http_config["connect_timeout"], http_config["read_timeout"])
     
     def transcribe(self, audio_file_path: Path) -> str:
         """Transcribe audio using Speechmatics API."""
+        return self.transcribe_async(audio_file_path).result()
+    
+    def transcribe_async(self, audio_file_path: Path,
+                         on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Upload the file and return a future for the finished transcript.
+        
+        The upload happens in the calling thread; the job is then polled by
+        the shared poller, so no thread waits on it. ``on_progress`` receives
+        the job status reported at each poll.
+        """
         if not self.validate_audio_file(audio_file_path):
             raise TranscriptionError(f"Invalid audio file: {audio_file_path}")
         
         try:
             # Upload the file
-            job_id = self._upload_file(audio_file_path)
-            
-            # Wait for transcription to complete
-            result = self._wait_for_completion(job_id)
-            
-            # Extract text
-            if result and "transcript" in result:
-                return result["transcript"]
-            else:
-                raise TranscriptionError("No transcript found in response")
-                
+            with self.stage("upload"):
+                job_id = self._upload_file(audio_file_path)
         except Exception as e:
             self.logger.error(f"Speechmatics transcription failed: {str(e)}")
             raise TranscriptionError(f"Speechmatics transcription failed: {str(e)}")
+        
+        # Wait for transcription to complete
+        return self._wait_for_completion(job_id, audio_duration=get_audio_duration(audio_file_path),
+                                         on_progress=on_progress)
+    
+    def get_config(self) -> dict:
+        """Settings that change the transcript output."""
+        return {"language": self.language, "operating_point": self.operating_point}
     
     def _upload_file(self, audio_file_path: Path) -> str:
         """Upload audio file and start transcription job."""
@@ -60,7 +80,7 @@ class SpeechmaticsTranscriber(BaseTranscriber):
             "type": "transcription",
             "transcription_config": {
                 "language": self.language,
-                "operating_point": "enhanced"
+                "operating_point": self.operating_point
             }
         }
         
@@ -89,38 +109,64 @@ class SpeechmaticsTranscriber(BaseTranscriber):
                 'config': (None, json.dumps(job_config), 'application/json')
             }
             
-            response = requests.post(upload_url, headers=headers, files=files)
+            response = self.session.post(upload_url, headers=headers, files=files, timeout=self.request_timeout)
             response.raise_for_status()
             
             job_data = response.json()
             return job_data["id"]
     
-    def _wait_for_completion(self, job_id: str, timeout: int = 300) -> dict:
-        """Wait for transcription job to complete."""
+    def _wait_for_completion(self, job_id: str, timeout: int = 300,
+                             audio_duration: Optional[float] = None,
+                             on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """Register the job with the shared poller and return its future."""
+        clock = self.stage_clock("processing")
+        return get_poller().watch(
+            lambda: self._check_job(job_id, on_progress, clock),
+            timeout=timeout,
+            audio_duration=audio_duration,
+            description="Speechmatics transcription",
+            on_cancel=lambda: self._cancel_job(job_id)
+        )
+    
+    def _cancel_job(self, job_id: str):
+        """Stop a running job so it isn't billed for work nobody will read."""
+        response = self.session.delete(f"{self.base_url}/jobs/{job_id}", params={"force": "true"},
+                                       headers=self.headers, timeout=self.request_timeout)
+        response.raise_for_status()
+        self.logger.info(f"Cancelled Speechmatics job {job_id}")
+    
+    def _check_job(self, job_id: str,
+                   on_progress: Optional[Callable[[dict], None]] = None,
+                   clock=None) -> Optional[str]:
+        """Poll a job once. Returns the transcript when done, None while running."""
         status_url = f"{self.base_url}/jobs/{job_id}"
         result_url = f"{self.base_url}/jobs/{job_id}/transcript?format=txt"
         
-        start_time = time.time()
+        status_response = self.session.get(status_url, headers=self.headers, timeout=self.request_timeout)
+        status_response.raise_for_status()
         
-        while time.time() - start_time < timeout:
-            status_response = requests.get(status_url, headers=self.headers)
-            status_response.raise_for_status()
-            
-            status_data = status_response.json()
-            job_status = status_data.get("job", {}).get("status")
-            
-            if job_status == "done":
-                # Get the transcript
-                result_response = requests.get(result_url, headers=self.headers)
-                result_response.raise_for_status()
-                
-                # Ensure proper UTF-8 encoding for Latvian characters
-                result_response.encoding = 'utf-8'
-                return {"transcript": result_response.text.strip()}
-            
-            elif job_status == "rejected":
-                raise TranscriptionError(f"Job rejected: {status_data}")
+        status_data = status_response.json()
+        job_status = status_data.get("job", {}).get("status")
+        if on_progress:
+            on_progress({"provider_status": job_status})
+        
+        if job_status == "done":
+            if clock:
+                clock.enter("download")
+            # Get the transcript
+            result_response = self.session.get(result_url, headers=self.headers, timeout=self.request_timeout)
+            result_response.raise_for_status()
             
-            time.sleep(2)
+            # Ensure proper UTF-8 encoding for Latvian characters
+            result_response.encoding = 'utf-8'
+            if clock:
+                clock.finish()
+            transcript = result_response.text.strip()
+            if not transcript:
+                raise EmptyTranscriptError("No transcript returned")
+            return transcript
+        
+        elif job_status == "rejected":
+            raise TranscriptionError(f"Job rejected: {status_data}")
         
-        raise TranscriptionError(f"Transcription timeout after {timeout} seconds")
+        return None
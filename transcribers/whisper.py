@@ -1,77 +1,109 @@
 """OpenAI Whisper transcription service."""
 
-import torch
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-
-from .base import BaseTranscriber, TranscriptionError
+from .audio import get_audio_duration
+from .base import BaseTranscriber, EmptyTranscriptError, TranscriptionError
+from .whisper_batching import BATCH_SECONDS, get_batcher
+from .whisper_engines import create_engine
+from .whisper_pool import get_model_pool
 from config import MODELS
 
 
 class WhisperTranscriber(BaseTranscriber):
     """OpenAI Whisper transcription service."""
     
-    def __init__(self, model_size: str = "medium"):
+    def __init__(self, model_size: Optional[str] = None):
         super().__init__(
             name=MODELS["whisper"]["name"],
-            language=MODELS["whisper"]["language"]
+            language=MODELS["whisper"]["language"],
+            chunk_seconds=MODELS["whisper"].get("chunk_seconds")
         )
         
-        if not WHISPER_AVAILABLE:
-            raise ImportError("Whisper library not installed. Install with: pip install openai-whisper")
+        # Inference backend (PyTorch or CTranslate2), see config.MODELS["whisper"]["engine"]
+        self.engine = create_engine(MODELS["whisper"], model_size)
+        self.engine.check_available()
+        self.model_size = self.engine.model_size
+        
+        # The model itself is loaded lazily by the shared pool on first use
+        self.model_pool = get_model_pool()
         
-        self.model_size = model_size
-        self.model = None
-        self._load_model()
+        # Short clips from concurrent requests are decoded together (opt-in)
+        self.batch_size = self.engine.batch_size
+        self.batch_window = MODELS["whisper"].get("batch_window_ms", 50) / 1000
+    
+    def preload(self, warm_up: bool = False):
+        """Load (and optionally warm up) the model now instead of on first use."""
+        self.model_pool.preload([self.engine], warm_up=warm_up, language=self.language)
     
-    def _load_model(self):
-        """Load the Whisper model."""
+    def can_batch(self, audio_file_path: Path) -> bool:
+        """Whether the clip is short enough to be decoded in a cross-file batch."""
+        return self.batch_size > 1 and get_audio_duration(audio_file_path) <= BATCH_SECONDS
+    
+    def transcribe_async(self, audio_file_path: Path,
+                         on_progress: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Queue a short clip for the next batched decode and return its Future.
+        
+        Longer clips are transcribed right away; the returned Future is then
+        already done.
+        """
+        if not self.validate_audio_file(audio_file_path):
+            raise TranscriptionError(f"Invalid audio file: {audio_file_path}")
+        
+        if self.can_batch(audio_file_path):
+            return self._batcher().submit(audio_file_path)
+        
+        future = Future()
         try:
-            self.logger.info(f"Loading Whisper {self.model_size} model...")
-            self.model = whisper.load_model(self.model_size)
-            self.logger.info("Whisper model loaded successfully")
+            future.set_result(self.transcribe(audio_file_path))
         except Exception as e:
-            raise TranscriptionError(f"Failed to load Whisper model: {str(e)}")
+            future.set_exception(e)
+        return future
     
     def transcribe(self, audio_file_path: Path) -> str:
         """Transcribe audio using OpenAI Whisper."""
         if not self.validate_audio_file(audio_file_path):
             raise TranscriptionError(f"Invalid audio file: {audio_file_path}")
         
-        if self.model is None:
-            raise TranscriptionError("Whisper model not loaded")
+        if self.can_batch(audio_file_path):
+            # Blocking callers (chunk workers, batch processes) share the batches too
+            return self._batcher().submit(audio_file_path).result()
         
         try:
-            # Transcribe with language forced to Latvian
-            result = self.model.transcribe(
-                str(audio_file_path),
-                language=self.language,
-                word_timestamps=False,  # We only want text
-                fp16=torch.cuda.is_available()  # Use GPU if available
-            )
-            
-            # Extract text
-            transcript = result.get("text", "").strip()
+            with self.model_pool.acquire(self.engine) as model, self.stage("inference"):
+                # Transcribe with language forced to Latvian
+                transcript = self.engine.transcribe(model, str(audio_file_path), self.language)
             
             if not transcript:
-                raise TranscriptionError("No transcript generated")
+                raise EmptyTranscriptError("No transcript generated")
             
             return transcript
             
+        except EmptyTranscriptError:
+            raise
         except Exception as e:
             self.logger.error(f"Whisper transcription failed: {str(e)}")
             raise TranscriptionError(f"Whisper transcription failed: {str(e)}")
     
+    def _batcher(self):
+        return get_batcher(self.engine, self.model_pool, self.language,
+                           self.batch_size, self.batch_window, provider=self.provider)
+    
+    def get_config(self) -> dict:
+        """Settings that change the transcript output."""
+        return {"language": self.language, "model_size": self.model_size, **self.engine.get_config()}
+    
     def get_model_info(self) -> dict:
         """Get information about the loaded model."""
         return {
             "model_size": self.model_size,
+            "engine": self.engine.name,
+            "compute_type": self.engine.compute_type,
+            "loaded": self.engine.key in self.model_pool.loaded_models(),
+            "batch_size": self.batch_size,
             "language": self.language,
-            "device": "cuda" if torch.cuda.is_available() else "cpu"
+            "device": self.engine.device
         }
@@ -0,0 +1,124 @@
+"""
+Cross-file batching of short Whisper requests.
+
+Whisper always encodes a full 30 s log-mel window, so a 3 s clip costs
+almost as much as a 30 s one, and decoding one clip at a time leaves most of
+the CPU's vector width unused. The batcher collects requests that arrive
+within a short window (up to ``batch_size``), pads every clip to one 30 s
+mel segment, runs the encoder and decoder once for the whole batch and
+hands each caller its own transcript. A request that ends up alone in its
+window is transcribed normally instead.
+
+Batching is opt-in (``WHISPER_BATCH_SIZE``): a batched decode has the same
+temperature fallback as ``transcribe()``, but doesn't condition on earlier
+text, so transcripts can differ slightly.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from . import metrics
+from .base import EmptyTranscriptError, TranscriptionError
+
+logger = logging.getLogger("transcriber.whisper")
+
+# Length of Whisper's input window; only clips that fit in one are batched
+BATCH_SECONDS = 30.0
+
+
+class WhisperBatcher:
+    """Groups concurrent requests for one model into batched decodes."""
+
+    def __init__(self, engine, model_pool, language: str = "lv",
+                 batch_size: int = 8, window_seconds: float = 0.05, provider: str = "whisper"):
+        self.engine = engine
+        self.provider = provider
+        self.model_pool = model_pool
+        self.language = language
+        self.batch_size = batch_size
+        self.window_seconds = window_seconds
+
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="whisper-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, audio_path: Path) -> Future:
+        """Queue a clip of at most ``BATCH_SECONDS``; the future resolves to its Transcript."""
+        future = Future()
+        self._requests.put((Path(audio_path), future, time.perf_counter()))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._requests.get()]
+
+            # Give other requests a short window to join the batch
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Drop requests whose callers gave up while they were queued
+            started = time.perf_counter()
+            running = []
+            for path, future, submitted in batch:
+                if future.set_running_or_notify_cancel():
+                    metrics.STAGE_SECONDS.observe(started - submitted, provider=self.provider,
+                                                  stage="batch_wait")
+                    running.append((path, future))
+            if running:
+                self._decode(running)
+
+    def _decode(self, batch: list):
+        paths = [path for path, _ in batch]
+        try:
+            with self.model_pool.acquire(self.engine) as model:
+                start = time.perf_counter()
+                if len(paths) == 1:
+                    transcripts = [self.engine.transcribe(model, str(paths[0]), self.language)]
+                else:
+                    transcripts = self.engine.transcribe_batch(model, paths, self.language)
+            elapsed = time.perf_counter() - start
+            logger.debug(f"Decoded batch of {len(batch)} clips in {elapsed:.2f}s")
+            # Every clip of the batch waited for the whole decode
+            for _ in batch:
+                metrics.STAGE_SECONDS.observe(elapsed, provider=self.provider, stage="inference")
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(TranscriptionError(f"Whisper transcription failed: {str(e)}"))
+                return
+            # One unreadable clip shouldn't fail the others: decode them one by one
+            logger.warning(f"Batched decode of {len(batch)} clips failed ({e}), retrying individually")
+            for request in batch:
+                self._decode([request])
+            return
+
+        for (path, future), transcript in zip(batch, transcripts):
+            if transcript:
+                future.set_result(transcript)
+            else:
+                future.set_exception(EmptyTranscriptError("No transcript generated"))
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(engine, model_pool, language: str, batch_size: int,
+                window_seconds: float, provider: str = "whisper") -> WhisperBatcher:
+    """Return the process-wide batcher of a model, so all requests share one queue."""
+    key = (engine.key, language)
+    with _batchers_lock:
+        if key not in _batchers:
+            _batchers[key] = WhisperBatcher(engine, model_pool, language, batch_size,
+                                            window_seconds, provider)
+        return _batchers[key]
@@ -0,0 +1,245 @@
+"""
+Inference backends for the Whisper transcriber.
+
+``openai`` runs the reference openai-whisper implementation on PyTorch.
+``faster-whisper`` runs the same checkpoints through CTranslate2, which
+supports int8 quantized inference and is several times faster on CPU-only
+servers. The engine is selected with ``config.MODELS["whisper"]["engine"]``.
+"""
+
+import importlib.util
+import logging
+import math
+from typing import Optional
+
+from .base import Transcript
+
+logger = logging.getLogger("transcriber.whisper")
+
+# openai-whisper's transcribe() defaults: a decode whose text is repetitive
+# (high compression ratio) or unlikely (low log-probability) is repeated at
+# the next temperature, unless the clip is probably silence
+FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+class WhisperEngine:
+    """Loads a Whisper checkpoint and runs inference with one backend."""
+
+    name = None
+    # Whether transcribe_batch() decodes several clips in one pass
+    supports_batching = False
+
+    def __init__(self, model_size: str, compute_type: Optional[str] = None,
+                 cpu_threads: int = 0, beam_size: Optional[int] = None, batch_size: int = 1):
+        self.model_size = model_size
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+        # Short clips decoded together by transcribe_batch() (1 = off)
+        self.batch_size = batch_size if self.supports_batching else 1
+
+    @property
+    def key(self) -> str:
+        """Identifies the loaded weights, so equal engines share one model."""
+        return f"{self.name}:{self.model_size}:{self.compute_type}"
+
+    @property
+    def device(self) -> str:
+        return "cpu"
+
+    def check_available(self):
+        """Raise ImportError if the backend library is not installed."""
+        raise NotImplementedError
+
+    def load(self):
+        """Load and return the model."""
+        raise NotImplementedError
+
+    def transcribe(self, model, audio, language: str) -> str:
+        """Transcribe a file path or 16 kHz float32 samples and return the text."""
+        raise NotImplementedError
+
+    def transcribe_batch(self, model, audio_paths, language: str) -> list:
+        """Transcribe clips of up to 30 s together; returns one Transcript per clip."""
+        raise NotImplementedError
+
+    def get_config(self) -> dict:
+        """Engine settings that change the transcript output."""
+        return {
+            "engine": self.name,
+            "compute_type": self.compute_type,
+            "beam_size": self.beam_size
+        }
+
+
+class OpenAIWhisperEngine(WhisperEngine):
+    """Reference openai-whisper implementation on PyTorch."""
+
+    name = "openai"
+    supports_batching = True
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}:{self.model_size}"
+
+    @property
+    def device(self) -> str:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    def check_available(self):
+        # find_spec locates the package without importing it (and torch)
+        if importlib.util.find_spec("whisper") is None:
+            raise ImportError("Whisper library not installed. Install with: pip install openai-whisper")
+
+    def load(self):
+        import torch
+        import whisper
+
+        if self.cpu_threads:
+            torch.set_num_threads(self.cpu_threads)
+
+        model = whisper.load_model(self.model_size)
+        model.eval()
+        return model
+
+    def transcribe(self, model, audio, language):
+        options = {}
+        if self.beam_size:
+            options["beam_size"] = self.beam_size
+
+        result = model.transcribe(
+            audio,
+            language=language,
+            word_timestamps=False,  # We only want text
+            fp16=self.device == "cuda",  # Use GPU if available
+            **options
+        )
+        return Transcript(result.get("text", "").strip(), _confidence(result.get("segments", [])))
+
+    def transcribe_batch(self, model, audio_paths, language):
+        import torch
+        import whisper
+
+        # Every clip padded to one 30 s log-mel segment, stacked into a batch
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(whisper.load_audio(str(path))),
+                                        model.dims.n_mels)
+            for path in audio_paths
+        ]).to(model.device)
+
+        # One encoder pass and one batched decoding loop for all clips; clips
+        # whose decode failed the quality checks go again at the next
+        # temperature, like transcribe() does for each segment
+        results = [None] * len(audio_paths)
+        pending = list(range(len(audio_paths)))
+        for temperature in FALLBACK_TEMPERATURES:
+            options = whisper.DecodingOptions(
+                language=language,
+                without_timestamps=True,
+                fp16=self.device == "cuda",
+                temperature=temperature,
+                beam_size=self.beam_size if temperature == 0 else None
+            )
+            retry = []
+            for index, result in zip(pending, whisper.decode(model, mel[pending], options)):
+                results[index] = result
+                if _needs_fallback(result):
+                    retry.append(index)
+            pending = retry
+            if not pending:
+                break
+
+        return [
+            Transcript("" if _is_silence(result) else result.text.strip(), math.exp(result.avg_logprob))
+            for result in results
+        ]
+
+    def get_config(self) -> dict:
+        # PyTorch always runs the checkpoint at full precision on CPU. Batched
+        # decodes don't condition on previous text or split segments like
+        # transcribe() does, so their transcripts are cached separately
+        return {
+            "engine": self.name,
+            "beam_size": self.beam_size,
+            "decode": "batch" if self.batch_size > 1 else "transcribe"
+        }
+
+
+class FasterWhisperEngine(WhisperEngine):
+    """CTranslate2 backend with int8/float16 quantization."""
+
+    name = "faster-whisper"
+
+    def check_available(self):
+        if importlib.util.find_spec("faster_whisper") is None:
+            raise ImportError("faster-whisper not installed. Install with: pip install faster-whisper")
+
+    def load(self):
+        from faster_whisper import WhisperModel
+
+        return WhisperModel(
+            self.model_size,
+            device="cpu",
+            compute_type=self.compute_type or "int8",
+            cpu_threads=self.cpu_threads
+        )
+
+    def transcribe(self, model, audio, language):
+        segments, _ = model.transcribe(
+            audio,
+            language=language,
+            beam_size=self.beam_size or 5,
+            word_timestamps=False
+        )
+        # Segments are generated lazily; listing them runs the decoder
+        segments = list(segments)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        return Transcript(text, _confidence(segments))
+
+
+def _needs_fallback(result) -> bool:
+    """Whether a batched decode should be repeated at a higher temperature."""
+    if result.no_speech_prob > NO_SPEECH_THRESHOLD:
+        return False
+    return result.compression_ratio > COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _is_silence(result) -> bool:
+    """transcribe() drops such segments instead of returning their text."""
+    return result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD
+
+
+def _confidence(segments) -> Optional[float]:
+    """Mean token probability, from each segment's average log-probability."""
+    logprobs = [
+        segment["avg_logprob"] if isinstance(segment, dict) else segment.avg_logprob
+        for segment in segments
+    ]
+    if not logprobs:
+        return None
+    return math.exp(sum(logprobs) / len(logprobs))
+
+
+ENGINES = {
+    OpenAIWhisperEngine.name: OpenAIWhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+
+def create_engine(model_config: dict, model_size: Optional[str] = None) -> WhisperEngine:
+    """Build the engine described by a ``config.MODELS["whisper"]`` entry."""
+    engine_name = model_config.get("engine", "openai")
+    if engine_name not in ENGINES:
+        raise ValueError(f"Unknown Whisper engine: {engine_name}. Choose from: {', '.join(ENGINES)}")
+
+    return ENGINES[engine_name](
+        model_size=model_size or model_config["model_size"],
+        compute_type=model_config.get("compute_type"),
+        cpu_threads=model_config.get("cpu_threads", 0),
+        beam_size=model_config.get("beam_size"),
+        batch_size=model_config.get("batch_size", 1)
+    )
@@ -0,0 +1,111 @@
+"""
+Process-wide pool of loaded Whisper models.
+
+Models are loaded lazily on first use and shared by every request thread, so
+each process holds at most one copy of the weights per engine and model
+size (see ``whisper_engines``). A
+semaphore per model caps how many transcriptions run on it at once. Models
+can also be pre-loaded (and optionally warmed up) before a pre-forking
+server starts its workers, so the weights are shared copy-on-write.
+"""
+
+import gc
+import logging
+import threading
+from contextlib import contextmanager
+
+from .base import TranscriptionError
+from .whisper_engines import WhisperEngine
+from config import MODELS
+
+logger = logging.getLogger("transcriber.whisper")
+
+# One second of silence at Whisper's 16 kHz sample rate
+WARM_UP_SAMPLES = 16000
+
+
+class WhisperModelPool:
+    """Loads Whisper models on demand and shares them between threads."""
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self._models = {}
+        self._semaphores = {}
+        self._load_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, engine: WhisperEngine):
+        """Return the model for an engine, loading it on first use."""
+        with self._lock:
+            if engine.key in self._models:
+                return self._models[engine.key]
+            load_lock = self._load_locks.setdefault(engine.key, threading.Lock())
+
+        # Load outside the pool lock so other models stay available
+        with load_lock:
+            with self._lock:
+                if engine.key in self._models:
+                    return self._models[engine.key]
+
+            model = self._load(engine)
+
+            with self._lock:
+                self._models[engine.key] = model
+                self._semaphores[engine.key] = threading.BoundedSemaphore(self.max_concurrency)
+            return model
+
+    @contextmanager
+    def acquire(self, engine: WhisperEngine):
+        """Borrow a model, waiting while ``max_concurrency`` threads already use it."""
+        model = self.get(engine)
+        semaphore = self._semaphores[engine.key]
+        with semaphore:
+            yield model
+
+    def warm_up(self, engine: WhisperEngine, language: str = "lv"):
+        """Run a short silent clip through a model so the first request isn't slow."""
+        import numpy as np
+
+        with self.acquire(engine) as model:
+            logger.info(f"Warming up Whisper {engine.key} model...")
+            engine.transcribe(model, np.zeros(WARM_UP_SAMPLES, dtype=np.float32), language)
+
+    def preload(self, engines, warm_up: bool = False, language: str = "lv"):
+        """
+        Load models ahead of time, e.g. in a server master before forking.
+
+        After loading, the garbage collector is told to leave the existing
+        objects alone so forked workers keep sharing the weight pages.
+        """
+        for engine in engines:
+            self.get(engine)
+            if warm_up:
+                self.warm_up(engine, language)
+        gc.freeze()
+
+    def loaded_models(self) -> list:
+        """Keys of the models currently in memory."""
+        with self._lock:
+            return list(self._models)
+
+    def _load(self, engine: WhisperEngine):
+        try:
+            logger.info(f"Loading Whisper {engine.model_size} model ({engine.name} engine)...")
+            model = engine.load()
+            logger.info("Whisper model loaded successfully")
+            return model
+        except Exception as e:
+            raise TranscriptionError(f"Failed to load Whisper model: {str(e)}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_pool() -> WhisperModelPool:
+    """Return the process-wide model pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WhisperModelPool(max_concurrency=MODELS["whisper"].get("max_concurrency", 1))
+        return _pool